@@ -0,0 +1,120 @@
+"""Cold start to first byte for the web edition."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import platform
+import shlex
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from http_load import git_commit
+
+REQUEST = "GET {path} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def first_byte(port: int, path: str) -> float | None:
+    """Seconds from sending ``path`` to the first response byte, or None."""
+    try:
+        with socket.create_connection(("127.0.0.1", port), timeout=10) as sock:
+            sent = time.perf_counter()
+            sock.sendall(REQUEST.format(path=path).encode())
+            if not sock.recv(1):
+                return None
+            return time.perf_counter() - sent
+    except OSError:
+        return None
+
+
+def cold_start(command: str, path: str, env: dict, timeout: float) -> dict[str, float]:
+    port = free_port()
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        shlex.split(command),
+        env=dict(env, PORT=str(port)),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while (first := first_byte(port, path)) is None:
+            if server.poll() is not None:
+                raise RuntimeError(f"server exited with code {server.returncode}")
+            if time.perf_counter() - started > timeout:
+                raise TimeoutError(f"no response from {command!r}")
+            time.sleep(0.005)
+        ttfb = time.perf_counter() - started
+        return {
+            "ttfb_s": ttfb,
+            "listening_s": ttfb - first,
+            "first_request_s": first,
+            "second_request_s": first_byte(port, path) or math.nan,
+        }
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--spawn", metavar="CMD", default=f"{sys.executable} server.py")
+    parser.add_argument("--path", default="/")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument(
+        "--fresh-bytecode", action="store_true", help="ignore cached .pyc files"
+    )
+    parser.add_argument("--timeout", type=float, default=30.0, help="per run")
+    parser.add_argument("--json", metavar="FILE", help="write results here")
+    args = parser.parse_args()
+
+    runs = []
+    for _ in range(args.runs):
+        env = dict(os.environ)
+        with tempfile.TemporaryDirectory() as cache:
+            if args.fresh_bytecode:
+                env["PYTHONPYCACHEPREFIX"] = cache
+            runs.append(cold_start(args.spawn, args.path, env, args.timeout))
+
+    summary = {}
+    print(f"{args.spawn}  GET {args.path}  ({args.runs} runs)")
+    print(f"{'':>18} {'median':>9} {'max':>9}")
+    for key in runs[0]:
+        values = [run[key] for run in runs]
+        summary[key] = {"median": statistics.median(values), "max": max(values)}
+        print(
+            f"{key:>18} {summary[key]['median'] * 1000:>7.1f}ms"
+            f" {summary[key]['max'] * 1000:>7.1f}ms"
+        )
+
+    if args.json:
+        result = {
+            "summary": summary,
+            "runs": runs,
+            "meta": {
+                "commit": git_commit(),
+                "date": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                "server": args.spawn,
+                "path": args.path,
+                "fresh_bytecode": args.fresh_bytecode,
+                "python": platform.python_version(),
+                "cpus": os.cpu_count(),
+            },
+        }
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Cost of precise (mask) collisions against plain rect sweeps."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from cosmic_corridor import game as game_module  # noqa: E402
+from cosmic_corridor.autopilot import Autopilot  # noqa: E402
+from cosmic_corridor.collision import sweep_masks, sweep_rects  # noqa: E402
+from cosmic_corridor.game import FPS, CosmicCorridorGame  # noqa: E402
+
+
+def record_pairs(seconds: float, seed: int) -> list[tuple]:
+    """Arguments of every :func:`sweep_masks` call the game makes."""
+    pairs: list[tuple] = []
+
+    def recording(*args):
+        pairs.append(args)
+        return sweep_masks(*args)
+
+    game = CosmicCorridorGame(headless=True, seed=seed)
+    pilot = Autopilot(game)
+    game_module.sweep_masks = recording
+    try:
+        for _ in range(int(seconds * FPS)):
+            if game.game_over:
+                game._reset()
+            game.step(1.0 / FPS, [pilot()])
+    finally:
+        game_module.sweep_masks = sweep_masks
+    return pairs
+
+
+def time_pairs(pairs: list[tuple], repeat: int) -> dict[str, float]:
+    rect_pairs = [(a, ad, b, bd) for a, ad, _am, b, bd, _bm in pairs]
+    best_rect = best_mask = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for a, ad, b, bd in rect_pairs:
+            sweep_rects(a, ad, b, bd)
+        best_rect = min(best_rect, time.perf_counter() - started)
+        started = time.perf_counter()
+        for pair in pairs:
+            sweep_masks(*pair)
+        best_mask = min(best_mask, time.perf_counter() - started)
+    n = max(1, len(pairs))
+    return {
+        "pairs": len(pairs),
+        "rect_ns_per_pair": round(best_rect / n * 1e9, 1),
+        "mask_ns_per_pair": round(best_mask / n * 1e9, 1),
+        "overhead": round(best_mask / best_rect, 3) if best_rect else 0.0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=60.0, help="game time")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    pairs = record_pairs(args.seconds, args.seed)
+    boxes_meet = [p for p in pairs if sweep_rects(p[0], p[1], p[3], p[4]) is not None]
+    hits = sum(sweep_masks(*p) is not None for p in boxes_meet)
+    report = {
+        "gameplay": time_pairs(pairs, args.repeat),
+        # Worst case: every pair passes the prefilter and needs mask tests.
+        "boxes_meet_only": time_pairs(boxes_meet, args.repeat),
+        "prefilter_pass_rate": round(len(boxes_meet) / max(1, len(pairs)), 5),
+        "rect_hits_rejected_by_masks": len(boxes_meet) - hits,
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,435 @@
+"""HTTP load generator for the web edition (asyncio, standard library only)."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import os
+import platform
+import shlex
+import socket
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from urllib.parse import urlsplit
+
+USER_AGENT = "cosmic-corridor-load/1"
+
+
+class ProtocolError(Exception):
+    """A response that is not valid HTTP/1.1."""
+
+
+class UnboundedBody(ProtocolError):
+    """A response whose end cannot be found without closing the connection,
+    such as an event stream; its path cannot be load tested."""
+
+
+@dataclass
+class PathStats:
+    latencies: list[float] = field(default_factory=list)
+    errors: dict[str, int] = field(default_factory=dict)
+    bytes: int = 0
+
+    def error(self, kind: str) -> None:
+        self.errors[kind] = self.errors.get(kind, 0) + 1
+
+    def merge(self, other: PathStats) -> None:
+        self.latencies.extend(other.latencies)
+        self.bytes += other.bytes
+        for kind, n in other.errors.items():
+            self.errors[kind] = self.errors.get(kind, 0) + n
+
+    def summary(self, elapsed: float) -> dict:
+        ordered = sorted(self.latencies)
+        failed = sum(self.errors.values())
+        total = len(ordered) + failed
+        mean = sum(ordered) / len(ordered) if ordered else 0.0
+        return {
+            "requests": total,
+            "ok": len(ordered),
+            "errors": dict(sorted(self.errors.items())),
+            "error_rate": round(failed / total, 5) if total else 0.0,
+            "rps": round(len(ordered) / elapsed, 1) if elapsed else 0.0,
+            "mb_per_s": round(self.bytes / elapsed / 1e6, 3) if elapsed else 0.0,
+            "latency_ms": {
+                "p50": _percentile(ordered, 0.50),
+                "p95": _percentile(ordered, 0.95),
+                "p99": _percentile(ordered, 0.99),
+                "max": round(ordered[-1] * 1000, 3) if ordered else 0.0,
+                "mean": round(mean * 1000, 3),
+            },
+        }
+
+
+def _percentile(ordered: list[float], q: float) -> float:
+    """Nearest-rank percentile of sorted seconds, in milliseconds."""
+    if not ordered:
+        return 0.0
+    rank = max(1, math.ceil(q * len(ordered)))
+    return round(ordered[rank - 1] * 1000, 3)
+
+
+class Connection:
+    """One HTTP/1.1 client connection, reopened when the server closes it."""
+
+    def __init__(self, host: str, port: int, keepalive: bool) -> None:
+        self.host = host
+        self.port = port
+        self.keepalive = keepalive
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+
+    async def request(self, path: str) -> tuple[int, int]:
+        """GET ``path``; returns the status code and body size."""
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(
+                self.host, self.port
+            )
+        header = "keep-alive" if self.keepalive else "close"
+        self._writer.write(
+            f"GET {path} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n"
+            f"User-Agent: {USER_AGENT}\r\nAccept-Encoding: gzip\r\n"
+            f"Connection: {header}\r\n\r\n".encode("latin-1")
+        )
+        try:
+            status, size, reusable = await self._read_response()
+        except BaseException:
+            self.close()
+            raise
+        if not (reusable and self.keepalive):
+            self.close()
+        return status, size
+
+    async def _read_head(self) -> tuple[bytes, int, dict[bytes, bytes]]:
+        reader = self._reader
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("server closed the connection")
+        try:
+            version, code, *_ = status_line.split(b" ", 2)
+            status = int(code)
+        except ValueError as exc:
+            raise ProtocolError(f"bad status line {status_line!r}") from exc
+
+        headers: dict[bytes, bytes] = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.partition(b":")
+            headers[name.strip().lower()] = value.strip().lower()
+        return version, status, headers
+
+    async def _read_response(self) -> tuple[int, int, bool]:
+        reader = self._reader
+        version, status, headers = await self._read_head()
+        while 100 <= status < 200:  # interim responses precede the real one
+            if status == 101:
+                raise ProtocolError("server switched protocols")
+            version, status, headers = await self._read_head()
+
+        reusable = version == b"HTTP/1.1" and headers.get(b"connection") != b"close"
+        if status in (204, 304):
+            size = 0  # never has a body, whatever the headers say
+        elif headers.get(b"content-type", b"").startswith(b"text/event-stream"):
+            raise UnboundedBody("event streams never end")
+        elif headers.get(b"transfer-encoding") == b"chunked":
+            size = 0
+            while True:
+                chunk = int((await reader.readline()).split(b";")[0], 16)
+                if chunk == 0:
+                    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass  # trailers
+                    break
+                await reader.readexactly(chunk + 2)
+                size += chunk
+        elif b"content-length" in headers:
+            size = int(headers[b"content-length"])
+            await reader.readexactly(size)
+        elif reusable and self.keepalive:
+            # Only the end of the connection could end this body, and the
+            # server means to keep it open: reading would block until timeout.
+            raise UnboundedBody("neither Content-Length nor chunked encoding")
+        else:
+            size = len(await reader.read())  # close-delimited
+            reusable = False
+        return status, size, reusable
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+
+
+async def _worker(
+    conn: Connection,
+    paths: itertools.cycle,
+    stats: dict[str, PathStats],
+    schedule: asyncio.Queue | None,
+    deadline: float,
+    record_after: float,
+    timeout: float,
+) -> None:
+    loop = asyncio.get_running_loop()
+    while True:
+        if schedule is not None:
+            started = await schedule.get()
+            if started is None:
+                return
+        else:
+            started = loop.time()
+            if started >= deadline:
+                return
+        path = next(paths)
+        record = started >= record_after
+        try:
+            status, size = await asyncio.wait_for(conn.request(path), timeout)
+        except asyncio.TimeoutError:
+            kind = "timeout"
+        except UnboundedBody as exc:
+            raise UnboundedBody(f"GET {path}: {exc}") from None
+        except ProtocolError:
+            kind = "protocol"
+        except (OSError, asyncio.IncompleteReadError, ValueError):
+            kind = "connection"
+        else:
+            kind = None if status < 400 else f"http_{status}"
+        if not record:
+            continue
+        entry = stats[path]
+        if kind is None:
+            entry.latencies.append(loop.time() - started)
+            entry.bytes += size
+        else:
+            entry.error(kind)
+
+
+async def _pace(
+    schedule: asyncio.Queue, rate: float, start: float, deadline: float, workers: int
+) -> None:
+    """Queue one scheduled start time per request, ``rate`` per second."""
+    loop = asyncio.get_running_loop()
+    for n in itertools.count():
+        due = start + n / rate
+        if due >= deadline:
+            break
+        delay = due - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        schedule.put_nowait(due)
+    for _ in range(workers):
+        schedule.put_nowait(None)
+
+
+async def run_load(
+    url: str,
+    paths: list[str],
+    concurrency: int,
+    duration: float,
+    rate: float = 0.0,
+    keepalive: bool = True,
+    warmup: float = 1.0,
+    timeout: float = 10.0,
+) -> dict:
+    parts = urlsplit(url)
+    host = parts.hostname or "127.0.0.1"
+    port = parts.port or 80
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    record_after = start + warmup
+    deadline = record_after + duration
+
+    schedule: asyncio.Queue | None = None
+    tasks = []
+    if rate > 0:
+        schedule = asyncio.Queue()
+        tasks.append(
+            asyncio.create_task(_pace(schedule, rate, start, deadline, concurrency))
+        )
+    per_worker: list[dict[str, PathStats]] = []
+    conns = []
+    for i in range(concurrency):
+        stats = {path: PathStats() for path in paths}
+        per_worker.append(stats)
+        conn = Connection(host, port, keepalive)
+        conns.append(conn)
+        # Offset each worker's path cycle so every path sees the same load.
+        cycle = itertools.cycle(paths[i % len(paths) :] + paths[: i % len(paths)])
+        tasks.append(
+            asyncio.create_task(
+                _worker(conn, cycle, stats, schedule, deadline, record_after, timeout)
+            )
+        )
+    await asyncio.gather(*tasks)
+    for conn in conns:
+        conn.close()
+    elapsed = loop.time() - record_after
+
+    merged = {path: PathStats() for path in paths}
+    total = PathStats()
+    for stats in per_worker:
+        for path, entry in stats.items():
+            merged[path].merge(entry)
+            total.merge(entry)
+    return {
+        "total": total.summary(elapsed),
+        "paths": {path: entry.summary(elapsed) for path, entry in merged.items()},
+    }
+
+
+# ---------- server process ----------
+def wait_for_port(
+    host: str,
+    port: int,
+    server: subprocess.Popen | None = None,
+    timeout: float = 30.0,
+) -> float:
+    """Seconds until ``host:port`` accepts connections."""
+    started = time.perf_counter()
+    while True:
+        try:
+            with socket.create_connection((host, port), timeout=0.5):
+                return time.perf_counter() - started
+        except OSError:
+            if server is not None and server.poll() is not None:
+                raise RuntimeError(
+                    f"server exited with code {server.returncode}"
+                ) from None
+            if time.perf_counter() - started > timeout:
+                raise TimeoutError(f"nothing listening on {host}:{port}") from None
+            time.sleep(0.05)
+
+
+def spawn_server(command: str, port: int) -> subprocess.Popen:
+    env = dict(os.environ, PORT=str(port))
+    return subprocess.Popen(
+        shlex.split(command),
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+# ---------- reporting ----------
+def print_report(result: dict, baseline: dict | None = None) -> None:
+    def change(path: str, key: str, now: float) -> str:
+        if baseline is None:
+            return ""
+        old = baseline["total"] if path == "total" else baseline["paths"].get(path)
+        if old is None:
+            return ""
+        before = old["latency_ms"][key] if key != "rps" else old["rps"]
+        if not before:
+            return ""
+        return f" ({(now - before) / before * 100:+.0f}%)"
+
+    rows = [("total", result["total"])] + list(result["paths"].items())
+    for path, stats in rows:
+        latency = stats["latency_ms"]
+        print(
+            f"{path:<16} {stats['requests']:>8} req  "
+            f"{stats['rps']:>9.1f} rps{change(path, 'rps', stats['rps'])}  "
+            f"p50 {latency['p50']:.2f}{change(path, 'p50', latency['p50'])}  "
+            f"p95 {latency['p95']:.2f}{change(path, 'p95', latency['p95'])}  "
+            f"p99 {latency['p99']:.2f} ms{change(path, 'p99', latency['p99'])}  "
+            f"errors {stats['error_rate'] * 100:.2f}%"
+        )
+        if stats["errors"]:
+            print(f"{'':<16} {stats['errors']}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:8080")
+    parser.add_argument(
+        "--path", action="append", dest="paths", help="repeatable (default / /health)"
+    )
+    parser.add_argument("--concurrency", type=int, default=32, help="connections")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--warmup", type=float, default=1.0, help="seconds unrecorded")
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=0.0,
+        help="total requests/s, latency timed from each scheduled start"
+        " (0 = closed loop)",
+    )
+    parser.add_argument(
+        "--no-keepalive", action="store_true", help="new connection per request"
+    )
+    parser.add_argument("--timeout", type=float, default=10.0, help="per request")
+    parser.add_argument("--spawn", metavar="CMD", help="start the server first")
+    parser.add_argument("--json", metavar="FILE", help="write results here")
+    parser.add_argument("--compare", metavar="FILE", help="earlier --json results")
+    args = parser.parse_args()
+    paths = args.paths or ["/", "/health"]
+
+    parts = urlsplit(args.url)
+    host, port = parts.hostname or "127.0.0.1", parts.port or 80
+    server = spawn_server(args.spawn, port) if args.spawn else None
+    try:
+        startup = wait_for_port(host, port, server)
+        result = asyncio.run(
+            run_load(
+                args.url,
+                paths,
+                args.concurrency,
+                args.duration,
+                rate=args.rate,
+                keepalive=not args.no_keepalive,
+                warmup=args.warmup,
+                timeout=args.timeout,
+            )
+        )
+    except UnboundedBody as exc:
+        sys.exit(f"cannot load test {exc}")
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=10)
+
+    result["meta"] = {
+        "commit": git_commit(),
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "url": args.url,
+        "server": args.spawn,
+        "server_ready_s": round(startup, 3) if server is not None else None,
+        "concurrency": args.concurrency,
+        "rate": args.rate,
+        "keepalive": not args.no_keepalive,
+        "duration": args.duration,
+        "python": platform.python_version(),
+        "cpus": os.cpu_count(),
+    }
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_report(result, baseline)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=2)
+    if result["total"]["ok"] == 0:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
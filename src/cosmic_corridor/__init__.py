@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .game import CosmicCorridorGame
+
+__all__ = ["CosmicCorridorGame"]
+
+
+def __getattr__(name: str):
+    # The web servers import submodules of this package; keep pygame out of them.
+    if name == "CosmicCorridorGame":
+        from .game import CosmicCorridorGame
+
+        return CosmicCorridorGame
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,11 +1,407 @@
 from __future__ import annotations
 
-from .game import CosmicCorridorGame
+import argparse
+import os
+import sys
+import time
 
+import pygame
 
-def main() -> None:
-    game = CosmicCorridorGame()
+from .capture import FORMATS, FrameCapture
+from .game import FPS, PRESENT_MODES, CosmicCorridorGame
+from .replay import ORDERS
+
+
+def _parse_roi(value: str) -> pygame.Rect:
+    try:
+        x, y, w, h = (int(part) for part in value.split(","))
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError("ROI must look like x,y,w,h") from exc
+    return pygame.Rect(x, y, w, h)
+
+
+def _parse_addr(value: str) -> tuple[str, int]:
+    host, _, port = value.rpartition(":")
+    try:
+        return host or "0.0.0.0", int(port)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError("address must look like host:port") from exc
+
+
+AGE_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 7 * 86400}
+
+
+def _parse_age(value: str) -> float:
+    try:
+        return float(value[:-1]) * AGE_UNITS[value[-1]]
+    except (KeyError, ValueError, IndexError) as exc:
+        raise argparse.ArgumentTypeError("age must look like 30m, 12h or 7d") from exc
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="cosmic_corridor")
+    sub = parser.add_subparsers(dest="command")
+
+    play = sub.add_parser("play", help="play the game in a window (default)")
+    play.add_argument(
+        "--render-scale",
+        type=float,
+        default=1.0,
+        help="internal resolution relative to 800x600 (e.g. 0.5, 2)",
+    )
+    play.add_argument(
+        "--present",
+        choices=PRESENT_MODES,
+        default="scaled",
+        help="GPU scaling (SDL) or CPU scale blit into a resizable window",
+    )
+    play.add_argument(
+        "--fps", type=float, default=FPS, help="frame rate cap (0 = uncapped)"
+    )
+    _add_spectate_args(play)
+    _add_record_args(play)
+
+    cap = sub.add_parser("capture", help="render headless and export frames")
+    cap.add_argument("--out", default="captures", help="output directory")
+    cap.add_argument("--frames", type=int, default=FPS * 10)
+    cap.add_argument("--format", choices=FORMATS, default="png")
+    cap.add_argument("--every", type=int, default=1, help="keep every n-th frame")
+    cap.add_argument("--roi", type=_parse_roi, help="crop region x,y,w,h")
+    cap.add_argument("--seed", type=int, default=0)
+    cap.add_argument("--buffer", type=int, default=32, help="ring buffer frames")
+
+    auto = sub.add_parser("autoplay", help="let the autopilot play (soak/load runs)")
+    _add_autoplay_args(auto)
+    _add_spectate_args(auto)
+    _add_record_args(auto)
+
+    soak = sub.add_parser("soak", help="autoplay with memory instrumentation")
+    _add_autoplay_args(soak)
+    soak.add_argument("--report", default="soak-report", help="report directory")
+    soak.add_argument("--sample-every", type=float, default=10.0, help="seconds")
+    soak.add_argument("--snapshot-every", type=float, default=300.0, help="seconds")
+    soak.add_argument("--warmup", type=float, default=60.0, help="seconds ignored")
+    soak.add_argument(
+        "--max-growth", type=float, default=8.0, help="fail above this MB/hour"
+    )
+
+    coop = sub.add_parser(
+        "coop", help="two-player co-op with rollback netcode (UDP or simulated)"
+    )
+    coop.add_argument("--seed", type=int, default=0, help="must match the peer's")
+    coop.add_argument("--peer", type=_parse_addr, help="remote host:port (UDP)")
+    coop.add_argument("--bind", type=_parse_addr, default=("0.0.0.0", 7777))
+    coop.add_argument("--player", type=int, choices=(0, 1), default=0)
+    coop.add_argument(
+        "--latency", type=float, default=80.0, help="simulated one-way ms"
+    )
+    coop.add_argument("--jitter", type=float, default=20.0, help="simulated ± ms")
+    coop.add_argument("--loss", type=float, default=0.0, help="simulated loss rate")
+    coop.add_argument("--max-rollback", type=int, default=8, help="ticks")
+
+    cloud = sub.add_parser(
+        "cloud", help="cloud play: stream server-rendered games to browsers"
+    )
+    cloud.add_argument("--host", default="0.0.0.0")
+    cloud.add_argument("--port", type=int, default=int(os.getenv("PORT", "8765")))
+    cloud.add_argument("--max-sessions", type=int, default=8)
+    cloud.add_argument("--fps", type=float, default=30.0, help="simulation rate")
+    cloud.add_argument("--render-scale", type=float, default=0.5)
+    cloud.add_argument("--tile", type=int, default=20, help="delta tile size (px)")
+    cloud.add_argument(
+        "--kbps", type=float, default=2000.0, help="per-session bandwidth cap"
+    )
+    cloud.add_argument(
+        "--cpu-share", type=float, default=0.25, help="per-session CPU cap (cores)"
+    )
+    cloud.add_argument("--idle-timeout", type=float, default=300.0, help="seconds")
+
+    replays = sub.add_parser("replays", help="query, export and import replays")
+    replays.add_argument(
+        "--archive", default=os.getenv("REPLAY_DIR", "replays"), help="archive dir"
+    )
+    actions = replays.add_subparsers(dest="action", required=True)
+    for name, help_text in (
+        ("list", "print matching replays"),
+        ("export", "stream matching replays to a file"),
+    ):
+        action = actions.add_parser(name, help=help_text)
+        if name == "export":
+            action.add_argument("out", help="output file")
+        action.add_argument("--since", type=_parse_age, help="newer than, e.g. 7d")
+        action.add_argument("--min-score", type=int)
+        action.add_argument("--max-duration", type=float, help="seconds")
+        action.add_argument("--died", action="store_true", help="game over only")
+        action.add_argument("--order", choices=ORDERS, default="created")
+        action.add_argument(
+            "--limit", type=int, default=100 if name == "list" else None
+        )
+    action = actions.add_parser("import", help="append replays from an export file")
+    action.add_argument("path", help="export file ('-' for stdin)")
+    action = actions.add_parser("verify", help="re-simulate a replay and compare")
+    action.add_argument("id", type=int)
+    return parser
+
+
+def _add_autoplay_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--window", action="store_true", help="play in a real window")
+    parser.add_argument(
+        "--minutes", type=float, default=10.0, help="game time to play (0 = forever)"
+    )
+    parser.add_argument("--seed", type=int)
+    parser.add_argument(
+        "--no-render", action="store_true", help="headless: skip drawing"
+    )
+
+
+def _add_spectate_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--spectate", metavar="URL", help="publish frames to a /spectate/publish URL"
+    )
+    parser.add_argument(
+        "--spectate-token", default=os.getenv("SPECTATE_TOKEN"), help="bearer token"
+    )
+
+
+def _add_record_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--record", metavar="DIR", help="archive every game as a replay in DIR"
+    )
+
+
+def _start_recording(game: CosmicCorridorGame, args: argparse.Namespace):
+    if not getattr(args, "record", None):
+        return None
+    from .replay import ReplayArchive, ReplayRecorder
+
+    game.recorder = ReplayRecorder(ReplayArchive(args.record), label=args.command)
+    return game.recorder
+
+
+def _stop_recording(game: CosmicCorridorGame, recorder) -> None:
+    if recorder is None:
+        return
+    recorder.finish(game)  # keeps the run in progress too
+    recorder.archive.close()
+    print(f"recorded {len(recorder.saved)} replays to {recorder.archive.root}")
+
+
+def _start_spectating(game: CosmicCorridorGame, args: argparse.Namespace):
+    if not getattr(args, "spectate", None):
+        return None
+    from .spectate import SpectatorPublisher
+
+    publisher = SpectatorPublisher(args.spectate, token=args.spectate_token)
+    game.frame_hooks.append(publisher)
+    return publisher
+
+
+def capture(args: argparse.Namespace) -> None:
+    game = CosmicCorridorGame(headless=True, seed=args.seed)
+    # Offline export has no frame deadline, so wait for the writer, never drop.
+    with FrameCapture(
+        args.out,
+        fmt=args.format,
+        every=args.every,
+        roi=args.roi,
+        capacity=args.buffer,
+        block=True,
+        fps=FPS,
+    ) as frames:
+        game.capture = frames
+        game.run_headless(args.frames)
+    pygame.quit()
+    print(f"captured {frames.frames_written} frames to {frames.out_dir}")
+
+
+def _autoplay_game(args: argparse.Namespace) -> CosmicCorridorGame:
+    from .autopilot import Autopilot
+
+    game = CosmicCorridorGame(headless=not args.window, seed=args.seed)
+    game.input_source = Autopilot(game)
+    game.auto_restart = True
+    return game
+
+
+def autoplay(args: argparse.Namespace, game: CosmicCorridorGame | None = None) -> None:
+    if game is None:
+        game = _autoplay_game(args)
+    publisher = _start_spectating(game, args)
+    recorder = _start_recording(game, args)
+    frames = int(args.minutes * 60 * FPS) if args.minutes > 0 else None
+
+    started = time.perf_counter()
+    if args.window:
+        game.run(max_frames=frames)
+    else:
+        chunk = FPS * 60
+        done = 0
+        while game.running and (frames is None or done < frames):
+            step = chunk if frames is None else min(chunk, frames - done)
+            game.run_headless(step, render=not args.no_render)
+            done += step
+        pygame.quit()
+    elapsed = time.perf_counter() - started
+    if publisher is not None:
+        publisher.close()
+    _stop_recording(game, recorder)
+
+    results = game.history + [(game.score, game.time_survived)]
+    best = max(score for score, _ in results)
+    survived = sum(t for _, t in results)
+    print(
+        f"autoplay: {len(game.history)} games finished, best score {best}, "
+        f"{survived:.0f} s of game time in {elapsed:.1f} s wall time"
+    )
+
+
+def soak(args: argparse.Namespace) -> None:
+    from .soak import SoakMonitor
+
+    game = _autoplay_game(args)
+    monitor = SoakMonitor(
+        game,
+        args.report,
+        sample_every=args.sample_every,
+        snapshot_every=args.snapshot_every,
+        warmup=args.warmup,
+        max_growth_mb_per_hour=args.max_growth,
+    )
+    game.frame_hooks.append(monitor)
+    try:
+        autoplay(args, game)
+    finally:
+        passed, rates = monitor.close()
+    growth = ", ".join(f"{name} {rate:+.2f} MB/h" for name, rate in rates.items())
+    print(f"soak: {'PASS' if passed else 'FAIL'} ({growth}); report in {args.report}")
+    if not passed:
+        raise SystemExit(1)
+
+
+def coop(args: argparse.Namespace) -> None:
+    from .autopilot import Autopilot
+    from .netcode import LoopbackNetwork, RollbackSession, UdpTransport
+
+    game = CosmicCorridorGame(seed=args.seed, players=2)
+    if args.peer is not None:
+        transport = UdpTransport(args.bind, args.peer)
+        local = args.player
+    else:
+        # No peer given: the autopilot plays player 2 on a simulated link.
+        net = LoopbackNetwork(
+            args.latency / 1000, args.jitter / 1000, args.loss, seed=args.seed
+        )
+        transport, local = net.a, 0
+        remote = CosmicCorridorGame(headless=True, seed=args.seed, players=2)
+        remote.input_source = Autopilot(remote, index=1)
+        remote.session = RollbackSession(
+            remote, 1, net.b, max_rollback=args.max_rollback
+        )
+        game.frame_hooks.append(lambda _game: remote.run_headless(1, render=False))
+
+    session = RollbackSession(game, local, transport, max_rollback=args.max_rollback)
+    game.session = session
+    game.run()
+    print(
+        f"coop: {session.tick} ticks, {session.rollbacks} rollbacks "
+        f"({session.resimulated} ticks re-simulated, deepest {session.max_depth}), "
+        f"{session.stalls} stalls"
+    )
+
+
+def cloud(args: argparse.Namespace) -> None:
+    from .cloudplay import CloudServer
+
+    server = CloudServer(
+        max_sessions=args.max_sessions,
+        idle_timeout=args.idle_timeout,
+        fps=args.fps,
+        render_scale=args.render_scale,
+        tile=args.tile,
+        max_bytes_per_s=args.kbps * 1000 / 8,
+        cpu_share=args.cpu_share,
+    )
+    print(f"cloud play on http://{args.host}:{args.port}/")
+    server.run(args.host, args.port)
+
+
+def replays(args: argparse.Namespace) -> None:
+    from .replay import ReplayArchive, play
+
+    with ReplayArchive(args.archive) as archive:
+        if args.action == "import":
+            if args.path == "-":
+                count = archive.import_stream(sys.stdin.buffer)
+            else:
+                with open(args.path, "rb") as stream:
+                    count = archive.import_stream(stream)
+            print(f"imported {count} replays into {archive.root}", file=sys.stderr)
+            return
+        if args.action == "verify":
+            replay = archive.get(args.id)
+            game = play(replay)
+            ok = (game.score, game.time_survived) == (replay.score, replay.duration)
+            print(
+                f"replay {args.id}: recorded score {replay.score}, "
+                f"re-simulated {game.score} ({'OK' if ok else 'MISMATCH'})"
+            )
+            if not ok:
+                raise SystemExit(1)
+            return
+
+        rows = archive.query(
+            since=time.time() - args.since if args.since else None,
+            min_score=args.min_score,
+            max_duration=args.max_duration,
+            died=True if args.died else None,
+            order=args.order,
+            limit=args.limit,
+        )
+        if args.action == "export":
+            with open(args.out, "wb") as stream:
+                count = archive.export_stream(stream, (row.id for row in rows))
+            print(f"exported {count} replays", file=sys.stderr)
+            return
+        for row in rows:
+            created = time.strftime("%Y-%m-%d %H:%M", time.localtime(row.created))
+            print(
+                f"{row.id:>7}  {created}  score {row.score:>6}  "
+                f"{row.duration:7.1f} s  {'died' if row.died else 'quit'}  "
+                f"seed {row.seed}  v{row.version}  {row.label}"
+            )
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = build_parser().parse_args(argv)
+    if args.command == "capture":
+        capture(args)
+        return
+    if args.command == "autoplay":
+        autoplay(args)
+        return
+    if args.command == "soak":
+        soak(args)
+        return
+    if args.command == "coop":
+        coop(args)
+        return
+    if args.command == "cloud":
+        cloud(args)
+        return
+    if args.command == "replays":
+        replays(args)
+        return
+    game = CosmicCorridorGame(
+        render_scale=getattr(args, "render_scale", 1.0),
+        present=getattr(args, "present", "scaled"),
+        fps=getattr(args, "fps", FPS),
+    )
+    publisher = _start_spectating(game, args)
+    recorder = _start_recording(game, args)
     game.run()
+    if publisher is not None:
+        publisher.close()
+    _stop_recording(game, recorder)
 
 
 if __name__ == "__main__":
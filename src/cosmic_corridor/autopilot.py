@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from .controls import FIRE, LEFT, RIGHT, KeyState
+from .game import WIDTH, CosmicCorridorGame
+
+LANE_STEP = 40
+LANES = tuple(float(x) for x in range(40, WIDTH - 40 + 1, LANE_STEP))
+
+
+class Autopilot:
+    """Heuristic bot that plays through the same input hook as the keyboard.
+
+    Each call scores a handful of horizontal lanes: enemies that will reach the
+    player's row within ``horizon`` seconds make a lane (and every lane on the
+    way to it) dangerous, power-ups and enemies still high up make it
+    attractive. The player steers toward the best lane and fires whenever an
+    enemy is lined up. The cost is a few hundred float operations per tick.
+    ``index`` picks the player to steer in co-op games.
+    """
+
+    def __init__(
+        self,
+        game: CosmicCorridorGame,
+        horizon: float = 1.1,
+        margin: float = 10.0,
+        index: int = 0,
+    ) -> None:
+        self.game = game
+        self.horizon = horizon
+        self.margin = margin
+        self.index = index
+        self.target_x = game.players[index].x
+
+    def __call__(self) -> KeyState:
+        game = self.game
+        player = game.players[self.index]
+        if game.game_over:
+            return KeyState()
+
+        lanes = LANES
+        danger = [0.0] * len(lanes)
+        appeal = [0.0] * len(lanes)
+
+        top = player.y - player.h / 2
+        for enemy in game.enemies:
+            gap = top - (enemy.y + enemy.h / 2)
+            reach = (enemy.w + player.w) / 2 + self.margin
+            if gap < -enemy.h - player.h:
+                continue  # already below the player
+            eta = max(gap, 0.0) / enemy.vy if enemy.vy > 0 else 99.0
+            for i, lane in enumerate(lanes):
+                if abs(enemy.x - lane) < reach:
+                    if eta < self.horizon:
+                        danger[i] += 1.0 / (eta + 0.05)
+                    else:
+                        appeal[i] += 0.5
+        for powerup in game.powerups:
+            for i, lane in enumerate(lanes):
+                if abs(powerup.x - lane) < LANE_STEP:
+                    appeal[i] += 2.0
+
+        here = min(range(len(lanes)), key=lambda i: abs(lanes[i] - player.x))
+
+        def cost(i: int) -> float:
+            # Danger at the destination counts fully, lanes crossed on the way
+            # less so; travel time and attractions break ties.
+            a, b = (here + 1, i) if here < i else (i, here - 1)
+            crossed = max(danger[a : b + 1], default=0.0)
+            travel = abs(lanes[i] - player.x) / player.speed
+            return danger[i] * 10.0 + crossed * 4.0 + travel - appeal[i]
+
+        best_i = min(range(len(lanes)), key=cost)
+        # Stick with the previous target unless the new one is clearly better.
+        current = min(range(len(lanes)), key=lambda i: abs(lanes[i] - self.target_x))
+        if cost(best_i) < cost(current) - 0.25:
+            self.target_x = lanes[best_i]
+
+        mask = 0
+        dx = self.target_x - player.x
+        if dx < -4:
+            mask |= LEFT
+        elif dx > 4:
+            mask |= RIGHT
+
+        for enemy in game.enemies:
+            if enemy.y < top and abs(enemy.x - player.x) < enemy.w / 2 + 12:
+                mask |= FIRE
+                break
+        return KeyState(mask)
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import json
+import threading
+from collections import deque
+from pathlib import Path
+
+import pygame
+
+FORMATS = ("png", "raw")
+
+
+class FrameCapture:
+    """Copy rendered frames into a bounded ring buffer and encode them off-thread.
+
+    Every ``every``-th frame is cropped to ``roi`` and copied once into an RGB
+    byte string on the game thread; a background writer turns the queued frames
+    into a PNG sequence or a single raw ``rgb24`` stream (plus a JSON sidecar
+    describing it). When the ring buffer is full the frame is dropped, or, with
+    ``block=True``, the game thread waits for the writer instead.
+    """
+
+    def __init__(
+        self,
+        out_dir: str | Path,
+        fmt: str = "png",
+        every: int = 1,
+        roi: pygame.Rect | None = None,
+        capacity: int = 32,
+        block: bool = False,
+        fps: float = 60.0,
+    ) -> None:
+        if fmt not in FORMATS:
+            raise ValueError(f"unknown capture format {fmt!r}; expected {FORMATS}")
+        if every < 1:
+            raise ValueError("every must be >= 1")
+
+        self.out_dir = Path(out_dir)
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        self.fmt = fmt
+        self.every = every
+        self.roi = pygame.Rect(roi) if roi is not None else None
+        self.capacity = capacity
+        self.block = block
+        self.fps = fps
+
+        self.frames_seen = 0
+        self.frames_captured = 0
+        self.frames_dropped = 0
+        self.frames_written = 0
+        self.size: tuple[int, int] | None = None
+
+        self._ring: deque[tuple[int, bytes]] = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._error: BaseException | None = None
+        self._stream = None
+        self._writer = threading.Thread(
+            target=self._write_loop, name="frame-capture", daemon=True
+        )
+        self._writer.start()
+
+    # ---------- game thread ----------
+    def capture(self, surface: pygame.Surface) -> bool:
+        """Queue ``surface`` if it is due; returns ``True`` when it was queued."""
+        index = self.frames_seen
+        self.frames_seen += 1
+        if index % self.every:
+            return False
+        if self._error is not None:
+            raise RuntimeError("frame capture writer failed") from self._error
+
+        source = surface
+        if self.roi is not None:
+            source = surface.subsurface(self.roi.clip(surface.get_rect()))
+        if self.size is None:
+            self.size = source.get_size()
+        elif source.get_size() != self.size:
+            raise ValueError("captured frames must all have the same size")
+        # One copy straight into row-major RGB. A surfarray.pixels3d view is
+        # column-major, so copying it out needs a strided transpose and
+        # measured about twice as slow (2.9 vs 1.5 ms at 800x600).
+        data = pygame.image.tobytes(source, "RGB")
+
+        with self._cond:
+            while len(self._ring) >= self.capacity:
+                if self._error is not None:
+                    raise RuntimeError("frame capture writer failed") from self._error
+                if not self.block:
+                    self.frames_dropped += 1
+                    return False
+                self._cond.wait()
+            self._ring.append((self.frames_captured, data))
+            self.frames_captured += 1
+            self._cond.notify_all()
+        return True
+
+    def close(self) -> None:
+        """Flush the queued frames and stop the writer thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._writer.join()
+        if self._error is not None:
+            raise RuntimeError("frame capture writer failed") from self._error
+
+    def __enter__(self) -> FrameCapture:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    # ---------- writer thread ----------
+    def _write_loop(self) -> None:
+        try:
+            while True:
+                with self._cond:
+                    while not self._ring and not self._closed:
+                        self._cond.wait()
+                    if not self._ring:
+                        break
+                    number, data = self._ring.popleft()
+                    self._cond.notify_all()
+                self._write(number, data)
+                self.frames_written += 1
+        except BaseException as exc:  # surfaced on the game thread
+            self._error = exc
+            with self._cond:
+                self._ring.clear()
+                self._cond.notify_all()
+        finally:
+            if self._stream is not None:
+                self._stream.close()
+            if self.fmt == "raw" and self.size is not None:
+                self._write_sidecar()
+
+    def _write(self, number: int, data: bytes) -> None:
+        assert self.size is not None
+        if self.fmt == "png":
+            frame = pygame.image.frombuffer(data, self.size, "RGB")
+            pygame.image.save(frame, str(self.out_dir / f"frame_{number:06d}.png"))
+        else:
+            if self._stream is None:
+                self._stream = open(self.out_dir / "capture.rgb", "wb")
+            self._stream.write(data)
+
+    def _write_sidecar(self) -> None:
+        assert self.size is not None
+        w, h = self.size
+        meta = {
+            "file": "capture.rgb",
+            "pix_fmt": "rgb24",
+            "width": w,
+            "height": h,
+            "fps": self.fps / self.every,
+            "frames": self.frames_written,
+            "ffmpeg": (
+                f"ffmpeg -f rawvideo -pix_fmt rgb24 -s {w}x{h} "
+                f"-r {self.fps / self.every:g} -i capture.rgb capture.mp4"
+            ),
+        }
+        (self.out_dir / "capture.json").write_text(json.dumps(meta, indent=2))
@@ -0,0 +1,657 @@
+from __future__ import annotations
+
+import asyncio
+import base64
+import hashlib
+import json
+import math
+import struct
+import time
+import zlib
+from http import HTTPStatus
+
+import numpy as np
+import pygame
+
+from .controls import FIRE, LEFT, RIGHT, KeyState
+from .metrics import GAME_ROOMS, GAME_TICK_SECONDS, REGISTRY
+
+# kind, sequence, width, height, tile size, tile count; then the changed
+# tiles' indices (u16, row-major) and one zlib stream of their RGB rows.
+FRAME_HEADER = struct.Struct("!BIHHHH")
+KIND_FRAME = 1
+# Input byte from the client: gameplay buttons plus a restart request.
+RESTART = 8
+BUTTONS = LEFT | RIGHT | FIRE
+
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+MAX_REQUEST_BYTES = 8192
+
+BYTES_SENT = REGISTRY.counter("cloud_bytes_sent", "Frame bytes sent to players.")
+FRAMES_SENT = REGISTRY.counter("cloud_frames_sent", "Frames sent to players.")
+FRAMES_SKIPPED = REGISTRY.counter(
+    "cloud_frames_skipped", "Frames not sent to players.", ("reason",)
+)
+SESSIONS_REJECTED = REGISTRY.counter(
+    "cloud_sessions_rejected", "Players turned away because the server was full."
+)
+
+
+# ---------- tile deltas ----------
+class TileEncoder:
+    """Frame deltas as the tiles that changed since the last frame sent.
+
+    Each frame is compared pixel by pixel with the previous one and only the
+    ``tile`` x ``tile`` blocks containing a difference are sent, as one zlib
+    stream. The first frame (or one after :meth:`reset`) sends every tile.
+    Edge tiles are cut to the frame, so any size works.
+    """
+
+    def __init__(self, size: tuple[int, int], tile: int = 20, level: int = 1) -> None:
+        self.width, self.height = size
+        self.tile = tile
+        self.level = level
+        self.cols = math.ceil(self.width / tile)
+        self.rows = math.ceil(self.height / tile)
+        if self.cols * self.rows > 0xFFFF:
+            raise ValueError("too many tiles; use a larger tile size")
+        self.seq = 0
+        self._prev: np.ndarray | None = None
+        self._row_starts = np.arange(0, self.height, tile)
+        self._col_bytes = np.arange(0, self.width, tile) * 3
+
+    def reset(self) -> None:
+        self._prev = None
+
+    def encode(self, surface: pygame.Surface) -> bytes | None:
+        """Delta message for ``surface``, or ``None`` if nothing changed."""
+        raw = pygame.image.tobytes(surface, "RGB")
+        frame = np.frombuffer(raw, np.uint8).reshape(self.height, self.width, 3)
+        if self._prev is None:
+            changed = np.ones((self.rows, self.cols), bool)
+        else:
+            # Compare rows as flat bytes and fold them into tiles with
+            # reduceat; reducing over the channel axis first is far slower.
+            diff = frame.reshape(self.height, -1) != self._prev.reshape(self.height, -1)
+            changed = np.logical_or.reduceat(diff, self._row_starts, axis=0)
+            changed = np.logical_or.reduceat(changed, self._col_bytes, axis=1)
+            if not changed.any():
+                return None
+        self._prev = frame
+
+        tile = self.tile
+        indices = np.flatnonzero(changed)
+        packer = zlib.compressobj(self.level)
+        chunks = []
+        for index in indices.tolist():
+            ty, tx = divmod(index, self.cols)
+            block = frame[ty * tile : (ty + 1) * tile, tx * tile : (tx + 1) * tile]
+            chunks.append(packer.compress(block.tobytes()))
+        chunks.append(packer.flush())
+        self.seq += 1
+        header = FRAME_HEADER.pack(
+            KIND_FRAME, self.seq, self.width, self.height, tile, len(indices)
+        )
+        return header + indices.astype(">u2").tobytes() + b"".join(chunks)
+
+
+class TileDecoder:
+    """Applies :class:`TileEncoder` messages to an RGB array (the browser
+    client does the same in JavaScript)."""
+
+    def __init__(self) -> None:
+        self.frame: np.ndarray | None = None
+
+    def apply(self, message: bytes) -> None:
+        kind, _seq, width, height, tile, count = FRAME_HEADER.unpack_from(message)
+        if kind != KIND_FRAME:
+            raise ValueError(f"unknown message kind {kind}")
+        if self.frame is None or self.frame.shape != (height, width, 3):
+            self.frame = np.zeros((height, width, 3), np.uint8)
+        start = FRAME_HEADER.size
+        indices = np.frombuffer(message, ">u2", count, start)
+        pixels = zlib.decompress(message[start + 2 * count :])
+        cols = math.ceil(width / tile)
+        offset = 0
+        for index in indices.tolist():
+            ty, tx = divmod(index, cols)
+            block = self.frame[ty * tile : (ty + 1) * tile, tx * tile : (tx + 1) * tile]
+            size = block.size
+            block[...] = np.frombuffer(pixels, np.uint8, size, offset).reshape(
+                block.shape
+            )
+            offset += size
+
+
+# ---------- WebSocket (RFC 6455, server side) ----------
+def websocket_accept(key: str) -> str:
+    digest = hashlib.sha1((key + WS_GUID).encode()).digest()
+    return base64.b64encode(digest).decode()
+
+
+def encode_ws_frame(opcode: int, payload: bytes) -> bytes:
+    """One unfragmented, unmasked frame (servers never mask)."""
+    n = len(payload)
+    if n < 126:
+        head = struct.pack("!BB", 0x80 | opcode, n)
+    elif n < 1 << 16:
+        head = struct.pack("!BBH", 0x80 | opcode, 126, n)
+    else:
+        head = struct.pack("!BBQ", 0x80 | opcode, 127, n)
+    return head + payload
+
+
+def _unmask(payload: bytes, mask: bytes) -> bytes:
+    n = len(payload)
+    key = (mask * (n // 4 + 1))[:n]
+    return (int.from_bytes(payload, "big") ^ int.from_bytes(key, "big")).to_bytes(
+        n, "big"
+    )
+
+
+class WebSocketClosed(Exception):
+    """The peer closed the connection or broke the protocol."""
+
+
+class WebSocket:
+    """Minimal server-side WebSocket over asyncio streams.
+
+    Handles masking, fragmented messages, ping/pong and the closing
+    handshake; messages over ``max_message`` bytes close the connection.
+    """
+
+    def __init__(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        max_message: int = 1024,
+    ) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.max_message = max_message
+        self.closed = False
+
+    async def receive(self) -> bytes | str:
+        """Next text or binary message; raises :class:`WebSocketClosed`."""
+        message = b""
+        message_opcode = None
+        while True:
+            try:
+                head = await self.reader.readexactly(2)
+                fin, opcode = head[0] & 0x80, head[0] & 0x0F
+                length = head[1] & 0x7F
+                if length == 126:
+                    (length,) = struct.unpack("!H", await self.reader.readexactly(2))
+                elif length == 127:
+                    (length,) = struct.unpack("!Q", await self.reader.readexactly(8))
+                if not head[1] & 0x80:
+                    await self.close(1002)  # clients must mask
+                    raise WebSocketClosed("unmasked client frame")
+                if len(message) + length > self.max_message:
+                    await self.close(1009)
+                    raise WebSocketClosed("message too big")
+                mask = await self.reader.readexactly(4)
+                payload = _unmask(await self.reader.readexactly(length), mask)
+            except (asyncio.IncompleteReadError, ConnectionError) as exc:
+                self.closed = True
+                raise WebSocketClosed("connection lost") from exc
+
+            if opcode == 0x8:
+                await self.close(1000)
+                raise WebSocketClosed("closed by peer")
+            if opcode == 0x9:
+                self._write(encode_ws_frame(0xA, payload))
+                continue
+            if opcode == 0xA:
+                continue
+            if opcode in (0x1, 0x2):
+                message_opcode = opcode
+                message = payload
+            elif opcode == 0x0 and message_opcode is not None:
+                message += payload
+            else:
+                await self.close(1002)
+                raise WebSocketClosed(f"unexpected opcode {opcode}")
+            if fin:
+                return message.decode() if message_opcode == 0x1 else message
+
+    def _write(self, data: bytes) -> None:
+        if not self.closed:
+            self.writer.write(data)
+
+    def send(self, message: bytes | str) -> None:
+        if isinstance(message, str):
+            self._write(encode_ws_frame(0x1, message.encode()))
+        else:
+            self._write(encode_ws_frame(0x2, message))
+
+    def buffered(self) -> int:
+        """Bytes written but not yet handed to the kernel."""
+        return self.writer.transport.get_write_buffer_size()
+
+    async def close(self, code: int = 1000) -> None:
+        if self.closed:
+            return
+        self._write(encode_ws_frame(0x8, struct.pack("!H", code)))
+        self.closed = True
+        try:
+            await self.writer.drain()
+        except ConnectionError:
+            pass
+        self.writer.close()
+
+
+# ---------- sessions ----------
+class CloudSession:
+    """One player's headless game, rendered and sent as tile deltas.
+
+    The simulation always advances one fixed tick per call to :meth:`tick`;
+    only rendering and encoding are shed under the caps. When the session's
+    measured CPU share (render + encode + simulation, per second of wall
+    time) goes over ``cpu_share`` it draws only every ``stride``-th frame,
+    and when its token bucket of ``max_bytes_per_s`` runs dry it skips
+    sending until the bucket refills. Skipped frames cost no bandwidth: the
+    encoder diffs against the last frame actually sent.
+    """
+
+    def __init__(
+        self,
+        fps: float = 30.0,
+        render_scale: float = 0.5,
+        tile: int = 20,
+        max_bytes_per_s: float = 250_000,
+        cpu_share: float = 0.25,
+        max_stride: int = 6,
+        seed: int | None = None,
+    ) -> None:
+        from .game import CosmicCorridorGame
+
+        self.game = CosmicCorridorGame(
+            headless=True, seed=seed, render_scale=render_scale
+        )
+        self.game.input_source = self._next_input
+        self.encoder = TileEncoder(self.game.render_size, tile)
+        self.dt = 1.0 / fps
+        self.fps = fps
+        self.max_bytes_per_s = max_bytes_per_s
+        self.cpu_share = cpu_share
+        self.max_stride = max_stride
+        self.stride = 1
+        self.ticks = 0
+        self.frames_sent = 0
+        self.bytes_sent = 0
+        self.skipped: dict[str, int] = {"cpu": 0, "bandwidth": 0, "backpressure": 0}
+        self.measured_cpu = 0.0
+        self.last_input = time.monotonic()
+        self._held = 0
+        self._tapped = 0
+        self._restart = False
+        self._tokens = max_bytes_per_s  # a full second of burst
+        self._cpu_window = 0.0
+        self._window_ticks = 0
+
+    # ---------- input ----------
+    def press(self, mask: int) -> None:
+        """Buttons the client holds now; taps between ticks still count."""
+        self._held = mask & BUTTONS
+        self._tapped |= self._held
+        if mask & RESTART and self.game.can_restart:
+            self._restart = True  # only at game over; never latched mid-game
+        self.last_input = time.monotonic()
+
+    def _next_input(self) -> KeyState:
+        keys = KeyState(self._held | self._tapped)
+        self._tapped = 0
+        return keys
+
+    # ---------- ticking ----------
+    def tick(self, backlog: int = 0, max_backlog: int = 256 * 1024) -> bytes | None:
+        """Advance one tick; returns a frame message to send, if any."""
+        cpu_start = time.thread_time()
+        game = self.game
+        if self._restart and game.can_restart:
+            game._reset()
+            self._restart = False
+        self.ticks += 1
+        draw = self.ticks % self.stride == 0
+        if not draw:
+            self.skipped["cpu"] += 1
+            FRAMES_SKIPPED.labels("cpu").inc()
+        game.run_headless(1, dt=self.dt, render=draw)
+
+        self._tokens = min(
+            self.max_bytes_per_s, self._tokens + self.max_bytes_per_s * self.dt
+        )
+        message = None
+        if draw:
+            if backlog > max_backlog:
+                reason = "backpressure"  # the client is not keeping up
+            elif self._tokens <= 0:
+                reason = "bandwidth"
+            else:
+                reason = None
+                message = self.encoder.encode(game.screen)
+            if reason is not None:
+                self.skipped[reason] += 1
+                FRAMES_SKIPPED.labels(reason).inc()
+            elif message is not None:
+                self._tokens -= len(message)
+                self.frames_sent += 1
+                self.bytes_sent += len(message)
+                FRAMES_SENT.inc()
+                BYTES_SENT.inc(len(message))
+        self._account(time.thread_time() - cpu_start)
+        return message
+
+    def _account(self, cpu: float) -> None:
+        """Adjust the render stride about once a second of game time."""
+        self._cpu_window += cpu
+        self._window_ticks += 1
+        if self._window_ticks < self.fps:
+            return
+        self.measured_cpu = self._cpu_window / (self._window_ticks * self.dt)
+        if self.measured_cpu > self.cpu_share and self.stride < self.max_stride:
+            self.stride += 1
+        elif self.measured_cpu < self.cpu_share * 0.6 and self.stride > 1:
+            self.stride -= 1
+        self._cpu_window = 0.0
+        self._window_ticks = 0
+
+    def stats(self) -> dict:
+        return {
+            "ticks": self.ticks,
+            "score": self.game.score,
+            "frames_sent": self.frames_sent,
+            "bytes_sent": self.bytes_sent,
+            "skipped": dict(self.skipped),
+            "stride": self.stride,
+            "cpu_share": round(self.measured_cpu, 3),
+        }
+
+
+# ---------- server ----------
+class CloudServer:
+    """Serves the thin client and runs one :class:`CloudSession` per player.
+
+    ``GET /`` is the canvas client, ``GET /play`` upgrades to the WebSocket
+    carrying frames one way and input bytes the other, ``GET /sessions``
+    lists per-session stats and ``GET /metrics`` exposes the registry. All
+    sessions tick on the event loop thread, so ``max_sessions`` and the
+    per-session caps are what keep one box within its CPU.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = 8,
+        idle_timeout: float = 300.0,
+        **session_options,
+    ) -> None:
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.session_options = session_options
+        self.sessions: set[CloudSession] = set()
+
+    async def start(self, host: str = "0.0.0.0", port: int = 8765) -> asyncio.Server:
+        return await asyncio.start_server(self._handle, host, port)
+
+    def run(self, host: str = "0.0.0.0", port: int = 8765) -> None:
+        async def serve() -> None:
+            server = await self.start(host, port)
+            async with server:
+                await server.serve_forever()
+
+        asyncio.run(serve())
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), 10.0)
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+            return
+        except asyncio.LimitOverrunError:
+            head = b""
+        if not head or len(head) > MAX_REQUEST_BYTES:
+            await self._respond(writer, 431, "text/plain", b"request too large")
+            return
+        request_line, *lines = head.decode("latin-1").split("\r\n")
+        method, path, *_ = (request_line.split(" ") + ["", ""])[:3]
+        headers = {}
+        for line in lines:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        path = path.split("?", 1)[0]
+
+        if method != "GET":
+            await self._respond(writer, 405, "text/plain", b"method not allowed")
+        elif path == "/":
+            await self._respond(writer, 200, "text/html; charset=utf-8", CLIENT_BYTES)
+        elif path == "/health":
+            await self._respond(writer, 200, "application/json", b'{"status":"ok"}')
+        elif path == "/metrics":
+            body = REGISTRY.render().encode()
+            await self._respond(writer, 200, "text/plain; version=0.0.4", body)
+        elif path == "/sessions":
+            body = json.dumps([s.stats() for s in self.sessions]).encode()
+            await self._respond(writer, 200, "application/json", body)
+        elif path == "/play":
+            await self._play(reader, writer, headers)
+        else:
+            await self._respond(writer, 404, "text/plain", b"not found")
+
+    async def _respond(
+        self,
+        writer: asyncio.StreamWriter,
+        status: int,
+        content_type: str,
+        body: bytes,
+        extra: str = "",
+    ) -> None:
+        reason = HTTPStatus(status).phrase
+        writer.write(
+            f"HTTP/1.1 {status} {reason}\r\nContent-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: close\r\n{extra}\r\n".encode()
+            + body
+        )
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+        writer.close()
+
+    async def _play(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        headers: dict[str, str],
+    ) -> None:
+        key = headers.get("sec-websocket-key")
+        if headers.get("upgrade", "").lower() != "websocket" or not key:
+            await self._respond(writer, 400, "text/plain", b"expected a WebSocket")
+            return
+        if len(self.sessions) >= self.max_sessions:
+            SESSIONS_REJECTED.inc()
+            await self._respond(
+                writer, 503, "text/plain", b"server full", "Retry-After: 30\r\n"
+            )
+            return
+        writer.write(
+            "HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Accept: {websocket_accept(key)}\r\n\r\n".encode()
+        )
+        ws = WebSocket(reader, writer)
+        session = CloudSession(**self.session_options)
+        self.sessions.add(session)
+        GAME_ROOMS.inc()
+        ws.send(
+            json.dumps(
+                {
+                    "width": session.encoder.width,
+                    "height": session.encoder.height,
+                    "tile": session.encoder.tile,
+                    "fps": session.fps,
+                }
+            )
+        )
+        inputs = asyncio.create_task(self._read_inputs(ws, session))
+        try:
+            await self._tick_loop(ws, session, inputs)
+        finally:
+            inputs.cancel()
+            self.sessions.discard(session)
+            GAME_ROOMS.dec()
+            await ws.close(1001)
+
+    async def _read_inputs(self, ws: WebSocket, session: CloudSession) -> None:
+        try:
+            while True:
+                message = await ws.receive()
+                if isinstance(message, bytes) and message:
+                    session.press(message[-1])
+        except WebSocketClosed:
+            pass
+
+    async def _tick_loop(
+        self, ws: WebSocket, session: CloudSession, inputs: asyncio.Task
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time()
+        while not inputs.done() and not ws.closed:
+            if time.monotonic() - session.last_input > self.idle_timeout:
+                return
+            started = time.perf_counter()
+            message = session.tick(ws.buffered())
+            GAME_TICK_SECONDS.observe(time.perf_counter() - started)
+            if message is not None:
+                ws.send(message)
+            deadline += session.dt
+            delay = deadline - loop.time()
+            if delay < -session.dt:
+                deadline = loop.time()  # fell behind: do not burst to catch up
+            await asyncio.sleep(max(0.0, delay))
+
+
+CLIENT_HTML = """
+<!doctype html>
+<html lang="en">
+<head>
+  <meta charset="utf-8">
+  <title>Cosmic Corridor – Cloud Play</title>
+  <style>
+    body {
+      margin: 0;
+      background: #02020a;
+      color: #f5f5ff;
+      font-family: system-ui, -apple-system, BlinkMacSystemFont, "Segoe UI", sans-serif;
+      display: flex;
+      flex-direction: column;
+      align-items: center;
+      justify-content: center;
+      min-height: 100vh;
+    }
+    canvas {
+      width: 800px;
+      height: 600px;
+      image-rendering: pixelated;
+      background: #050515;
+      border-radius: 12px;
+      border: 1px solid rgba(90, 110, 200, 0.7);
+    }
+    #status { margin-top: 8px; font-size: 12px; color: #c6c6f0; }
+  </style>
+</head>
+<body>
+  <canvas id="view"></canvas>
+  <div id="status">connecting…</div>
+<script>
+(() => {
+  const canvas = document.getElementById("view");
+  const ctx = canvas.getContext("2d");
+  const status = document.getElementById("status");
+  const scheme = location.protocol === "https:" ? "wss://" : "ws://";
+  const ws = new WebSocket(scheme + location.host + "/play");
+  ws.binaryType = "arraybuffer";
+  let image = null;
+  let pending = Promise.resolve();
+  let received = 0;
+
+  async function inflate(bytes) {
+    const stream = new Blob([bytes]).stream()
+      .pipeThrough(new DecompressionStream("deflate"));
+    return new Uint8Array(await new Response(stream).arrayBuffer());
+  }
+
+  async function apply(buffer) {
+    const view = new DataView(buffer);
+    const width = view.getUint16(5);
+    const height = view.getUint16(7);
+    const tile = view.getUint16(9);
+    const count = view.getUint16(11);
+    const pixels = await inflate(new Uint8Array(buffer, 13 + 2 * count));
+    const cols = Math.ceil(width / tile);
+    const data = image.data;
+    let offset = 0;
+    for (let i = 0; i < count; i++) {
+      const index = view.getUint16(13 + 2 * i);
+      const x0 = (index % cols) * tile;
+      const y0 = Math.floor(index / cols) * tile;
+      const w = Math.min(tile, width - x0);
+      const h = Math.min(tile, height - y0);
+      for (let y = y0; y < y0 + h; y++) {
+        let p = (y * width + x0) * 4;
+        for (let x = 0; x < w; x++, p += 4) {
+          data[p] = pixels[offset++];
+          data[p + 1] = pixels[offset++];
+          data[p + 2] = pixels[offset++];
+        }
+      }
+    }
+    ctx.putImageData(image, 0, 0);
+  }
+
+  ws.onmessage = (e) => {
+    if (typeof e.data === "string") {
+      const hello = JSON.parse(e.data);
+      canvas.width = hello.width;
+      canvas.height = hello.height;
+      image = ctx.createImageData(hello.width, hello.height);
+      image.data.fill(255);
+      return;
+    }
+    received += e.data.byteLength;
+    pending = pending.then(() => apply(e.data));  // keep frames in order
+  };
+  ws.onopen = () => { status.textContent = "live"; };
+  ws.onclose = () => { status.textContent = "disconnected – reload to play again"; };
+  setInterval(() => {
+    if (ws.readyState === WebSocket.OPEN) {
+      status.textContent = `live · ${(received * 8 / 1000).toFixed(0)} kbit/s`;
+    }
+    received = 0;
+  }, 1000);
+
+  const BITS = { ArrowLeft: 1, KeyA: 1, ArrowRight: 2, KeyD: 2, Space: 4 };
+  let held = 0;
+  function send(mask) {
+    if (ws.readyState === WebSocket.OPEN) ws.send(new Uint8Array([mask]));
+  }
+  window.addEventListener("keydown", (e) => {
+    if (e.code === "Enter") { send(held | 8); return; }
+    const bit = BITS[e.code];
+    if (!bit) return;
+    e.preventDefault();
+    if (!(held & bit)) { held |= bit; send(held); }
+  });
+  window.addEventListener("keyup", (e) => {
+    const bit = BITS[e.code];
+    if (bit && held & bit) { held &= ~bit; send(held); }
+  });
+  window.addEventListener("blur", () => { held = 0; send(0); });
+})();
+</script>
+</body>
+</html>
+"""
+CLIENT_BYTES = CLIENT_HTML.encode()
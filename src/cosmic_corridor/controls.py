@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import time
+from collections import deque
+from collections.abc import Callable, Sequence
+
+import pygame
+
+# Gameplay buttons as bits, so one tick of input fits in a byte.
+LEFT = 1
+RIGHT = 2
+FIRE = 4
+
+_KEY_BITS = {
+    pygame.K_LEFT: LEFT,
+    pygame.K_a: LEFT,
+    pygame.K_RIGHT: RIGHT,
+    pygame.K_d: RIGHT,
+    pygame.K_SPACE: FIRE,
+}
+
+
+class KeyState:
+    """Drop-in for ``pygame.key.get_pressed()`` backed by a button bitmask."""
+
+    __slots__ = ("mask",)
+
+    def __init__(self, mask: int = 0) -> None:
+        self.mask = mask
+
+    def __getitem__(self, key: int) -> bool:
+        return bool(self.mask & _KEY_BITS.get(key, 0))
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, KeyState) and other.mask == self.mask
+
+    def __hash__(self) -> int:
+        return self.mask
+
+    def __repr__(self) -> str:
+        return f"KeyState({self.mask:#04b})"
+
+    @classmethod
+    def from_pressed(cls, pressed: Sequence[bool]) -> KeyState:
+        """Reduce a full keyboard snapshot to the gameplay buttons."""
+        mask = 0
+        for key, bit in _KEY_BITS.items():
+            if pressed[key]:
+                mask |= bit
+        return cls(mask)
+
+
+class InputBuffer:
+    """Keyboard state built from timestamped KEYDOWN/KEYUP events.
+
+    Events are stamped when the game loop drains them and folded into the
+    buttons held right now plus the buttons pressed since the last tick, so
+    a tap that starts and ends between two frames still counts for one tick.
+    :meth:`next_tick` is a drop-in ``input_source``.
+
+    For latency, the stamp of the oldest press consumed by a tick is kept
+    until :meth:`presented` is called after that frame's flip; the gap is
+    the input-to-photon latency up to the swap (the display's own scan-out
+    delay comes on top).
+    """
+
+    def __init__(
+        self, clock: Callable[[], float] = time.perf_counter, window: int = 120
+    ) -> None:
+        self.clock = clock
+        self.held = 0
+        self._tapped = 0
+        self._press_stamp: float | None = None
+        self._tick_stamp: float | None = None
+        self.latencies: deque[float] = deque(maxlen=window)
+
+    def handle(self, event: pygame.event.Event, stamp: float | None = None) -> None:
+        if event.type == pygame.WINDOWFOCUSLOST:
+            self.held = 0  # key-ups go to another window; avoid stuck keys
+            return
+        if event.type not in (pygame.KEYDOWN, pygame.KEYUP):
+            return
+        bit = _KEY_BITS.get(event.key)
+        if bit is None:
+            return
+        if event.type == pygame.KEYDOWN:
+            self.held |= bit
+            self._tapped |= bit
+            if self._press_stamp is None:
+                self._press_stamp = self.clock() if stamp is None else stamp
+        else:
+            self.held &= ~bit
+
+    def next_tick(self) -> KeyState:
+        """Buttons for one simulation tick: held now or tapped since last tick."""
+        mask = self.held | self._tapped
+        self._tapped = 0
+        if self._press_stamp is not None:
+            if self._tick_stamp is None:
+                self._tick_stamp = self._press_stamp
+            self._press_stamp = None
+        return KeyState(mask)
+
+    def presented(self, stamp: float | None = None) -> None:
+        """Call after the frame that used the last tick's input is flipped."""
+        if self._tick_stamp is None:
+            return
+        now = self.clock() if stamp is None else stamp
+        self.latencies.append(now - self._tick_stamp)
+        self._tick_stamp = None
+
+    def latency_ms(self) -> tuple[float, float] | None:
+        """``(median, max)`` input-to-photon latency over the recent window."""
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[len(ordered) // 2] * 1000, ordered[-1] * 1000
@@ -1,11 +1,27 @@
 from __future__ import annotations
 
 import math
+import os
 import random
+import time
+from collections.abc import Callable, Sequence
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
 import pygame
 
+from .capture import FrameCapture
+from .collision import rounded_mask, sweep_masks
+from .controls import InputBuffer, KeyState
+from .pacing import FramePacer
+from .particles import DEBRIS, HURT, POWERUP, SPARK, ParticleSystem
+from .quality import QualityGovernor
+from .sprites import COLORKEY, BlitItem, SpriteCache, blit_batch
+
+if TYPE_CHECKING:
+    from .netcode import RollbackSession
+    from .replay import ReplayRecorder
+
 WIDTH, HEIGHT = 800, 600
 FPS = 60
 
@@ -14,6 +30,8 @@ BG_BOTTOM = (10, 5, 40)
 
 PLAYER_COLOR = (230, 230, 250)
 PLAYER_OUTLINE = (80, 80, 160)
+PARTNER_COLOR = (220, 250, 230)
+PARTNER_OUTLINE = (60, 140, 100)
 
 ENEMY_COLOR = (240, 90, 120)
 ENEMY_OUTLINE = (60, 20, 40)
@@ -25,6 +43,15 @@ TEXT_COLOR = (235, 235, 245)
 
 MAX_LIVES = 3
 
+PLAYER_PALETTE = ((PLAYER_COLOR, PLAYER_OUTLINE), (PARTNER_COLOR, PARTNER_OUTLINE))
+
+# How the render target reaches the window: "scaled" lets SDL scale it on the
+# GPU (pygame.SCALED), "blit" scales it into a resizable window on the CPU.
+PRESENT_MODES = ("scaled", "blit")
+
+# Everything the simulation needs to resume, as nested tuples of plain values.
+GameState = tuple
+
 
 def lerp_color(c1: tuple[int, int, int], c2: tuple[int, int, int], t: float) -> tuple[int, int, int]:
     """Interpolate between two colors."""
@@ -55,6 +82,10 @@ class Player:
             self.h,
         )
 
+    @property
+    def mask(self) -> pygame.mask.Mask:
+        return rounded_mask(self.w, self.h, 8)
+
     def update(self, dt: float, keys: pygame.key.ScancodeWrapper) -> None:
         dx = 0
         if keys[pygame.K_LEFT] or keys[pygame.K_a]:
@@ -101,6 +132,10 @@ class Bullet:
             self.h,
         )
 
+    @property
+    def mask(self) -> pygame.mask.Mask:
+        return rounded_mask(self.w, self.h, 3)
+
     def update(self, dt: float) -> None:
         self.y += self.vy * dt
 
@@ -123,6 +158,10 @@ class Enemy:
             self.h,
         )
 
+    @property
+    def mask(self) -> pygame.mask.Mask:
+        return rounded_mask(self.w, self.h, 6)
+
     def update(self, dt: float) -> None:
         self.y += self.vy * dt
 
@@ -152,24 +191,86 @@ class PowerUp:
             self.size,
         )
 
+    @property
+    def mask(self) -> pygame.mask.Mask:
+        return rounded_mask(self.size, self.size, 6)
+
     def update(self, dt: float) -> None:
         self.y += self.vy * dt
 
 
+def _spawn_xs(players: int) -> list[float]:
+    return [WIDTH * (i + 1) / (players + 1) for i in range(players)]
+
+
 class CosmicCorridorGame:
     """Main game class for the Cosmic Corridor shooter."""
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        headless: bool = False,
+        seed: int | None = None,
+        players: int = 1,
+        render_scale: float = 1.0,
+        present: str = "scaled",
+        fps: float = FPS,
+    ) -> None:
+        if present not in PRESENT_MODES:
+            raise ValueError(f"present must be one of {PRESENT_MODES}")
+        self.headless = headless
+        if headless:
+            os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+            os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
         pygame.init()
-        pygame.display.set_caption("Cosmic Corridor – Arcade Space Shooter")
-        self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
-        self.clock = pygame.time.Clock()
-
-        self.font_small = pygame.font.SysFont("consolas", 18)
-        self.font_medium = pygame.font.SysFont("consolas", 24, bold=True)
-        self.font_big = pygame.font.SysFont("consolas", 36, bold=True)
 
-        self.player = Player(WIDTH / 2, HEIGHT - 70)
+        # Game logic works in WIDTH x HEIGHT logical units; ``screen`` is the
+        # render target, ``render_scale`` times that size in pixels.
+        self.scale = render_scale
+        self.render_size = (round(WIDTH * render_scale), round(HEIGHT * render_scale))
+        self.window: pygame.Surface | None = None
+        if headless:
+            self.screen = pygame.Surface(self.render_size)
+        else:
+            pygame.display.set_caption("Cosmic Corridor – Arcade Space Shooter")
+            if present == "scaled":
+                # SDL scales the render target to the window on the GPU.
+                try:
+                    self.screen = pygame.display.set_mode(
+                        self.render_size, pygame.SCALED | pygame.RESIZABLE
+                    )
+                except pygame.error:
+                    present = "blit"  # no renderer for SCALED on this driver
+            if present == "blit":
+                self.window = pygame.display.set_mode((WIDTH, HEIGHT), pygame.RESIZABLE)
+                self.screen = pygame.Surface(self.render_size).convert()
+        self.present = present
+        # Drains events while waiting for the frame deadline, so key presses
+        # are stamped close to when they happened.
+        self.pacer = FramePacer(fps, idle=self._handle_events)
+        # Each game is a function of its seed and inputs, which is all a replay
+        # stores; _reset draws the next game's seed from this one.
+        self.game_seed = seed if seed is not None else random.getrandbits(32)
+        self.rng = random.Random(self.game_seed)
+        # Cosmetic randomness stays out of the simulated (and rolled back) state.
+        self.fx_rng = random.Random(seed)
+        self.capture: FrameCapture | None = None
+        self.keyboard = InputBuffer()
+        # Anything indexable by pygame key constants, e.g. an Autopilot.
+        self.input_source: Callable[[], Sequence[bool]] = self.keyboard.next_tick
+        self.partner_source: Callable[[], Sequence[bool]] = KeyState
+        # Set by RollbackSession: it then advances the simulation instead.
+        self.session: RollbackSession | None = None
+        self.recorder: ReplayRecorder | None = None
+        self.auto_restart = False
+        # Called with the game after every frame (soak monitors, recorders...).
+        self.frame_hooks: list[Callable[[CosmicCorridorGame], None]] = []
+        self.history: list[tuple[int, float]] = []
+
+        self.font_small = pygame.font.SysFont("consolas", self._px(18))
+        self.font_medium = pygame.font.SysFont("consolas", self._px(24), bold=True)
+        self.font_big = pygame.font.SysFont("consolas", self._px(36), bold=True)
+
+        self.players = [Player(x, HEIGHT - 70) for x in _spawn_xs(players)]
         self.bullets: list[Bullet] = []
         self.enemies: list[Enemy] = []
         self.powerups: list[PowerUp] = []
@@ -190,14 +291,37 @@ class CosmicCorridorGame:
 
         self.starfield = self._create_starfield()
 
+        # Work to the frame rate actually asked for; uncapped keeps the default.
+        self.quality = QualityGovernor(budget=self.pacer.interval or 1.0 / FPS)
+        self.show_profiler = False
+
+        glow = pygame.Surface((80, 70), pygame.SRCALPHA)
+        pygame.draw.ellipse(glow, (140, 140, 255, 80), (0, 20, 80, 40))
+        self._glow = self._scaled(glow, smooth=True)
+        aura = pygame.Surface((100, 90), pygame.SRCALPHA)
+        pygame.draw.ellipse(aura, (80, 255, 160, 90), (0, 20, 100, 50))
+        self._aura = self._scaled(aura, smooth=True)
+        self._flash_overlay = pygame.Surface(self.render_size, pygame.SRCALPHA)
+        self._shade = pygame.Surface(self.render_size, pygame.SRCALPHA)
+        self._shade.fill((0, 0, 0, 180))
+        self._background = self._build_background()
+
+        self.sprites = SpriteCache()
+        self._blit_batch: list[BlitItem] = []
+
+        self.particles = ParticleSystem(seed=seed)
+        # (kind, x, y) effect triggers from step(), turned into particles once
+        # per frame so re-simulated ticks do not replay them.
+        self.events: list[tuple[str, float, float]] = []
+
     # ---------- starfield ----------
     def _create_starfield(self) -> list[list[float]]:
         stars: list[list[float]] = []
         for _ in range(120):
-            x = random.randint(0, WIDTH)
-            y = random.randint(0, HEIGHT)
-            speed = random.uniform(20, 80)
-            brightness = random.randint(150, 255)
+            x = self.fx_rng.randint(0, WIDTH)
+            y = self.fx_rng.randint(0, HEIGHT)
+            speed = self.fx_rng.uniform(20, 80)
+            brightness = self.fx_rng.randint(150, 255)
             stars.append([float(x), float(y), speed, float(brightness)])
         return stars
 
@@ -205,74 +329,172 @@ class CosmicCorridorGame:
         for star in self.starfield:
             star[1] += star[2] * dt
             if star[1] > HEIGHT:
-                star[0] = random.randint(0, WIDTH)
+                star[0] = self.fx_rng.randint(0, WIDTH)
                 star[1] = -10.0
-                star[2] = random.uniform(20, 80)
-                star[3] = float(random.randint(150, 255))
+                star[2] = self.fx_rng.uniform(20, 80)
+                star[3] = float(self.fx_rng.randint(150, 255))
 
     def _draw_starfield(self) -> None:
-        for x, y, _speed, bright in self.starfield:
+        count = int(len(self.starfield) * self.quality.tier.star_fraction)
+        scale = self.scale
+        size = (self._px(2), self._px(2))
+        for x, y, _speed, bright in self.starfield[:count]:
             color = (int(bright), int(bright), int(bright))
-            self.screen.fill(color, ((int(x), int(y)), (2, 2)))
+            self.screen.fill(color, ((int(x * scale), int(y * scale)), size))
+
+    # ---------- logical -> render pixels ----------
+    def _px(self, length: float) -> int:
+        return max(1, round(length * self.scale))
+
+    def _pt(self, x: float, y: float) -> tuple[int, int]:
+        return int(x * self.scale), int(y * self.scale)
+
+    def _rect(self, x: float, y: float, w: float, h: float) -> pygame.Rect:
+        return pygame.Rect(*self._pt(x, y), self._px(w), self._px(h))
+
+    def _scaled(self, surface: pygame.Surface, smooth: bool = False) -> pygame.Surface:
+        if self.scale == 1.0:
+            return surface
+        w, h = surface.get_size()
+        size = (self._px(w), self._px(h))
+        if smooth:
+            return pygame.transform.smoothscale(surface, size)
+        # Nearest-neighbour keeps colorkeyed edges free of blended fringes.
+        return pygame.transform.scale(surface, size)
 
     # ---------- drawing ----------
-    def _draw_background(self) -> None:
-        for y in range(HEIGHT):
-            t = y / HEIGHT
+    def _radius(self, radius: int) -> int:
+        return round(radius * self.scale) if self.quality.tier.rounded else 0
+
+    def _build_background(self) -> pygame.Surface:
+        width, height = self.render_size
+        background = pygame.Surface(self.render_size)
+        for y in range(height):
+            t = y / height
             color = lerp_color(BG_TOP, BG_BOTTOM, t)
-            pygame.draw.line(self.screen, color, (0, y), (WIDTH, y))
+            pygame.draw.line(background, color, (0, y), (width, y))
+        return background
+
+    def _draw_background(self) -> None:
+        self.screen.blit(self._background, (0, 0))
 
     def _draw_player(self) -> None:
-        glow = pygame.Surface((80, 70), pygame.SRCALPHA)
-        pygame.draw.ellipse(glow, (140, 140, 255, 80), (0, 20, 80, 40))
-        self.screen.blit(glow, (int(self.player.x - 40), int(self.player.y - 40)))
+        glow = self.quality.tier.glow
+        for i, player in enumerate(self.players):
+            color, outline = PLAYER_PALETTE[i % len(PLAYER_PALETTE)]
+            if glow:
+                self.screen.blit(self._glow, self._pt(player.x - 40, player.y - 40))
+
+            body = player.rect
+            rect = self._rect(*body)
+            border = self._px(4)
+            pygame.draw.rect(
+                self.screen,
+                outline,
+                rect.inflate(border, border),
+                border_radius=self._radius(8),
+            )
+            pygame.draw.rect(self.screen, color, rect, border_radius=self._radius(8))
 
+            nose = self._rect(body.centerx - 4, body.top - 8, 8, 10)
+            pygame.draw.rect(
+                self.screen, (250, 250, 255), nose, border_radius=self._radius(4)
+            )
+
+            if glow and player.has_powerup():
+                self.screen.blit(self._aura, self._pt(player.x - 50, player.y - 45))
+
+    # ---------- sprites ----------
+    def _build_box_sprite(
+        self,
+        w: int,
+        h: int,
+        color: tuple[int, int, int],
+        outline: tuple[int, int, int] | None,
+        radius: int,
+    ) -> pygame.Surface:
+        pad = 2 if outline is not None else 0
+        sprite = pygame.Surface((w + 2 * pad, h + 2 * pad))
+        sprite.fill(COLORKEY)
+        if outline is not None:
+            pygame.draw.rect(sprite, outline, sprite.get_rect(), border_radius=radius)
+        pygame.draw.rect(sprite, color, (pad, pad, w, h), border_radius=radius)
+        return self._scaled(sprite)
+
+    def _build_bullet_sprite(self, w: int, h: int, rounded: bool) -> pygame.Surface:
+        return self._build_box_sprite(w, h, BULLET_COLOR, None, 3 if rounded else 0)
+
+    def _build_enemy_sprite(self, w: int, h: int, rounded: bool) -> pygame.Surface:
+        sprite = pygame.Surface((w + 4, h + 4))
+        sprite.fill(COLORKEY)
+        radius = 6 if rounded else 0
+        pygame.draw.rect(sprite, ENEMY_OUTLINE, sprite.get_rect(), border_radius=radius)
+        pygame.draw.rect(sprite, ENEMY_COLOR, (2, 2, w, h), border_radius=radius)
+        cockpit = pygame.Rect(2 + w // 2 - 6, 2 + 4, 12, 8)
         pygame.draw.rect(
-            self.screen,
-            PLAYER_OUTLINE,
-            self.player.rect.inflate(4, 4),
-            border_radius=8,
+            sprite, (240, 220, 220), cockpit, border_radius=3 if rounded else 0
         )
-        pygame.draw.rect(self.screen, PLAYER_COLOR, self.player.rect, border_radius=8)
+        return self._scaled(sprite)
 
-        nose = pygame.Rect(self.player.rect.centerx - 4, self.player.rect.top - 8, 8, 10)
-        pygame.draw.rect(self.screen, (250, 250, 255), nose, border_radius=4)
-
-        if self.player.has_powerup():
-            aura = pygame.Surface((100, 90), pygame.SRCALPHA)
-            pygame.draw.ellipse(aura, (80, 255, 160, 90), (0, 20, 100, 50))
-            self.screen.blit(aura, (int(self.player.x - 50), int(self.player.y - 45)))
+    def _build_powerup_sprite(self, size: int, rounded: bool) -> pygame.Surface:
+        return self._build_box_sprite(
+            size, size, POWERUP_COLOR, (20, 80, 40), 6 if rounded else 0
+        )
 
     def _draw_bullets(self) -> None:
-        for bullet in self.bullets:
-            pygame.draw.rect(self.screen, BULLET_COLOR, bullet.rect, border_radius=3)
+        rounded = self.quality.tier.rounded
+        get = self.sprites.get
+        build = self._build_bullet_sprite
+        pt = self._pt
+        batch = self._blit_batch
+        batch.clear()
+        batch.extend(
+            (
+                get(("bullet", b.w, b.h, rounded), build, b.w, b.h, rounded),
+                pt(int(b.x - b.w / 2), int(b.y - b.h / 2)),
+            )
+            for b in self.bullets
+        )
+        blit_batch(self.screen, batch)
 
     def _draw_enemies(self) -> None:
-        for enemy in self.enemies:
-            pygame.draw.rect(
-                self.screen,
-                ENEMY_OUTLINE,
-                enemy.rect.inflate(4, 4),
-                border_radius=6,
+        rounded = self.quality.tier.rounded
+        get = self.sprites.get
+        build = self._build_enemy_sprite
+        pt = self._pt
+        batch = self._blit_batch
+        batch.clear()
+        batch.extend(
+            (
+                get(("enemy", e.w, e.h, rounded), build, e.w, e.h, rounded),
+                pt(int(e.x - e.w / 2) - 2, int(e.y - e.h / 2) - 2),
             )
-            pygame.draw.rect(self.screen, ENEMY_COLOR, enemy.rect, border_radius=6)
-            cockpit = pygame.Rect(enemy.rect.centerx - 6, enemy.rect.y + 4, 12, 8)
-            pygame.draw.rect(self.screen, (240, 220, 220), cockpit, border_radius=3)
+            for e in self.enemies
+        )
+        blit_batch(self.screen, batch)
 
     def _draw_powerups(self) -> None:
-        for powerup in self.powerups:
-            pygame.draw.rect(
-                self.screen,
-                (20, 80, 40),
-                powerup.rect.inflate(4, 4),
-                border_radius=6,
+        rounded = self.quality.tier.rounded
+        get = self.sprites.get
+        build = self._build_powerup_sprite
+        pt = self._pt
+        batch = self._blit_batch
+        batch.clear()
+        batch.extend(
+            (
+                get(("powerup", p.size, rounded), build, p.size, rounded),
+                pt(int(p.x - p.size / 2) - 2, int(p.y - p.size / 2) - 2),
             )
-            pygame.draw.rect(self.screen, POWERUP_COLOR, powerup.rect, border_radius=6)
+            for p in self.powerups
+        )
+        blit_batch(self.screen, batch)
 
     def _draw_ui(self) -> None:
-        bar = pygame.Rect(0, 0, WIDTH, 40)
+        bar = self._rect(0, 0, WIDTH, 40)
         pygame.draw.rect(self.screen, (10, 10, 25), bar)
-        pygame.draw.line(self.screen, (60, 60, 120), bar.bottomleft, bar.bottomright, 2)
+        pygame.draw.line(
+            self.screen, (60, 60, 120), bar.bottomleft, bar.bottomright, self._px(2)
+        )
 
         txt_score = self.font_medium.render(f"SCORE: {self.score}", True, TEXT_COLOR)
         txt_time = self.font_small.render(
@@ -282,45 +504,80 @@ class CosmicCorridorGame:
         )
         txt_lives = self.font_medium.render("❤" * self.lives, True, (255, 110, 140))
 
-        self.screen.blit(txt_score, (10, 6))
-        self.screen.blit(txt_time, (10, 22))
+        self.screen.blit(txt_score, self._pt(10, 6))
+        self.screen.blit(txt_time, self._pt(10, 22))
         self.screen.blit(
             txt_lives,
-            (WIDTH - txt_lives.get_width() - 16, 6),
+            (self.render_size[0] - txt_lives.get_width() - self._px(16), self._px(6)),
         )
 
-        if self.player.has_powerup():
-            width = 140
-            x = WIDTH // 2 - width // 2
+        # One power-up bar per player, side by side in a fixed slot each.
+        slots = len(self.players)
+        width, gap = (140, 0) if slots == 1 else (110, 16)
+        left = WIDTH // 2 - (slots * width + (slots - 1) * gap) // 2
+        for i, player in enumerate(self.players):
+            if not player.has_powerup():
+                continue
+            x = left + i * (width + gap)
             y = 8
-            ratio = max(0.0, min(1.0, self.player.powerup_timer / 6.0))
+            ratio = max(0.0, min(1.0, player.powerup_timer / 6.0))
             pygame.draw.rect(
                 self.screen,
                 (30, 60, 40),
-                (x, y, width, 8),
-                border_radius=4,
+                self._rect(x, y, width, 8),
+                border_radius=self._px(4),
             )
             pygame.draw.rect(
                 self.screen,
                 (120, 250, 180),
-                (x, y, int(width * ratio), 8),
-                border_radius=4,
+                self._rect(x, y, int(width * ratio), 8),
+                border_radius=self._px(4),
             )
-            label = self.font_small.render("POWER-UP", True, (210, 250, 225))
-            self.screen.blit(label, (WIDTH // 2 - label.get_width() // 2, 18))
+            text = "POWER-UP" if slots == 1 else f"P{i + 1} POWER-UP"
+            label = self.font_small.render(text, True, (210, 250, 225))
+            mid = self._pt(x + width / 2, 0)[0]
+            self.screen.blit(label, (mid - label.get_width() // 2, self._px(18)))
 
     def _draw_flash(self) -> None:
         if self.flash_timer <= 0:
             return
+        if not self.quality.tier.flash:
+            # Cheap fallback: a red frame instead of a full-screen alpha blend.
+            pygame.draw.rect(
+                self.screen, (255, 120, 120), self.screen.get_rect(), self._px(6)
+            )
+            return
         alpha = int(180 * (self.flash_timer / 0.25))
-        overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-        overlay.fill((255, 120, 120, alpha))
-        self.screen.blit(overlay, (0, 0))
+        self._flash_overlay.fill((255, 120, 120, alpha))
+        self.screen.blit(self._flash_overlay, (0, 0))
+
+    def _draw_profiler(self) -> None:
+        tier = self.quality.tier
+        lines = (
+            f"FPS {self.pacer.fps:5.1f}",
+            f"pacing jitter {self.pacer.jitter() * 1000:4.2f} ms,"
+            f" missed {self.pacer.missed}",
+            f"frame {self.quality.mean_frame_time * 1000:5.2f} ms"
+            f" / {self.quality.budget * 1000:.1f}",
+            f"quality {tier.name} ({self.quality.level})",
+            f"render {self.render_size[0]}x{self.render_size[1]}",
+            f"particles {len(self.particles)} / {self.particles.budget}",
+            self._latency_line(),
+        )
+        x, y = self._pt(10, 48)
+        for line in lines:
+            txt = self.font_small.render(line, True, (160, 255, 190))
+            self.screen.blit(txt, (x, y))
+            y += txt.get_height()
+
+    def _latency_line(self) -> str:
+        latency = self.keyboard.latency_ms()
+        if latency is None:
+            return "input->photon  -- ms"
+        return f"input->photon {latency[0]:5.1f} ms (max {latency[1]:.1f})"
 
     def _draw_game_over(self) -> None:
-        overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 180))
-        self.screen.blit(overlay, (0, 0))
+        self.screen.blit(self._shade, (0, 0))
 
         t1 = self.font_big.render("GAME OVER", True, (250, 230, 240))
         t2 = self.font_medium.render(f"Final Score: {self.score}", True, TEXT_COLOR)
@@ -330,14 +587,36 @@ class CosmicCorridorGame:
             TEXT_COLOR,
         )
 
-        self.screen.blit(t1, (WIDTH // 2 - t1.get_width() // 2, HEIGHT // 2 - 70))
-        self.screen.blit(t2, (WIDTH // 2 - t2.get_width() // 2, HEIGHT // 2 - 30))
-        self.screen.blit(t3, (WIDTH // 2 - t3.get_width() // 2, HEIGHT // 2 + 10))
+        center = self.render_size[0] // 2
+        for text, dy in ((t1, -70), (t2, -30), (t3, 10)):
+            y = int((HEIGHT // 2 + dy) * self.scale)
+            self.screen.blit(text, (center - text.get_width() // 2, y))
+
+    def _present(self) -> None:
+        if self.window is not None:
+            pygame.transform.scale(self.screen, self.window.get_size(), self.window)
+        pygame.display.flip()
 
     # ---------- logic ----------
+    @property
+    def player(self) -> Player:
+        return self.players[0]
+
+    @property
+    def can_restart(self) -> bool:
+        # A networked game cannot be reset by one peer alone.
+        return self.game_over and self.session is None
+
     def _reset(self) -> None:
-        self.player.x = WIDTH / 2
-        self.player.y = HEIGHT - 70
+        if self.game_over:
+            self.history.append((self.score, self.time_survived))
+        self.game_seed = self.rng.getrandbits(32)
+        self.rng.seed(self.game_seed)
+        for player, x in zip(self.players, _spawn_xs(len(self.players)), strict=True):
+            player.x = x
+            player.y = HEIGHT - 70
+            player.fire_timer = 0.0
+            player.powerup_timer = 0.0
         self.bullets.clear()
         self.enemies.clear()
         self.powerups.clear()
@@ -349,23 +628,57 @@ class CosmicCorridorGame:
         self.game_over = False
         self.flash_timer = 0.0
         self.tutorial_time = 5.0
-        self.player.powerup_timer = 0.0
+        self.particles.clear()
+        self.events.clear()
 
     def _spawn_enemy(self) -> None:
-        x = random.randint(60, WIDTH - 60)
-        width = random.randint(32, 46)
-        height = random.randint(24, 32)
-        base_speed = random.uniform(120, 170)
+        x = self.rng.randint(60, WIDTH - 60)
+        width = self.rng.randint(32, 46)
+        height = self.rng.randint(24, 32)
+        base_speed = self.rng.uniform(120, 170)
         extra_speed = self.time_survived * 1.8
         vy = base_speed + extra_speed
-        hp = 1 if random.random() < 0.75 else 2
+        hp = 1 if self.rng.random() < 0.75 else 2
         self.enemies.append(Enemy(x, -height, width, height, vy, hp))
 
     def _spawn_powerup(self) -> None:
-        x = random.randint(80, WIDTH - 80)
+        x = self.rng.randint(80, WIDTH - 80)
         self.powerups.append(PowerUp(x, -20))
 
     def _update_game(self, dt: float) -> None:
+        if self.session is not None:
+            # Keep exchanging inputs after game over: it may be a misprediction.
+            self.session.advance(self.input_source())
+        elif not self.game_over:
+            inputs = [self.input_source()]
+            inputs += [self.partner_source() for _ in self.players[1:]]
+            if self.recorder is not None:
+                self.recorder.record(self, dt, inputs)
+            self.step(dt, inputs)
+            if self.game_over and self.recorder is not None:
+                self.recorder.finish(self)
+        if not self.game_over:
+            self._update_starfield(dt)
+        self._update_effects(dt)
+
+    def _update_effects(self, dt: float) -> None:
+        particles = self.particles
+        particles.budget = int(particles.capacity * self.quality.tier.particle_fraction)
+        for kind, x, y in self.events:
+            if kind == "hit":
+                particles.emit(x, y, 12, SPARK, 180.0, 0.35, math.pi, math.pi / 2)
+            elif kind == "kill":
+                particles.emit(x, y, 60, DEBRIS, 220.0, 0.8)
+                particles.emit(x, y, 20, SPARK, 300.0, 0.4)
+            elif kind == "pickup":
+                particles.emit(x, y, 80, POWERUP, 200.0, 0.7)
+            elif kind == "hurt":
+                particles.emit(x, y, 50, HURT, 260.0, 0.6)
+        self.events.clear()
+        particles.update(dt)
+
+    def step(self, dt: float, inputs: Sequence[Sequence[bool]]) -> None:
+        """Advance the simulation by ``dt``; deterministic given state and inputs."""
         if self.game_over:
             return
 
@@ -373,10 +686,9 @@ class CosmicCorridorGame:
         if self.tutorial_time > 0:
             self.tutorial_time -= dt
 
-        keys = pygame.key.get_pressed()
-        self.player.update(dt, keys)
-
-        self._update_starfield(dt)
+        start_xs = [player.x for player in self.players]
+        for player, keys in zip(self.players, inputs, strict=True):
+            player.update(dt, keys)
 
         self.enemy_timer += dt
         self.powerup_timer_spawn += dt
@@ -390,14 +702,15 @@ class CosmicCorridorGame:
             self.powerup_timer_spawn = 0.0
             self._spawn_powerup()
 
-        if keys[pygame.K_SPACE] and self.player.can_fire():
-            self.player.reset_fire()
-            if self.player.has_powerup():
-                offset = 12
-                self.bullets.append(Bullet(self.player.x - offset, self.player.y - 10))
-                self.bullets.append(Bullet(self.player.x + offset, self.player.y - 10))
-            else:
-                self.bullets.append(Bullet(self.player.x, self.player.y - 10))
+        for player, keys in zip(self.players, inputs, strict=True):
+            if keys[pygame.K_SPACE] and player.can_fire():
+                player.reset_fire()
+                if player.has_powerup():
+                    offset = 12
+                    self.bullets.append(Bullet(player.x - offset, player.y - 10))
+                    self.bullets.append(Bullet(player.x + offset, player.y - 10))
+                else:
+                    self.bullets.append(Bullet(player.x, player.y - 10))
 
         for bullet in self.bullets:
             bullet.update(dt)
@@ -406,33 +719,69 @@ class CosmicCorridorGame:
         for powerup in self.powerups:
             powerup.update(dt)
 
-        self.bullets = [b for b in self.bullets if b.y + b.h > -20]
-        self.enemies = [e for e in self.enemies if not e.is_offscreen()]
-        self.powerups = [p for p in self.powerups if p.y - p.size < HEIGHT + 20]
-
-        # bullet vs enemy
+        # Collisions are swept over the whole step, so fast enemies and coarse
+        # headless ticks cannot tunnel through each other, and precise: rounded
+        # corners are tested pixel by pixel once the boxes meet. Culling comes
+        # last.
+        player_sweeps = [
+            (player, player.rect, (player.x - start_x, 0.0), player.mask)
+            for player, start_x in zip(self.players, start_xs, strict=True)
+        ]
+        enemy_sweeps = [(e, e.rect, (0.0, e.vy * dt), e.mask) for e in self.enemies]
+
+        # bullet vs enemy: each bullet hits the enemy it reaches first
         remaining_bullets: list[Bullet] = []
         for bullet in self.bullets:
-            hit_any = False
-            for enemy in self.enemies:
-                if enemy.rect.colliderect(bullet.rect):
-                    enemy.take_damage(1)
-                    self.score += 10
-                    hit_any = True
-                    break
-            if not hit_any:
+            bullet_rect = bullet.rect
+            bullet_delta = (0.0, bullet.vy * dt)
+            bullet_mask = bullet.mask
+            target: Enemy | None = None
+            first_hit = 2.0
+            for enemy, enemy_rect, enemy_delta, enemy_mask in enemy_sweeps:
+                if enemy.is_dead():
+                    continue
+                toi = sweep_masks(
+                    bullet_rect,
+                    bullet_delta,
+                    bullet_mask,
+                    enemy_rect,
+                    enemy_delta,
+                    enemy_mask,
+                )
+                if toi is not None and toi < first_hit:
+                    target = enemy
+                    first_hit = toi
+            if target is not None:
+                target.take_damage(1)
+                self.score += 10
+                self.events.append(("hit", bullet.x, bullet.y))
+                if target.is_dead():
+                    self.events.append(("kill", target.x, target.y))
+            else:
                 remaining_bullets.append(bullet)
         self.bullets = remaining_bullets
-        self.enemies = [e for e in self.enemies if not e.is_dead()]
 
-        # player vs enemy
+        # player vs enemy: lives are shared, an enemy hits at most one player
         remaining_enemies: list[Enemy] = []
-        for enemy in self.enemies:
-            if self.player.rect.colliderect(enemy.rect):
-                self.lives -= 1
-                self.flash_timer = 0.25
-                if self.lives <= 0:
-                    self.game_over = True
+        for enemy, enemy_rect, enemy_delta, enemy_mask in enemy_sweeps:
+            if enemy.is_dead():
+                continue
+            for player, player_rect, player_delta, player_mask in player_sweeps:
+                toi = sweep_masks(
+                    player_rect,
+                    player_delta,
+                    player_mask,
+                    enemy_rect,
+                    enemy_delta,
+                    enemy_mask,
+                )
+                if toi is not None:
+                    self.events.append(("hurt", player.x, player.y))
+                    self.lives -= 1
+                    self.flash_timer = 0.25
+                    if self.lives <= 0:
+                        self.game_over = True
+                    break
             else:
                 remaining_enemies.append(enemy)
         self.enemies = remaining_enemies
@@ -440,46 +789,158 @@ class CosmicCorridorGame:
         # player vs powerup
         remaining_powerups: list[PowerUp] = []
         for powerup in self.powerups:
-            if self.player.rect.colliderect(powerup.rect):
-                self.player.powerup_timer = 6.0
+            powerup_rect = powerup.rect
+            powerup_delta = (0.0, powerup.vy * dt)
+            powerup_mask = powerup.mask
+            for player, player_rect, player_delta, player_mask in player_sweeps:
+                toi = sweep_masks(
+                    player_rect,
+                    player_delta,
+                    player_mask,
+                    powerup_rect,
+                    powerup_delta,
+                    powerup_mask,
+                )
+                if toi is not None:
+                    player.powerup_timer = 6.0
+                    self.events.append(("pickup", powerup.x, powerup.y))
+                    break
             else:
                 remaining_powerups.append(powerup)
         self.powerups = remaining_powerups
 
+        self.bullets = [b for b in self.bullets if b.y + b.h > -20]
+        self.enemies = [e for e in self.enemies if not e.is_offscreen()]
+        self.powerups = [p for p in self.powerups if p.y - p.size < HEIGHT + 20]
+
         self.score += int(dt * 4)
 
         if self.flash_timer > 0:
             self.flash_timer -= dt
 
+    # ---------- state ----------
+    def snapshot(self) -> GameState:
+        """Capture the fields :meth:`step` changes as immutable tuples."""
+        return (
+            tuple((p.x, p.fire_timer, p.powerup_timer) for p in self.players),
+            tuple((b.x, b.y) for b in self.bullets),
+            tuple((e.x, e.y, e.w, e.h, e.vy, e.hp) for e in self.enemies),
+            tuple((p.x, p.y) for p in self.powerups),
+            (
+                self.enemy_timer,
+                self.powerup_timer_spawn,
+                self.time_survived,
+                self.score,
+                self.lives,
+                self.game_over,
+                self.flash_timer,
+                self.tutorial_time,
+            ),
+            self.rng.getstate(),
+        )
+
+    def restore(self, state: GameState) -> None:
+        """Rewind the simulation to a :meth:`snapshot`."""
+        players, bullets, enemies, powerups, scalars, rng_state = state
+        for player, (x, fire_timer, powerup_timer) in zip(
+            self.players, players, strict=True
+        ):
+            player.x = x
+            player.fire_timer = fire_timer
+            player.powerup_timer = powerup_timer
+        self.bullets = [Bullet(x, y) for x, y in bullets]
+        self.enemies = [Enemy(*enemy) for enemy in enemies]
+        self.powerups = [PowerUp(x, y) for x, y in powerups]
+        (
+            self.enemy_timer,
+            self.powerup_timer_spawn,
+            self.time_survived,
+            self.score,
+            self.lives,
+            self.game_over,
+            self.flash_timer,
+            self.tutorial_time,
+        ) = scalars
+        self.rng.setstate(rng_state)
+
+    def _render(self) -> None:
+        self._draw_background()
+        self._draw_starfield()
+        self._draw_bullets()
+        self._draw_enemies()
+        self._draw_powerups()
+        self.particles.draw(self.screen, self.scale)
+        self._draw_player()
+        self._draw_ui()
+        self._draw_flash()
+
+        if self.game_over:
+            self._draw_game_over()
+
+        if self.show_profiler:
+            self._draw_profiler()
+
     # ---------- public API ----------
-    def run(self) -> None:
+    def run(self, max_frames: int | None = None) -> None:
         """Start the main game loop."""
+        frames = 0
         while self.running:
-            dt = self.clock.tick(FPS) / 1000.0
+            if max_frames is not None and frames >= max_frames:
+                break
+            frames += 1
+            dt = self.pacer.tick()
+            self._handle_events()
 
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.running = False
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
-                        self.running = False
-                    if self.game_over and event.key == pygame.K_RETURN:
-                        self._reset()
+            if self.can_restart and self.auto_restart:
+                self._reset()
 
+            frame_start = time.perf_counter()
             self._update_game(dt)
+            self._render()
+            self._present()
+            self.keyboard.presented()
+            self.quality.record(time.perf_counter() - frame_start)
 
-            self._draw_background()
-            self._draw_starfield()
-            self._draw_bullets()
-            self._draw_enemies()
-            self._draw_powerups()
-            self._draw_player()
-            self._draw_ui()
-            self._draw_flash()
-
-            if self.game_over:
-                self._draw_game_over()
-
-            pygame.display.flip()
+            if self.capture is not None:
+                self.capture.capture(self.screen)
+            for hook in self.frame_hooks:
+                hook(self)
 
         pygame.quit()
+
+    def _handle_events(self) -> None:
+        for event in pygame.event.get():
+            self.keyboard.handle(event)
+            if event.type == pygame.QUIT:
+                self.running = False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    self.running = False
+                if event.key == pygame.K_F3:
+                    self.show_profiler = not self.show_profiler
+                if self.can_restart and event.key == pygame.K_RETURN:
+                    self._reset()
+
+    def run_headless(
+        self,
+        frames: int,
+        dt: float = 1.0 / FPS,
+        render: bool = True,
+        pacer: FramePacer | None = None,
+    ) -> None:
+        """Simulate (and render) ``frames`` frames of ``dt``, paced if given a pacer."""
+        for _ in range(frames):
+            if not self.running:
+                break
+            if pacer is not None:
+                pacer.tick()
+            pygame.event.pump()
+            if self.can_restart and self.auto_restart:
+                self._reset()
+            self._update_game(dt)
+            if render:
+                self._render()
+            if self.capture is not None:
+                self.capture.capture(self.screen)
+            for hook in self.frame_hooks:
+                hook(self)
@@ -0,0 +1,357 @@
+from __future__ import annotations
+
+import gc
+import math
+import os
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections.abc import Callable, Iterable
+
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5
+)  # fmt: skip
+SIZE_BUCKETS = (
+    128, 512, 1024, 4096, 16384, 65536, 262144, 1048576
+)  # fmt: skip
+TICK_BUCKETS = (0.001, 0.002, 0.004, 0.008, 0.016, 0.033, 0.066)
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _label_str(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values, strict=True)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _NeedsLabels:
+    """Stands in for the default series of a labelled metric."""
+
+    __slots__ = ("name",)
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __getattr__(self, attr: str):
+        raise ValueError(f"{self.name} is a labelled metric: use .labels(...)")
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        if self.labelnames:
+            self._default = _NeedsLabels(name)
+        else:
+            self._default = self._new_child()
+            self._children[()] = self._default
+
+    @abstractmethod
+    def _new_child(self) -> object: ...
+
+    def labels(self, *values: str):
+        """Return the child series for these label values, creating it once."""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    @abstractmethod
+    def _samples(self) -> Iterable[str]: ...
+
+    def render(self) -> str:
+        return (
+            f"# HELP {self.name} {self.documentation}\n"
+            f"# TYPE {self.name} {self.kind}\n" + "".join(self._samples())
+        )
+
+
+class _Value:
+    __slots__ = ("_lock", "value", "function")
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.value = 0.0
+        self.function: Callable[[], float] | None = None
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Compute the value at scrape time instead of storing it."""
+        self.function = function
+
+    def get(self) -> float:
+        return self.function() if self.function is not None else self.value
+
+
+class Counter(_Metric):
+    """Monotonic counter; ``inc`` takes one uncontended lock."""
+
+    kind = "counter"
+
+    def _new_child(self) -> _Value:
+        return _Value()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default.inc(amount)
+
+    def _samples(self) -> Iterable[str]:
+        for values, child in list(self._children.items()):
+            labels = _label_str(self.labelnames, values)
+            yield f"{self.name}_total{labels} {_format_value(child.get())}\n"
+
+
+class Gauge(Counter):
+    """Value that can go up and down, or be computed at scrape time."""
+
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._default.dec(amount)
+
+    def set(self, value: float) -> None:
+        self._default.set(value)
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        self._default.set_function(function)
+
+    def _samples(self) -> Iterable[str]:
+        for values, child in list(self._children.items()):
+            labels = _label_str(self.labelnames, values)
+            yield f"{self.name}{labels} {_format_value(child.get())}\n"
+
+
+class _HistogramValue:
+    __slots__ = ("_lock", "bounds", "counts", "total", "count")
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        self._lock = threading.Lock()
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.total += value
+            self.count += 1
+
+
+class Histogram(_Metric):
+    """Fixed-bucket histogram; ``observe`` is a bisect plus one short lock."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = LATENCY_BUCKETS,
+    ) -> None:
+        self.bounds = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self) -> _HistogramValue:
+        return _HistogramValue(self.bounds)
+
+    def observe(self, value: float) -> None:
+        self._default.observe(value)
+
+    def _samples(self) -> Iterable[str]:
+        for values, child in list(self._children.items()):
+            with child._lock:
+                counts = list(child.counts)
+                total = child.total
+                count = child.count
+            cumulative = 0
+            for bound, bucket in zip((*self.bounds, math.inf), counts, strict=True):
+                cumulative += bucket
+                le = f'le="{_format_value(bound)}"'
+                labels = _label_str(self.labelnames, values, le)
+                yield f"{self.name}_bucket{labels} {cumulative}\n"
+            labels = _label_str(self.labelnames, values)
+            yield f"{self.name}_sum{labels} {_format_value(total)}\n"
+            yield f"{self.name}_count{labels} {count}\n"
+
+
+class Registry:
+    """Named metrics plus a cached text exposition."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+        self._cache = ""
+        self._cache_time = -math.inf
+
+    def _get_or_create(self, cls: type, name: str, *args, **kwargs):
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(name)
+                if metric is None:
+                    metric = cls(name, *args, **kwargs)
+                    self._metrics[name] = metric
+        if type(metric) is not cls:
+            raise ValueError(f"metric {name} already registered as {metric.kind}")
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames=()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames=()) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(
+        self, name: str, documentation: str, labelnames=(), buckets=LATENCY_BUCKETS
+    ) -> Histogram:
+        return self._get_or_create(
+            Histogram, name, documentation, labelnames, buckets=buckets
+        )
+
+    def render(self, max_age: float = 0.0) -> str:
+        """Prometheus text format; reuses the last output if younger than max_age."""
+        now = time.monotonic()
+        if now - self._cache_time < max_age:
+            return self._cache
+        text = "".join(metric.render() for metric in list(self._metrics.values()))
+        self._cache = text
+        self._cache_time = now
+        return text
+
+
+REGISTRY = Registry()
+
+# Game-server metrics; fed by whichever server hosts game sessions.
+GAME_TICK_SECONDS = REGISTRY.histogram(
+    "game_tick_duration_seconds",
+    "Wall time of one server-side game tick.",
+    buckets=TICK_BUCKETS,
+)
+GAME_ROOMS = REGISTRY.gauge("game_rooms", "Game rooms or sessions currently open.")
+
+
+# ---------- process metrics ----------
+def rss_bytes() -> float:
+    """Current resident set size of this process."""
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return float(int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE"))
+    except (OSError, ValueError, AttributeError):
+        import resource  # no /proc: fall back to peak RSS
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return float(peak if sys.platform == "darwin" else peak * 1024)
+
+
+PROCESS_RSS = REGISTRY.gauge("process_resident_memory_bytes", "Resident set size.")
+PROCESS_RSS.set_function(rss_bytes)
+GC_PAUSE_SECONDS = REGISTRY.histogram(
+    "python_gc_pause_seconds",
+    "Duration of garbage collector runs.",
+    ("generation",),
+)
+
+_gc_started: dict[int, float] = {}
+
+
+def _gc_callback(phase: str, info: dict[str, int]) -> None:
+    generation = info["generation"]
+    if phase == "start":
+        _gc_started[generation] = time.perf_counter()
+        return
+    started = _gc_started.pop(generation, None)
+    if started is not None:
+        GC_PAUSE_SECONDS.labels(str(generation)).observe(time.perf_counter() - started)
+
+
+def install_gc_metrics() -> None:
+    """Start timing garbage collector pauses (idempotent)."""
+    if _gc_callback not in gc.callbacks:
+        gc.callbacks.append(_gc_callback)
+
+
+# ---------- Flask integration ----------
+def instrument_app(app, registry: Registry = REGISTRY, path: str = "/metrics") -> None:
+    """Record per-route latency, response size and in-flight requests on ``app``.
+
+    Everything in ``registry`` is exposed at ``path``; the exposition text is
+    reused for up to a second so high-rate scrapes stay cheap.
+    """
+    from flask import Response, g, request
+
+    install_gc_metrics()
+    latency = registry.histogram(
+        "http_request_duration_seconds",
+        "Request latency by route.",
+        ("method", "route", "status"),
+    )
+    sizes = registry.histogram(
+        "http_response_size_bytes",
+        "Response body size by route.",
+        ("route",),
+        buckets=SIZE_BUCKETS,
+    )
+    in_flight = registry.gauge("http_requests_in_flight", "Requests being served.")
+
+    @app.before_request
+    def _metrics_start() -> None:
+        g._metrics_start = time.perf_counter()
+        in_flight.inc()
+
+    @app.after_request
+    def _metrics_observe(response):
+        start = g.pop("_metrics_start", None)
+        if start is not None:
+            route = request.url_rule.rule if request.url_rule else "<unmatched>"
+            latency.labels(request.method, route, str(response.status_code)).observe(
+                time.perf_counter() - start
+            )
+            if response.content_length is not None:
+                sizes.labels(route).observe(response.content_length)
+        return response
+
+    @app.teardown_request
+    def _metrics_done(_exc: BaseException | None) -> None:
+        in_flight.dec()
+
+    def metrics() -> Response:
+        return Response(
+            registry.render(max_age=1.0),
+            mimetype="text/plain; version=0.0.4; charset=utf-8",
+        )
+
+    app.add_url_rule(path, "metrics", metrics, methods=["GET"])
@@ -0,0 +1,273 @@
+from __future__ import annotations
+
+import heapq
+import random
+import socket
+import struct
+import time
+import zlib
+from collections.abc import Callable, Sequence
+
+from .controls import KeyState
+from .game import FPS, CosmicCorridorGame, GameState
+
+# ack (last remote tick received contiguously), first tick, count; then one
+# input mask byte per tick.
+HEADER = struct.Struct("!iiB")
+MAX_INPUTS_PER_PACKET = 255
+
+
+def encode_inputs(ack: int, first: int, masks: bytes) -> bytes:
+    return HEADER.pack(ack, first, len(masks)) + masks
+
+
+def decode_inputs(payload: bytes) -> tuple[int, int, bytes]:
+    ack, first, count = HEADER.unpack_from(payload)
+    masks = payload[HEADER.size : HEADER.size + count]
+    if len(masks) != count:
+        raise ValueError("truncated input packet")
+    return ack, first, masks
+
+
+def state_checksum(state: GameState) -> int:
+    """CRC of a snapshot, for comparing peers' simulations."""
+    return zlib.crc32(repr(state).encode())
+
+
+# ---------- transports ----------
+class LoopbackEndpoint:
+    """One side of a :class:`LoopbackNetwork`."""
+
+    def __init__(self, network: LoopbackNetwork) -> None:
+        self.network = network
+        self.peer: LoopbackEndpoint | None = None
+        self._inbox: list[tuple[float, int, bytes]] = []
+
+    def send(self, payload: bytes) -> None:
+        assert self.peer is not None
+        self.network._deliver(self.peer, payload)
+
+    def receive(self) -> list[bytes]:
+        now = self.network.clock()
+        inbox = self._inbox
+        ready: list[bytes] = []
+        while inbox and inbox[0][0] <= now:
+            ready.append(heapq.heappop(inbox)[2])
+        return ready
+
+
+class LoopbackNetwork:
+    """In-process datagram link with simulated latency, jitter and loss.
+
+    Each packet is delayed by ``latency`` ± ``jitter`` seconds (so packets can
+    arrive out of order) and dropped with probability ``loss``. ``clock``
+    defaults to the wall clock; tests pass a virtual one.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.05,
+        jitter: float = 0.0,
+        loss: float = 0.0,
+        seed: int | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.loss = loss
+        self.clock = clock
+        self.rng = random.Random(seed)
+        self.sent = 0
+        self.dropped = 0
+        self.a = LoopbackEndpoint(self)
+        self.b = LoopbackEndpoint(self)
+        self.a.peer = self.b
+        self.b.peer = self.a
+
+    def _deliver(self, to: LoopbackEndpoint, payload: bytes) -> None:
+        self.sent += 1
+        if self.loss and self.rng.random() < self.loss:
+            self.dropped += 1
+            return
+        delay = self.latency + self.rng.uniform(-self.jitter, self.jitter)
+        deliver_at = self.clock() + max(0.0, delay)
+        heapq.heappush(to._inbox, (deliver_at, self.sent, payload))
+
+
+class UdpTransport:
+    """Non-blocking UDP socket talking to a single peer."""
+
+    def __init__(self, bind: tuple[str, int], peer: tuple[str, int]) -> None:
+        self.peer = peer
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(bind)
+        self.sock.setblocking(False)
+
+    def send(self, payload: bytes) -> None:
+        try:
+            self.sock.sendto(payload, self.peer)
+        except OSError:
+            pass  # peer not up yet; inputs are resent until acknowledged
+
+    def receive(self) -> list[bytes]:
+        packets: list[bytes] = []
+        while True:
+            try:
+                payload, addr = self.sock.recvfrom(2048)
+            except (BlockingIOError, ConnectionError):
+                return packets
+            if addr == self.peer:
+                packets.append(payload)
+
+    def close(self) -> None:
+        self.sock.close()
+
+
+# ---------- rollback ----------
+class RollbackSession:
+    """Two-player rollback netcode over any ``send``/``receive`` transport.
+
+    Every tick the session stores a snapshot of the game in a ring buffer,
+    steps the simulation with the local input and a prediction of the remote
+    one (the last confirmed remote input, repeated), and sends all local
+    inputs the peer has not acknowledged yet, so lost packets heal
+    themselves. When a confirmed remote input differs from what was
+    predicted, the game is restored to the snapshot before that tick and
+    re-simulated up to the present, all within the same frame.
+
+    The session never runs more than ``max_rollback`` ticks ahead of the last
+    confirmed remote input; beyond that :meth:`advance` stalls (returns
+    ``False``) until the peer catches up, which bounds rollback cost and the
+    ring size. Checksums of fully confirmed states every ``checksum_every``
+    ticks are kept in :attr:`checksums` for desync detection.
+    """
+
+    def __init__(
+        self,
+        game: CosmicCorridorGame,
+        local_index: int,
+        transport,
+        max_rollback: int = 8,
+        dt: float = 1.0 / FPS,
+        checksum_every: int = FPS,
+    ) -> None:
+        if len(game.players) != 2:
+            raise ValueError("rollback sessions need a two-player game")
+        self.game = game
+        self.local = local_index
+        self.remote = 1 - local_index
+        self.transport = transport
+        self.max_rollback = max_rollback
+        self.dt = dt
+        self.checksum_every = checksum_every
+
+        self.tick = 0
+        self._ring: list[tuple[int, GameState] | None] = [None] * (max_rollback + 1)
+        self._local_inputs: dict[int, int] = {}
+        self._remote_inputs: dict[int, int] = {}
+        self._predicted: dict[int, int] = {}
+        self.remote_confirmed = -1  # all remote inputs up to here are known
+        self.peer_ack = -1  # all local inputs up to here reached the peer
+        self._checked = 0
+        self.checksums: dict[int, int] = {}
+
+        self.rollbacks = 0
+        self.resimulated = 0
+        self.max_depth = 0
+        self.stalls = 0
+
+    def advance(self, keys: Sequence[bool]) -> bool:
+        """Poll the network and simulate one tick; ``False`` if stalled."""
+        self._poll()
+        if self.tick - self.remote_confirmed > self.max_rollback:
+            self.stalls += 1
+            self._send()
+            return False
+        self._local_inputs[self.tick] = KeyState.from_pressed(keys).mask
+        self._ring[self.tick % len(self._ring)] = (self.tick, self.game.snapshot())
+        self._simulate(self.tick)
+        self.tick += 1
+        self._send()
+        self._record_checksum()
+        return True
+
+    def _remote_input(self, tick: int) -> int:
+        mask = self._remote_inputs.get(tick)
+        if mask is None:
+            mask = self._remote_inputs.get(self.remote_confirmed, 0)
+            self._predicted[tick] = mask
+        return mask
+
+    def _simulate(self, tick: int) -> None:
+        inputs = [KeyState(), KeyState()]
+        inputs[self.local] = KeyState(self._local_inputs[tick])
+        inputs[self.remote] = KeyState(self._remote_input(tick))
+        self.game.step(self.dt, inputs)
+
+    def _poll(self) -> None:
+        rollback_to: int | None = None
+        for payload in self.transport.receive():
+            try:
+                ack, first, masks = decode_inputs(payload)
+            except (ValueError, struct.error):
+                continue
+            self.peer_ack = max(self.peer_ack, ack)
+            for offset, mask in enumerate(masks):
+                tick = first + offset
+                if tick <= self.remote_confirmed or tick in self._remote_inputs:
+                    continue
+                self._remote_inputs[tick] = mask
+                predicted = self._predicted.pop(tick, None)
+                if predicted is not None and predicted != mask:
+                    if rollback_to is None or tick < rollback_to:
+                        rollback_to = tick
+
+        while self.remote_confirmed + 1 in self._remote_inputs:
+            self.remote_confirmed += 1
+        if rollback_to is not None:
+            self._rollback(rollback_to)
+
+        # Keep the newest confirmed input: it is the prediction for the rest.
+        for tick in [t for t in self._remote_inputs if t < self.remote_confirmed]:
+            del self._remote_inputs[tick]
+        # Local inputs are needed until acknowledged and out of the ring.
+        oldest = min(self.peer_ack + 1, self.tick - len(self._ring))
+        for tick in [t for t in self._local_inputs if t < oldest]:
+            del self._local_inputs[tick]
+
+    def _rollback(self, tick: int) -> None:
+        ring = self._ring
+        saved_tick, state = ring[tick % len(ring)]  # type: ignore[misc]
+        if saved_tick != tick:
+            raise RuntimeError(f"tick {tick} is no longer in the rollback buffer")
+        # Effects from the first run of these ticks have already been shown.
+        events = len(self.game.events)
+        self.game.restore(state)
+        for t in range(tick, self.tick):
+            if t > tick:
+                ring[t % len(ring)] = (t, self.game.snapshot())
+            self._simulate(t)
+        del self.game.events[events:]
+        depth = self.tick - tick
+        self.rollbacks += 1
+        self.resimulated += depth
+        self.max_depth = max(self.max_depth, depth)
+
+    def _send(self) -> None:
+        first = self.peer_ack + 1
+        last = min(self.tick, first + MAX_INPUTS_PER_PACKET)
+        masks = bytes(self._local_inputs[t] for t in range(first, last))
+        self.transport.send(encode_inputs(self.remote_confirmed, first, masks))
+
+    def _record_checksum(self) -> None:
+        # The state at the start of tick t is final once every remote input
+        # before t is confirmed.
+        final = min(self.remote_confirmed + 1, self.tick - 1)
+        for t in range(self._checked + 1, final + 1):
+            if t % self.checksum_every == 0:
+                saved = self._ring[t % len(self._ring)]
+                if saved is not None and saved[0] == t:
+                    self.checksums[t] = state_checksum(saved[1])
+        self._checked = max(self._checked, final)
+        while len(self.checksums) > 64:
+            del self.checksums[next(iter(self.checksums))]
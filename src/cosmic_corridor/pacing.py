@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import math
+import time
+from collections import deque
+from collections.abc import Callable
+
+
+class FramePacer:
+    """Fixed-rate frame pacing with a coarse sleep and a short spin.
+
+    :meth:`tick` waits for the next frame deadline: it sleeps until about
+    ``spin`` seconds before it (calling ``idle`` between short sleeps, e.g.
+    to drain input) and busy-waits the rest, so frames start within
+    microseconds of the deadline instead of at the OS timer's granularity.
+    Deadlines advance by exactly one interval, keeping the cadence even; a
+    frame that arrives after its deadline counts as missed, and after more
+    than a whole interval late the schedule restarts from now rather than
+    rushing to catch up.
+
+    ``fps=None`` (or ``0``) is uncapped: no waiting, statistics only.
+    """
+
+    def __init__(
+        self,
+        fps: float | None = 60.0,
+        spin: float = 0.002,
+        window: int = 120,
+        clock: Callable[[], float] = time.perf_counter,
+        sleep: Callable[[float], None] = time.sleep,
+        idle: Callable[[], None] | None = None,
+    ) -> None:
+        self.interval = 1.0 / fps if fps else 0.0
+        self.spin = spin
+        self.clock = clock
+        self.sleep = sleep
+        self.idle = idle
+        self.intervals: deque[float] = deque(maxlen=window)
+        self.frames = 0
+        self.missed = 0
+        self._last: float | None = None
+        self._deadline = 0.0
+
+    @property
+    def uncapped(self) -> bool:
+        return self.interval == 0.0
+
+    def tick(self) -> float:
+        """Wait for the next frame; returns seconds since the previous one."""
+        clock = self.clock
+        if self._last is None:
+            self._last = clock()
+            self._deadline = self._last + self.interval
+            return self.interval
+
+        if not self.uncapped:
+            deadline = self._deadline
+            if clock() > deadline:
+                self.missed += 1
+            else:
+                self._wait(deadline)
+            now = clock()
+            if now - deadline > self.interval:
+                self._deadline = now + self.interval
+            else:
+                self._deadline = deadline + self.interval
+        else:
+            now = clock()
+
+        dt = now - self._last
+        self._last = now
+        self.frames += 1
+        self.intervals.append(dt)
+        return dt
+
+    def _wait(self, deadline: float) -> None:
+        clock = self.clock
+        remaining = deadline - clock()
+        while remaining > self.spin:
+            if self.idle is not None:
+                self.idle()
+                # Short naps so idle work keeps running while we wait.
+                self.sleep(min(remaining - self.spin, 0.001))
+            else:
+                self.sleep(remaining - self.spin)
+            remaining = deadline - clock()
+        while clock() < deadline:
+            pass
+
+    # ---------- statistics ----------
+    @property
+    def fps(self) -> float:
+        if not self.intervals:
+            return 0.0
+        mean = sum(self.intervals) / len(self.intervals)
+        return 1.0 / mean if mean > 0 else 0.0
+
+    def jitter(self) -> float:
+        """Standard deviation of recent frame intervals, in seconds."""
+        n = len(self.intervals)
+        if n < 2:
+            return 0.0
+        mean = sum(self.intervals) / n
+        return math.sqrt(sum((x - mean) ** 2 for x in self.intervals) / (n - 1))
+
+    def stats(self) -> dict[str, float]:
+        ordered = sorted(self.intervals)
+        worst = (
+            ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] if ordered else 0
+        )
+        return {
+            "frames": self.frames,
+            "fps": round(self.fps, 2),
+            "jitter_ms": round(self.jitter() * 1000, 3),
+            "p99_interval_ms": round(worst * 1000, 3),
+            "missed": self.missed,
+        }
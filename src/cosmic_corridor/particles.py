@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import math
+
+import numpy as np
+import pygame
+
+# Particle colors are stored as indices into this palette.
+PALETTE = np.array(
+    [
+        (255, 230, 160),  # spark
+        (240, 90, 120),  # enemy debris
+        (120, 250, 180),  # power-up
+        (255, 120, 120),  # player hit
+    ],
+    dtype=np.float32,
+)
+SPARK, DEBRIS, POWERUP, HURT = range(len(PALETTE))
+
+
+class ParticleSystem:
+    """Fixed-capacity particle pool stored as NumPy arrays.
+
+    Positions, velocities and lifetimes live in preallocated ``float32``
+    arrays. New particles are written at a ring cursor, overwriting the
+    oldest slots once the pool is full, so nothing is allocated per particle.
+    :meth:`update` and :meth:`draw` are vectorized over the slots in use;
+    drawing writes straight into the target's pixels, lightening what is
+    already there.
+
+    ``budget`` caps how many particles may be alive; the game ties it to the
+    current quality tier, so the governor sheds particles when frames run
+    over budget. Bursts that would exceed it are cut short.
+    """
+
+    def __init__(
+        self, capacity: int = 32768, gravity: float = 240.0, seed: int | None = None
+    ) -> None:
+        self.capacity = capacity
+        self.gravity = gravity
+        self.budget = capacity
+        self.rng = np.random.default_rng(seed)
+        self.x = np.zeros(capacity, np.float32)
+        self.y = np.zeros(capacity, np.float32)
+        self.vx = np.zeros(capacity, np.float32)
+        self.vy = np.zeros(capacity, np.float32)
+        self.life = np.zeros(capacity, np.float32)
+        self.max_life = np.ones(capacity, np.float32)
+        self.color = np.zeros(capacity, np.uint8)
+        self.live = 0
+        self._head = 0
+        self._used = 0  # slots ever written; all of them once the ring wraps
+
+    def __len__(self) -> int:
+        return self.live
+
+    def clear(self) -> None:
+        self.life[:] = 0.0
+        self.live = 0
+
+    def emit(
+        self,
+        x: float,
+        y: float,
+        count: int,
+        color: int,
+        speed: float = 160.0,
+        life: float = 0.6,
+        spread: float = math.tau,
+        direction: float = -math.pi / 2,
+    ) -> int:
+        """Burst of ``count`` particles from ``(x, y)``; returns how many spawned."""
+        count = min(count, max(0, self.budget - self.live), self.capacity)
+        if count <= 0:
+            return 0
+        idx = (self._head + np.arange(count)) % self.capacity
+        self._head = (self._head + count) % self.capacity
+        self._used = min(self.capacity, self._used + count)
+
+        rng = self.rng
+        angle = direction + (rng.random(count, np.float32) - 0.5) * spread
+        velocity = speed * (0.3 + 0.7 * rng.random(count, np.float32))
+        self.x[idx] = x
+        self.y[idx] = y
+        self.vx[idx] = np.cos(angle) * velocity
+        self.vy[idx] = np.sin(angle) * velocity
+        lifetimes = life * (0.5 + 0.5 * rng.random(count, np.float32))
+        # Overwritten slots may still be alive; keep the live count honest.
+        self.live += count - int(np.count_nonzero(self.life[idx] > 0))
+        self.life[idx] = lifetimes
+        self.max_life[idx] = lifetimes
+        self.color[idx] = color
+        return count
+
+    def update(self, dt: float) -> None:
+        if self.live == 0:
+            return
+        n = self._used
+        x, y, vx, vy = self.x[:n], self.y[:n], self.vx[:n], self.vy[:n]
+        life = self.life[:n]
+        x += vx * dt
+        y += vy * dt
+        vy += self.gravity * dt
+        drag = 1.0 - 1.5 * dt
+        vx *= drag
+        vy *= drag
+        life -= dt
+        self.live = int(np.count_nonzero(life > 0))
+
+    def draw(self, surface: pygame.Surface, scale: float = 1.0) -> None:
+        if self.live == 0:
+            return
+        n = self._used
+        idx = np.flatnonzero(self.life[:n] > 0)
+        size = max(1, round(2 * scale))
+        width, height = surface.get_size()
+        xs = (self.x[idx] * scale).astype(np.intp)
+        ys = (self.y[idx] * scale).astype(np.intp)
+        inside = (xs >= 0) & (xs <= width - size) & (ys >= 0) & (ys <= height - size)
+        idx, xs, ys = idx[inside], xs[inside], ys[inside]
+        if idx.size == 0:
+            return
+
+        fade = self.life[idx] / self.max_life[idx]
+        colors = (PALETTE[self.color[idx]] * fade[:, None]).astype(np.uint8)
+        pixels = pygame.surfarray.pixels3d(surface)
+        try:
+            for dx in range(size):
+                for dy in range(size):
+                    px, py = xs + dx, ys + dy
+                    pixels[px, py] = np.maximum(pixels[px, py], colors)
+        finally:
+            del pixels  # unlock the surface
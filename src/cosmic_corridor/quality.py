@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class QualityTier:
+    """One step of the render-quality ladder."""
+
+    name: str
+    glow: bool
+    rounded: bool
+    star_fraction: float
+    flash: bool
+    # Share of the particle pool that may be alive at once.
+    particle_fraction: float = 1.0
+
+
+# Highest quality first; the governor walks down this list when frames run
+# over budget and back up once there is headroom again.
+QUALITY_TIERS: tuple[QualityTier, ...] = (
+    QualityTier("high", glow=True, rounded=True, star_fraction=1.0, flash=True),
+    QualityTier(
+        "medium",
+        glow=False,
+        rounded=True,
+        star_fraction=1.0,
+        flash=True,
+        particle_fraction=0.5,
+    ),
+    QualityTier(
+        "low",
+        glow=False,
+        rounded=False,
+        star_fraction=0.5,
+        flash=True,
+        particle_fraction=0.25,
+    ),
+    QualityTier(
+        "minimal",
+        glow=False,
+        rounded=False,
+        star_fraction=0.2,
+        flash=False,
+        particle_fraction=0.1,
+    ),
+)
+
+
+class QualityGovernor:
+    """Pick a quality tier from rolling frame times.
+
+    Frame times are collected in windows of ``window`` frames. A window whose
+    mean is above ``downgrade_ratio * budget`` drops one tier immediately;
+    stepping back up needs ``upgrade_windows`` consecutive windows below
+    ``upgrade_ratio * budget``. A downgrade while an upgrade is still on
+    probation doubles the number of calm windows required, so the tier does
+    not oscillate between two neighbours.
+    """
+
+    def __init__(
+        self,
+        budget: float,
+        window: int = 30,
+        downgrade_ratio: float = 0.9,
+        upgrade_ratio: float = 0.55,
+        upgrade_windows: int = 3,
+        max_upgrade_windows: int = 48,
+        tiers: tuple[QualityTier, ...] = QUALITY_TIERS,
+    ) -> None:
+        self.budget = budget
+        self.window = window
+        self.downgrade_ratio = downgrade_ratio
+        self.upgrade_ratio = upgrade_ratio
+        self.tiers = tiers
+        self.level = 0
+
+        self._samples: deque[float] = deque(maxlen=window)
+        self._base_upgrade_windows = upgrade_windows
+        self._max_upgrade_windows = max_upgrade_windows
+        self._upgrade_windows = upgrade_windows
+        self._calm_windows = 0
+        self._probation = 0
+        self._last_mean = 0.0
+
+    @property
+    def tier(self) -> QualityTier:
+        return self.tiers[self.level]
+
+    @property
+    def mean_frame_time(self) -> float:
+        """Mean frame time of the last complete window, in seconds."""
+        return self._last_mean
+
+    def record(self, frame_time: float) -> None:
+        """Add one frame time (seconds) and re-evaluate the tier."""
+        self._samples.append(frame_time)
+        if len(self._samples) < self.window:
+            return
+
+        mean = sum(self._samples) / len(self._samples)
+        self._last_mean = mean
+        self._samples.clear()
+
+        if mean > self.budget * self.downgrade_ratio:
+            self._calm_windows = 0
+            if self.level < len(self.tiers) - 1:
+                if self._probation > 0:
+                    # Dropped again right after stepping up: wait longer next time.
+                    self._upgrade_windows = min(
+                        self._upgrade_windows * 2, self._max_upgrade_windows
+                    )
+                self._probation = 0
+                self.level += 1
+            return
+
+        if self._probation > 0:
+            self._probation -= 1
+            if self._probation == 0:
+                self._upgrade_windows = self._base_upgrade_windows
+
+        if mean < self.budget * self.upgrade_ratio:
+            self._calm_windows += 1
+            if self.level > 0 and self._calm_windows >= self._upgrade_windows:
+                self.level -= 1
+                self._calm_windows = 0
+                self._probation = self._upgrade_windows
+        else:
+            self._calm_windows = 0
@@ -0,0 +1,407 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import struct
+import threading
+import time
+import zlib
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import asdict, dataclass, field
+from importlib import metadata
+from pathlib import Path
+from typing import IO, TYPE_CHECKING
+
+from .controls import KeyState
+
+if TYPE_CHECKING:
+    from .game import CosmicCorridorGame
+
+# Every stored replay is framed as magic + compressed length + zlib blob, both
+# in segment files and in export streams.
+FRAME = struct.Struct("<4sI")
+MAGIC = b"CCRP"
+SEGMENT_BYTES = 64 * 1024 * 1024
+
+try:
+    GAME_VERSION = metadata.version("cosmic-corridor")
+except metadata.PackageNotFoundError:  # running from a source checkout
+    GAME_VERSION = "dev"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS replays (
+    id INTEGER PRIMARY KEY,
+    segment INTEGER NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    seed INTEGER NOT NULL,
+    players INTEGER NOT NULL,
+    ticks INTEGER NOT NULL,
+    score INTEGER NOT NULL,
+    duration REAL NOT NULL,
+    died INTEGER NOT NULL,
+    version TEXT NOT NULL,
+    created REAL NOT NULL,
+    label TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS replays_created ON replays (created);
+CREATE INDEX IF NOT EXISTS replays_score ON replays (score);
+CREATE INDEX IF NOT EXISTS replays_duration ON replays (duration);
+"""
+
+INFO_COLUMNS = (
+    "id, seed, players, ticks, score, duration, died, version, created, label"
+)
+ORDERS = ("created", "score", "duration")
+
+
+class ReplayError(ValueError):
+    """A replay that cannot be decoded or stored."""
+
+
+@dataclass
+class Replay:
+    """One game as its seed plus the input of every simulation tick.
+
+    ``dts`` holds the step lengths and ``masks`` the button bitmasks, one byte
+    per player per tick. Replaying them through
+    :meth:`CosmicCorridorGame.step` reproduces the game exactly.
+    """
+
+    seed: int
+    players: int = 1
+    dts: array = field(default_factory=lambda: array("d"))
+    masks: bytearray = field(default_factory=bytearray)
+    score: int = 0
+    duration: float = 0.0
+    died: bool = False
+    version: str = GAME_VERSION
+    created: float = field(default_factory=time.time)
+    label: str = ""
+
+    @property
+    def ticks(self) -> int:
+        return len(self.dts)
+
+    def append(self, dt: float, masks: Sequence[int]) -> None:
+        self.dts.append(dt)
+        self.masks.extend(masks)
+
+    def inputs(self) -> Iterator[tuple[float, bytes]]:
+        n = self.players
+        masks = bytes(self.masks)
+        for i, dt in enumerate(self.dts):
+            yield dt, masks[i * n : (i + 1) * n]
+
+    def header(self) -> dict:
+        meta = asdict(self)
+        del meta["dts"], meta["masks"]
+        meta["ticks"] = self.ticks
+        return meta
+
+    def encode(self) -> bytes:
+        """Compressed blob: a JSON header line, then all dts, then all masks.
+
+        Keeping each column together lets zlib fold runs of equal step lengths
+        and held buttons.
+        """
+        head = json.dumps(self.header(), separators=(",", ":")).encode()
+        dts = array("d", self.dts)
+        if dts.itemsize != 8:
+            raise ReplayError("unsupported float size")
+        return zlib.compress(head + b"\n" + dts.tobytes() + bytes(self.masks), 6)
+
+    @classmethod
+    def decode(cls, blob: bytes) -> Replay:
+        try:
+            raw = zlib.decompress(blob)
+            head, _, body = raw.partition(b"\n")
+            meta = json.loads(head)
+            ticks = int(meta.pop("ticks"))
+            dts = array("d")
+            dts.frombytes(body[: ticks * 8])
+            masks = bytearray(body[ticks * 8 :])
+            replay = cls(dts=dts, masks=masks, **meta)
+        except (zlib.error, ValueError, TypeError, KeyError) as exc:
+            raise ReplayError("corrupt replay") from exc
+        if len(masks) != ticks * replay.players:
+            raise ReplayError("corrupt replay")
+        return replay
+
+
+def play(replay: Replay) -> CosmicCorridorGame:
+    """Re-simulate ``replay`` headless and return the game as it ended."""
+    from .game import CosmicCorridorGame
+
+    game = CosmicCorridorGame(headless=True, seed=replay.seed, players=replay.players)
+    for dt, masks in replay.inputs():
+        game.step(dt, [KeyState(mask) for mask in masks])
+        game.events.clear()  # effects only matter on screen
+    return game
+
+
+def read_frames(stream: IO[bytes]) -> Iterator[bytes]:
+    """Compressed replay blobs from a segment file or an export stream."""
+    while True:
+        head = stream.read(FRAME.size)
+        if not head:
+            return
+        if len(head) < FRAME.size:
+            raise ReplayError("truncated frame")
+        magic, length = FRAME.unpack(head)
+        if magic != MAGIC:
+            raise ReplayError("not a replay stream")
+        blob = stream.read(length)
+        if len(blob) < length:
+            raise ReplayError("truncated frame")
+        yield blob
+
+
+@dataclass
+class ReplayInfo:
+    """One row of the archive index."""
+
+    id: int
+    seed: int
+    players: int
+    ticks: int
+    score: int
+    duration: float
+    died: bool
+    version: str
+    created: float
+    label: str
+
+
+class ReplayArchive:
+    """Replays in append-only segment files, indexed in SQLite.
+
+    Each replay is compressed once and appended to the current segment file
+    (a new one starts past ``segment_bytes``); nothing is ever rewritten. The
+    index keeps where each replay lives next to its seed, score, duration,
+    game version and date, so :meth:`query` never opens a segment. Export
+    copies compressed frames as they are and import appends them one at a
+    time, so neither holds more than one replay in memory. One archive can be
+    shared between threads; its connection is used under a lock.
+    """
+
+    def __init__(self, root: str | Path, segment_bytes: int = SEGMENT_BYTES) -> None:
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.segment_bytes = segment_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.root / "index.sqlite3", timeout=5.0, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        last = self._conn.execute("SELECT MAX(segment) FROM replays").fetchone()[0]
+        self._segment = last or 1
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> ReplayArchive:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM replays").fetchone()[0]
+
+    def _segment_path(self, segment: int) -> Path:
+        return self.root / f"segment-{segment:06d}.ccr"
+
+    # ---------- writing ----------
+    def add(self, replay: Replay) -> int:
+        """Store ``replay``; returns its id."""
+        with self._lock, self._conn:
+            return self._append(replay.encode(), replay.header())
+
+    def import_stream(self, stream: IO[bytes], batch: int = 500) -> int:
+        """Append every replay in an export stream; returns how many."""
+        count = 0
+        with self._lock:
+            for blob in read_frames(stream):
+                self._append(blob, Replay.decode(blob).header())
+                count += 1
+                if count % batch == 0:
+                    self._conn.commit()
+            self._conn.commit()
+        return count
+
+    def _append(self, blob: bytes, meta: dict) -> int:
+        path = self._segment_path(self._segment)
+        if path.exists() and path.stat().st_size >= self.segment_bytes:
+            self._segment += 1
+            path = self._segment_path(self._segment)
+        with path.open("ab") as segment:
+            segment.write(FRAME.pack(MAGIC, len(blob)))
+            offset = segment.tell()
+            segment.write(blob)
+        cur = self._conn.execute(
+            "INSERT INTO replays (segment, offset, length, seed, players, ticks,"
+            " score, duration, died, version, created, label)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                self._segment,
+                offset,
+                len(blob),
+                meta["seed"],
+                meta["players"],
+                meta["ticks"],
+                meta["score"],
+                meta["duration"],
+                int(meta["died"]),
+                meta["version"],
+                meta["created"],
+                meta["label"],
+            ),
+        )
+        return cur.lastrowid
+
+    # ---------- reading ----------
+    def _read_blob(self, segment: int, offset: int, length: int) -> bytes:
+        with self._segment_path(segment).open("rb") as f:
+            f.seek(offset)
+            return f.read(length)
+
+    def get(self, replay_id: int) -> Replay:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT segment, offset, length FROM replays WHERE id = ?", (replay_id,)
+            ).fetchone()
+        if row is None:
+            raise KeyError(replay_id)
+        return Replay.decode(self._read_blob(*row))
+
+    def query(
+        self,
+        since: float | None = None,
+        until: float | None = None,
+        min_score: int | None = None,
+        max_duration: float | None = None,
+        died: bool | None = None,
+        version: str | None = None,
+        order: str = "created",
+        descending: bool = True,
+        limit: int | None = 100,
+    ) -> list[ReplayInfo]:
+        """Index rows matching every given filter, e.g. the top 100 this week:
+        ``query(since=time.time() - 7 * 86400, order="score")``."""
+        where, args = self._where(since, until, min_score, max_duration, died, version)
+        if order not in ORDERS:
+            raise ValueError(f"order must be one of {ORDERS}")
+        sql = (
+            f"SELECT {INFO_COLUMNS} FROM replays {where}"
+            f" ORDER BY {order} {'DESC' if descending else 'ASC'}, id"
+        )
+        if limit is not None:
+            sql += " LIMIT ?"
+            args.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, args).fetchall()
+        return [ReplayInfo(*row[:6], bool(row[6]), *row[7:]) for row in rows]
+
+    @staticmethod
+    def _where(
+        since: float | None,
+        until: float | None,
+        min_score: int | None,
+        max_duration: float | None,
+        died: bool | None,
+        version: str | None,
+    ) -> tuple[str, list]:
+        clauses: list[str] = []
+        args: list = []
+        for clause, value in (
+            ("created >= ?", since),
+            ("created < ?", until),
+            ("score >= ?", min_score),
+            ("duration < ?", max_duration),
+            ("died = ?", None if died is None else int(died)),
+            ("version = ?", version),
+        ):
+            if value is not None:
+                clauses.append(clause)
+                args.append(value)
+        return ("WHERE " + " AND ".join(clauses) if clauses else ""), args
+
+    def export_stream(self, stream: IO[bytes], ids: Iterable[int] | None = None) -> int:
+        """Write replays (all, or ``ids``) to ``stream``; returns how many.
+
+        Frames are copied compressed, in storage order when exporting all.
+        """
+        # Index rows are a few integers each; fetch them all under the lock.
+        with self._lock:
+            if ids is None:
+                rows = self._conn.execute(
+                    "SELECT segment, offset, length FROM replays"
+                    " ORDER BY segment, offset"
+                ).fetchall()
+            else:
+                rows = [
+                    self._conn.execute(
+                        "SELECT segment, offset, length FROM replays WHERE id = ?",
+                        (i,),
+                    ).fetchone()
+                    for i in ids
+                ]
+        count = 0
+        for row in rows:
+            if row is None:
+                continue
+            blob = self._read_blob(*row)
+            stream.write(FRAME.pack(MAGIC, len(blob)))
+            stream.write(blob)
+            count += 1
+        return count
+
+
+class ReplayRecorder:
+    """Records the inputs of each game and files it in ``archive`` when it ends.
+
+    The game calls :meth:`record` before every simulation step and
+    :meth:`finish` on game over. Recording starts at the first step of a game,
+    so a recorder attached mid-game waits for the next one. Call
+    :meth:`finish` when quitting to keep an unfinished run too.
+    """
+
+    def __init__(self, archive: ReplayArchive, label: str = "") -> None:
+        self.archive = archive
+        self.label = label
+        self.saved: list[int] = []
+        self._replay: Replay | None = None
+
+    def record(
+        self, game: CosmicCorridorGame, dt: float, inputs: Sequence[Sequence[bool]]
+    ) -> None:
+        if self._replay is None:
+            if game.time_survived != 0.0:
+                return
+            self._replay = Replay(
+                seed=game.game_seed, players=len(game.players), label=self.label
+            )
+        self._replay.append(dt, [_mask(keys) for keys in inputs])
+
+    def finish(self, game: CosmicCorridorGame) -> int | None:
+        replay, self._replay = self._replay, None
+        if replay is None or not replay.ticks:
+            return None
+        replay.score = game.score
+        replay.duration = game.time_survived
+        replay.died = game.game_over
+        replay_id = self.archive.add(replay)
+        self.saved.append(replay_id)
+        return replay_id
+
+
+def _mask(keys: Sequence[bool]) -> int:
+    if not isinstance(keys, KeyState):
+        keys = KeyState.from_pressed(keys)
+    return keys.mask
@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import gc
+import json
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import pygame
+
+from .game import FPS, Bullet, CosmicCorridorGame, Enemy, PowerUp
+from .metrics import rss_bytes
+
+ENTITY_TYPES = (Bullet, Enemy, PowerUp)
+MB = 1024 * 1024
+
+
+@dataclass
+class SoakSample:
+    frame: int
+    game_time: float
+    wall_time: float
+    rss_bytes: float
+    traced_bytes: int
+    live: dict[str, int]
+    in_game: dict[str, int]
+    surfaces: int
+    surface_bytes: int
+    sprite_cache: int
+    gc_counts: tuple[int, int, int]
+    gc_collections: list[int]
+    gc_garbage: int
+
+
+def _heap_census() -> tuple[dict[str, int], int, int]:
+    """Live entity instances and Surfaces reachable from gc-tracked objects.
+
+    Surfaces are not gc-tracked themselves, so they are found through the
+    containers that reference them. This walks the whole heap; call it at
+    sample intervals, not per frame.
+    """
+    live = {cls.__name__: 0 for cls in ENTITY_TYPES}
+    surfaces: dict[int, pygame.Surface] = {}
+    for obj in gc.get_objects():
+        cls = type(obj)
+        if cls in ENTITY_TYPES:
+            live[cls.__name__] += 1
+        for ref in gc.get_referents(obj):
+            if isinstance(ref, pygame.Surface):
+                surfaces[id(ref)] = ref
+    surface_bytes = sum(
+        s.get_width() * s.get_height() * s.get_bytesize() for s in surfaces.values()
+    )
+    return live, len(surfaces), surface_bytes
+
+
+def growth_per_hour(xs: list[float], ys: list[float]) -> float:
+    """Least-squares slope of ``ys`` over ``xs`` (seconds), scaled to one hour."""
+    n = len(xs)
+    if n < 2:
+        return 0.0
+    mean_x = sum(xs) / n
+    mean_y = sum(ys) / n
+    var = sum((x - mean_x) ** 2 for x in xs)
+    if var == 0:
+        return 0.0
+    cov = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys, strict=True))
+    return cov / var * 3600.0
+
+
+class SoakMonitor:
+    """Frame hook that samples memory and writes a soak report.
+
+    Every ``sample_every`` seconds of game time (frames at the nominal FPS) it
+    records RSS, traced Python memory, live ``Bullet``/``Enemy``/``PowerUp``
+    instances (on the heap and in the game's lists), reachable Surfaces and
+    ``gc`` statistics to ``samples.jsonl``. Every ``snapshot_every`` seconds it
+    takes a ``tracemalloc`` snapshot and appends the top allocation-site diffs
+    (vs. the first snapshot and the previous one) to ``tracemalloc.txt``.
+
+    :meth:`verdict` fails the run when, after the first ``warmup`` seconds, RSS
+    or traced memory grows faster than ``max_growth_mb_per_hour`` (per hour of
+    game time) *and* the fitted growth over the run exceeds ``min_growth_mb``,
+    so short runs do not fail on extrapolated noise.
+    """
+
+    def __init__(
+        self,
+        game: CosmicCorridorGame,
+        report_dir: str | Path,
+        sample_every: float = 10.0,
+        snapshot_every: float = 300.0,
+        warmup: float = 60.0,
+        max_growth_mb_per_hour: float = 8.0,
+        min_growth_mb: float = 2.0,
+        top: int = 15,
+    ) -> None:
+        self.game = game
+        self.report_dir = Path(report_dir)
+        self.report_dir.mkdir(parents=True, exist_ok=True)
+        self.warmup = warmup
+        self.max_growth_mb_per_hour = max_growth_mb_per_hour
+        self.min_growth_mb = min_growth_mb
+        self.top = top
+        self.samples: list[SoakSample] = []
+
+        self._frame = 0
+        self._sample_frames = max(1, round(sample_every * FPS))
+        self._snapshot_frames = max(1, round(snapshot_every * FPS))
+        self._started = time.perf_counter()
+        self._first_snapshot: tracemalloc.Snapshot | None = None
+        self._last_snapshot: tracemalloc.Snapshot | None = None
+        self._samples_file = open(self.report_dir / "samples.jsonl", "w")
+        self._trace_file = open(self.report_dir / "tracemalloc.txt", "w")
+        self._owns_tracing = not tracemalloc.is_tracing()
+        if self._owns_tracing:
+            tracemalloc.start()
+        self.sample()
+        self.snapshot()
+
+    @property
+    def game_time(self) -> float:
+        return self._frame / FPS
+
+    def __call__(self, game: CosmicCorridorGame) -> None:
+        self._frame += 1
+        if self._frame % self._sample_frames == 0:
+            self.sample()
+        if self._frame % self._snapshot_frames == 0:
+            self.snapshot()
+
+    def sample(self) -> SoakSample:
+        live, surfaces, surface_bytes = _heap_census()
+        sample = SoakSample(
+            frame=self._frame,
+            game_time=round(self.game_time, 3),
+            wall_time=round(time.perf_counter() - self._started, 3),
+            rss_bytes=rss_bytes(),
+            traced_bytes=tracemalloc.get_traced_memory()[0],
+            live=live,
+            in_game={
+                "Bullet": len(self.game.bullets),
+                "Enemy": len(self.game.enemies),
+                "PowerUp": len(self.game.powerups),
+            },
+            surfaces=surfaces,
+            surface_bytes=surface_bytes,
+            sprite_cache=len(self.game.sprites),
+            gc_counts=gc.get_count(),
+            gc_collections=[gen["collections"] for gen in gc.get_stats()],
+            gc_garbage=len(gc.garbage),
+        )
+        self.samples.append(sample)
+        self._samples_file.write(json.dumps(asdict(sample)) + "\n")
+        self._samples_file.flush()
+        return sample
+
+    def snapshot(self) -> None:
+        # Leave out the monitor's own bookkeeping.
+        snap = tracemalloc.take_snapshot().filter_traces(
+            (
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, __file__),
+            )
+        )
+        out = self._trace_file
+        out.write(f"=== game time {self.game_time:.0f} s, frame {self._frame} ===\n")
+        bases = (
+            ("since start", self._first_snapshot),
+            ("since previous", self._last_snapshot),
+        )
+        for label, base in bases:
+            if base is None:
+                continue
+            out.write(f"--- top {self.top} growth {label} ---\n")
+            for stat in snap.compare_to(base, "lineno")[: self.top]:
+                out.write(f"{stat}\n")
+        out.write("\n")
+        out.flush()
+        if self._first_snapshot is None:
+            self._first_snapshot = snap
+        self._last_snapshot = snap
+
+    def verdict(self) -> tuple[bool, dict[str, float]]:
+        """``(passed, growth rates in MB per game hour)`` after warm-up."""
+        steady = [s for s in self.samples if s.game_time >= self.warmup]
+        xs = [s.game_time for s in steady]
+        rates = {
+            "rss": growth_per_hour(xs, [s.rss_bytes / MB for s in steady]),
+            "traced": growth_per_hour(xs, [s.traced_bytes / MB for s in steady]),
+        }
+        span_hours = (xs[-1] - xs[0]) / 3600.0 if len(xs) >= 5 else 0.0
+        passed = all(
+            rate <= self.max_growth_mb_per_hour
+            or rate * span_hours < self.min_growth_mb
+            for rate in rates.values()
+        )
+        return passed, rates
+
+    def close(self) -> tuple[bool, dict[str, float]]:
+        """Take a final sample and snapshot, write the summary, stop tracing."""
+        self.sample()
+        self.snapshot()
+        passed, rates = self.verdict()
+        summary = {
+            "passed": passed,
+            "max_growth_mb_per_hour": self.max_growth_mb_per_hour,
+            "min_growth_mb": self.min_growth_mb,
+            "growth_mb_per_hour": rates,
+            "samples": len(self.samples),
+            "game_time": self.game_time,
+            "wall_time": time.perf_counter() - self._started,
+        }
+        (self.report_dir / "summary.json").write_text(json.dumps(summary, indent=2))
+        self._samples_file.close()
+        self._trace_file.close()
+        if self._owns_tracing:
+            tracemalloc.stop()
+        return passed, rates
@@ -0,0 +1,364 @@
+from __future__ import annotations
+
+import json
+import queue
+import threading
+import time
+import urllib.request
+from collections import deque
+from collections.abc import Iterator
+from typing import TYPE_CHECKING
+
+from .metrics import REGISTRY
+
+if TYPE_CHECKING:
+    from .game import CosmicCorridorGame
+
+MAX_PUBLISH_BYTES = 1024 * 1024
+
+SPECTATORS = REGISTRY.gauge("spectators", "Connected spectator streams.")
+FRAMES_PUBLISHED = REGISTRY.counter(
+    "spectator_frames_published", "State frames encoded for spectators."
+)
+FRAMES_DROPPED = REGISTRY.counter(
+    "spectator_frames_dropped", "Frames dropped for slow spectators."
+)
+
+_MISSING = object()
+
+
+def diff_state(prev: dict, cur: dict) -> dict:
+    """Top-level keys of ``cur`` that changed since ``prev``; removed keys map
+    to ``None``."""
+    delta = {k: v for k, v in cur.items() if prev.get(k, _MISSING) != v}
+    for key in prev.keys() - cur.keys():
+        delta[key] = None
+    return delta
+
+
+def sse_message(event: str, seq: int, data: dict) -> bytes:
+    body = json.dumps(data, separators=(",", ":"))
+    return f"id: {seq}\nevent: {event}\ndata: {body}\n\n".encode()
+
+
+class Subscription:
+    """One spectator's bounded queue of encoded frames."""
+
+    __slots__ = ("queue", "resync", "dropped")
+
+    def __init__(self) -> None:
+        self.queue: deque[bytes] = deque()
+        # Set for late joiners and after drops: the next read starts from the
+        # latest keyframe instead of the queue.
+        self.resync = True
+        self.dropped = 0
+
+
+class Broadcaster:
+    """Fan-out of game state frames to many spectators, encoded once.
+
+    :meth:`publish` turns each state into an SSE message exactly once — a
+    full ``key`` frame every ``keyframe_every`` frames, otherwise a ``delta``
+    of the top-level fields that changed (nothing at all if none did) — and
+    appends the same ``bytes`` object to every subscriber's queue. A
+    subscriber whose queue already holds ``capacity`` frames has it cleared
+    and is marked for resync instead of buffering without limit. Late
+    joiners and resyncing subscribers get the latest keyframe plus the
+    deltas since, which the broadcaster keeps. :meth:`read` returns
+    everything pending as one chunk, so a spectator costs roughly one socket
+    write per frame.
+    """
+
+    def __init__(self, capacity: int = 64, keyframe_every: int = 60) -> None:
+        self.capacity = capacity
+        self.keyframe_every = keyframe_every
+        self.seq = 0
+        self._cond = threading.Condition()
+        self._subscribers: set[Subscription] = set()
+        self._last: dict | None = None
+        self._keyframe_seq = 0
+        self._catch_up: list[bytes] = []  # keyframe, then deltas since
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, state: dict) -> None:
+        with self._cond:
+            due = self.seq + 1 - self._keyframe_seq >= self.keyframe_every
+            if self._last is None or due:
+                self.seq += 1
+                message = sse_message("key", self.seq, state)
+                self._keyframe_seq = self.seq
+                self._catch_up = [message]
+            else:
+                delta = diff_state(self._last, state)
+                if not delta:
+                    return  # nothing changed, nothing to send
+                self.seq += 1
+                message = sse_message("delta", self.seq, delta)
+                self._catch_up.append(message)
+            self._last = state
+
+            for sub in self._subscribers:
+                if sub.resync:
+                    continue
+                if len(sub.queue) >= self.capacity:
+                    sub.dropped += len(sub.queue) + 1
+                    FRAMES_DROPPED.inc(len(sub.queue) + 1)
+                    sub.queue.clear()
+                    sub.resync = True
+                else:
+                    sub.queue.append(message)
+            self._cond.notify_all()
+        FRAMES_PUBLISHED.inc()
+
+    def subscribe(self) -> Subscription:
+        sub = Subscription()
+        with self._cond:
+            self._subscribers.add(sub)
+        SPECTATORS.inc()
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        with self._cond:
+            if sub in self._subscribers:
+                self._subscribers.remove(sub)
+                SPECTATORS.dec()
+
+    def read(self, sub: Subscription, timeout: float | None = None) -> bytes:
+        """Everything pending for ``sub`` as one chunk; ``b""`` on timeout."""
+        with self._cond:
+            ready = self._cond.wait_for(
+                lambda: sub.queue or (sub.resync and self._catch_up), timeout
+            )
+            if not ready:
+                return b""
+            if sub.resync:
+                sub.resync = False
+                sub.queue.clear()
+                return b"".join(self._catch_up)
+            chunk = b"".join(sub.queue)
+            sub.queue.clear()
+            return chunk
+
+    def stream(self, sub: Subscription, heartbeat: float = 15.0) -> Iterator[bytes]:
+        """SSE body for one spectator; unsubscribes when the client goes away."""
+        try:
+            yield b"retry: 2000\n\n"
+            while True:
+                # A comment line keeps proxies from timing out idle streams.
+                yield self.read(sub, heartbeat) or b": ping\n\n"
+        finally:
+            self.unsubscribe(sub)
+
+
+# ---------- publishing from the desktop game ----------
+def frame_state(game: CosmicCorridorGame) -> dict:
+    """Compact, JSON-friendly state for spectators (integer pixels)."""
+    return {
+        "score": game.score,
+        "lives": game.lives,
+        "time": round(game.time_survived, 1),
+        "over": game.game_over,
+        "players": [[round(p.x), round(p.y), p.has_powerup()] for p in game.players],
+        "enemies": [[round(e.x), round(e.y), e.w, e.h] for e in game.enemies],
+        "bullets": [[round(b.x), round(b.y)] for b in game.bullets],
+        "powerups": [[round(p.x), round(p.y)] for p in game.powerups],
+    }
+
+
+class SpectatorPublisher:
+    """Frame hook that streams the game to ``POST /spectate/publish``.
+
+    Every ``every``-th frame is queued (and dropped if the uploader falls
+    behind); a background thread posts whatever has accumulated as one JSON
+    list, so the game loop never waits on the network.
+    """
+
+    def __init__(
+        self, url: str, token: str | None = None, every: int = 2, capacity: int = 120
+    ) -> None:
+        self.url = url
+        self.token = token
+        self.every = every
+        self.frames_dropped = 0
+        self.errors = 0
+        self._frame = 0
+        self._queue: queue.Queue[dict | None] = queue.Queue(maxsize=capacity)
+        self._thread = threading.Thread(
+            target=self._upload_loop, name="spectator-publisher", daemon=True
+        )
+        self._thread.start()
+
+    def __call__(self, game: CosmicCorridorGame) -> None:
+        self._frame += 1
+        if self._frame % self.every:
+            return
+        try:
+            self._queue.put_nowait(frame_state(game))
+        except queue.Full:
+            self.frames_dropped += 1
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join()
+
+    def _upload_loop(self) -> None:
+        while True:
+            frames = [self._queue.get()]
+            while True:
+                try:
+                    frames.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = frames[-1] is None
+            frames = [f for f in frames if f is not None]
+            if frames:
+                self._post(frames)
+            if stop:
+                return
+
+    def _post(self, frames: list[dict]) -> None:
+        req = urllib.request.Request(
+            self.url,
+            data=json.dumps(frames, separators=(",", ":")).encode(),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        if self.token:
+            req.add_header("Authorization", f"Bearer {self.token}")
+        try:
+            with urllib.request.urlopen(req, timeout=5) as resp:
+                resp.read()
+        except OSError:
+            self.errors += 1
+            time.sleep(1.0)
+
+
+# ---------- Flask routes ----------
+VIEWER_HTML = """
+<!doctype html>
+<html lang="en">
+<head>
+  <meta charset="utf-8">
+  <title>Cosmic Corridor – Spectate</title>
+  <style>
+    body {
+      margin: 0;
+      background: #02020a;
+      color: #f5f5ff;
+      font-family: system-ui, -apple-system, BlinkMacSystemFont, "Segoe UI", sans-serif;
+      display: flex;
+      flex-direction: column;
+      align-items: center;
+      justify-content: center;
+      min-height: 100vh;
+    }
+    canvas {
+      background: #050515;
+      border-radius: 12px;
+      border: 1px solid rgba(90, 110, 200, 0.7);
+    }
+    #status { margin-top: 8px; font-size: 12px; color: #c6c6f0; }
+  </style>
+</head>
+<body>
+  <canvas id="view" width="800" height="600"></canvas>
+  <div id="status">connecting…</div>
+<script>
+(() => {
+  const ctx = document.getElementById("view").getContext("2d");
+  const status = document.getElementById("status");
+  let state = null;
+
+  function draw() {
+    requestAnimationFrame(draw);
+    if (!state) return;
+    ctx.fillStyle = "#050515";
+    ctx.fillRect(0, 0, 800, 600);
+    ctx.fillStyle = "#b4f0ff";
+    for (const [x, y] of state.bullets) ctx.fillRect(x - 2, y - 6, 4, 12);
+    ctx.fillStyle = "#f05a78";
+    for (const [x, y, w, h] of state.enemies) ctx.fillRect(x - w / 2, y - h / 2, w, h);
+    ctx.fillStyle = "#50dc78";
+    for (const [x, y] of state.powerups) ctx.fillRect(x - 9, y - 9, 18, 18);
+    state.players.forEach(([x, y, powered], i) => {
+      ctx.fillStyle = i === 0 ? "#e6e6fa" : "#dcfae6";
+      ctx.fillRect(x - 20, y - 11, 40, 22);
+      if (powered) {
+        ctx.strokeStyle = "#50ffa0";
+        ctx.strokeRect(x - 24, y - 15, 48, 30);
+      }
+    });
+    ctx.fillStyle = "#ebebf5";
+    ctx.font = "18px monospace";
+    const hud = `Score ${state.score}   Lives ${state.lives}   ${state.time}s`;
+    ctx.fillText(hud, 16, 28);
+    if (state.over) ctx.fillText("GAME OVER", 350, 300);
+  }
+
+  const source = new EventSource("/spectate/stream");
+  source.addEventListener("key", (e) => { state = JSON.parse(e.data); });
+  source.addEventListener("delta", (e) => {
+    if (state) Object.assign(state, JSON.parse(e.data));
+  });
+  source.onopen = () => { status.textContent = "live"; };
+  source.onerror = () => { status.textContent = "reconnecting…"; };
+  requestAnimationFrame(draw);
+})();
+</script>
+</body>
+</html>
+"""
+
+
+def register_spectate(
+    app, broadcaster: Broadcaster, token: str | None = None, max_spectators: int = 500
+) -> None:
+    """Add ``POST /spectate/publish``, ``GET /spectate/stream`` and the
+    ``GET /spectate`` viewer page to ``app``.
+
+    Publishing needs ``token``; without one it is refused outright.
+    """
+    from flask import Response, jsonify, request
+
+    def publish():
+        if not token:
+            return jsonify(error="publishing is disabled (no token set)"), 403
+        if request.headers.get("Authorization") != f"Bearer {token}":
+            return jsonify(error="bad token"), 401
+        if (request.content_length or 0) > MAX_PUBLISH_BYTES:
+            return jsonify(error="batch too large"), 413
+        # Chunked bodies carry no Content-Length; cap what is actually read.
+        body = request.stream.read(MAX_PUBLISH_BYTES + 1)
+        if len(body) > MAX_PUBLISH_BYTES:
+            return jsonify(error="batch too large"), 413
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            payload = None
+        frames = payload if isinstance(payload, list) else [payload]
+        if not frames or not all(isinstance(f, dict) for f in frames):
+            return jsonify(error="expected a state object or a list of them"), 400
+        for frame in frames:
+            broadcaster.publish(frame)
+        return jsonify(published=len(frames), spectators=len(broadcaster)), 202
+
+    def stream():
+        if len(broadcaster) >= max_spectators:
+            resp = jsonify(error="too many spectators")
+            resp.headers["Retry-After"] = "10"
+            return resp, 503
+        sub = broadcaster.subscribe()
+        return Response(
+            broadcaster.stream(sub),
+            mimetype="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    def viewer():
+        return VIEWER_HTML
+
+    app.add_url_rule("/spectate/publish", "spectate_publish", publish, methods=["POST"])
+    app.add_url_rule("/spectate/stream", "spectate_stream", stream)
+    app.add_url_rule("/spectate", "spectate_viewer", viewer)
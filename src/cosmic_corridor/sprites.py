@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Hashable
+from typing import Any
+
+import pygame
+
+BlitItem = tuple[pygame.Surface, tuple[int, int]]
+
+# Corners of rounded sprites are keyed out with pure black, which no entity uses.
+COLORKEY = (0, 0, 0)
+
+
+class SpriteCache:
+    """Pre-rendered entity sprites keyed by shape.
+
+    Entities come in a handful of sizes, so drawing each one once and reusing
+    the surface turns every per-entity ``pygame.draw`` call into a blit.
+    """
+
+    def __init__(self) -> None:
+        self._sprites: dict[Hashable, pygame.Surface] = {}
+
+    def __len__(self) -> int:
+        return len(self._sprites)
+
+    def get(
+        self, key: Hashable, build: Callable[..., pygame.Surface], *args: Any
+    ) -> pygame.Surface:
+        """Return the sprite for ``key``, building it with ``build(*args)`` once."""
+        sprite = self._sprites.get(key)
+        if sprite is None:
+            sprite = build(*args)
+            if pygame.display.get_surface() is not None:
+                sprite = sprite.convert()
+            sprite.set_colorkey(COLORKEY, pygame.RLEACCEL)
+            self._sprites[key] = sprite
+        return sprite
+
+    def clear(self) -> None:
+        self._sprites.clear()
+
+
+def _surface_id(item: BlitItem) -> int:
+    return id(item[0])
+
+
+def blit_batch(target: pygame.Surface, batch: list[BlitItem]) -> None:
+    """Submit a whole layer in one call, preferring ``fblits`` when available.
+
+    The batch is sorted in place so blits of the same sprite are adjacent.
+    """
+    batch.sort(key=_surface_id)
+    fblits = getattr(target, "fblits", None)  # pygame-ce only
+    if fblits is not None:
+        fblits(batch)
+    else:
+        target.blits(batch, doreturn=False)
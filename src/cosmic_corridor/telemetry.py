@@ -0,0 +1,318 @@
+from __future__ import annotations
+
+import json
+import logging
+import math
+import queue
+import sqlite3
+import threading
+import time
+import zlib
+from collections.abc import Iterable
+from pathlib import Path
+
+from .metrics import REGISTRY
+
+log = logging.getLogger(__name__)
+
+# Event kinds the browser edition sends, as [t, kind, value] triples.
+KINDS = ("frame_ms", "entities", "score", "death")
+
+MAX_BODY_BYTES = 256 * 1024
+MAX_DECODED_BYTES = 4 * 1024 * 1024
+MAX_EVENTS_PER_BATCH = 20_000
+
+EVENTS_ACCEPTED = REGISTRY.counter(
+    "telemetry_events_accepted", "Telemetry events queued for storage."
+)
+BATCHES_REJECTED = REGISTRY.counter(
+    "telemetry_batches_rejected", "Telemetry batches refused.", ("reason",)
+)
+QUEUE_DEPTH = REGISTRY.gauge("telemetry_queue_batches", "Batches waiting for flush.")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    session TEXT NOT NULL,
+    t REAL NOT NULL,
+    kind TEXT NOT NULL,
+    value REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_session ON events (session, kind, t);
+CREATE TABLE IF NOT EXISTS rollup (
+    session TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    n INTEGER NOT NULL,
+    total REAL NOT NULL,
+    min REAL NOT NULL,
+    max REAL NOT NULL,
+    last_t REAL NOT NULL,
+    PRIMARY KEY (session, kind)
+);
+"""
+
+UPSERT_ROLLUP = """
+INSERT INTO rollup (session, kind, n, total, min, max, last_t)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (session, kind) DO UPDATE SET
+    n = n + excluded.n,
+    total = total + excluded.total,
+    min = MIN(min, excluded.min),
+    max = MAX(max, excluded.max),
+    last_t = MAX(last_t, excluded.last_t)
+"""
+
+Event = tuple[str, float, str, float]
+
+
+class TelemetryError(ValueError):
+    """A telemetry batch that cannot be accepted."""
+
+
+def decode_batch(body: bytes, encoding: str | None) -> list[Event]:
+    """Decompress and validate one ``{"session": ..., "events": [...]}`` batch."""
+    if len(body) > MAX_BODY_BYTES:
+        raise TelemetryError("batch too large")
+    if encoding in ("gzip", "deflate"):
+        inflater = zlib.decompressobj(wbits=zlib.MAX_WBITS | 32)
+        try:
+            body = inflater.decompress(body, MAX_DECODED_BYTES)
+        except zlib.error as exc:
+            raise TelemetryError("bad compressed body") from exc
+        if inflater.unconsumed_tail:
+            raise TelemetryError("batch too large")
+    elif encoding not in (None, "", "identity"):
+        raise TelemetryError(f"unsupported encoding {encoding!r}")
+
+    try:
+        payload = json.loads(body)
+        session = str(payload["session"])[:64]
+        raw_events = payload["events"]
+    except (ValueError, KeyError, TypeError) as exc:
+        raise TelemetryError("malformed batch") from exc
+    if not session or not isinstance(raw_events, list):
+        raise TelemetryError("malformed batch")
+    if len(raw_events) > MAX_EVENTS_PER_BATCH:
+        raise TelemetryError("too many events")
+
+    events: list[Event] = []
+    for item in raw_events:
+        try:
+            t, kind, value = item
+            event = (session, float(t), str(kind), float(value))
+        except (ValueError, TypeError) as exc:
+            raise TelemetryError("malformed event") from exc
+        if not (math.isfinite(event[1]) and math.isfinite(event[3])):
+            # json.loads accepts NaN and Infinity; SQLite would store NULL.
+            raise TelemetryError("non-finite event")
+        if event[2] not in KINDS:
+            raise TelemetryError(f"unknown event kind {event[2]!r}")
+        events.append(event)
+    return events
+
+
+def _rollup_rows(events: Iterable[Event]) -> list[tuple]:
+    stats: dict[tuple[str, str], list[float]] = {}
+    for session, t, kind, value in events:
+        row = stats.get((session, kind))
+        if row is None:
+            stats[(session, kind)] = [1, value, value, value, t]
+        else:
+            row[0] += 1
+            row[1] += value
+            row[2] = min(row[2], value)
+            row[3] = max(row[3], value)
+            row[4] = max(row[4], t)
+    return [(s, k, int(r[0]), r[1], r[2], r[3], r[4]) for (s, k), r in stats.items()]
+
+
+class TelemetrySink:
+    """Bounded in-memory queue of event batches, flushed to SQLite in bulk.
+
+    ``submit`` never blocks: when ``capacity`` batches are already waiting it
+    returns ``False`` and the caller should answer 429. A background writer
+    gathers up to ``flush_batches`` batches (or whatever arrives within
+    ``flush_interval``) per transaction, appends the raw
+    events and folds them into the ``rollup`` table, which is what
+    :meth:`summary` reads, so aggregates never scan raw events.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        capacity: int = 256,
+        flush_batches: int = 64,
+        flush_interval: float = 1.0,
+    ) -> None:
+        self.path = str(path)
+        self.flush_batches = flush_batches
+        self.flush_interval = flush_interval
+        self._queue: queue.Queue[list[Event] | None] = queue.Queue(maxsize=capacity)
+        self._writer: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+        self._flushed = threading.Condition()
+        self._submitted = 0
+        self._written = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=5.0)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _ensure_writer(self) -> None:
+        if self._writer is not None:
+            return
+        with self._start_lock:
+            if self._writer is None:
+                conn = self._connect()
+                conn.executescript(SCHEMA)
+                conn.close()
+                self._writer = threading.Thread(
+                    target=self._write_loop, name="telemetry-writer", daemon=True
+                )
+                self._writer.start()
+
+    def submit(self, events: list[Event]) -> bool:
+        """Queue one decoded batch; ``False`` means the buffer is full."""
+        self._ensure_writer()
+        try:
+            self._queue.put_nowait(events)
+        except queue.Full:
+            BATCHES_REJECTED.labels("full").inc()
+            return False
+        with self._flushed:
+            self._submitted += 1
+        EVENTS_ACCEPTED.inc(len(events))
+        QUEUE_DEPTH.set(self._queue.qsize())
+        return True
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until everything submitted so far is on disk."""
+        deadline = time.monotonic() + timeout
+        with self._flushed:
+            target = self._submitted
+            while self._written < target:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._flushed.wait(remaining)
+        return True
+
+    def close(self) -> None:
+        if self._writer is None:
+            return
+        self._queue.put(None)
+        self._writer.join()
+        self._writer = None
+
+    def _write_loop(self) -> None:
+        conn = self._connect()
+        try:
+            stop = False
+            while not stop:
+                first = self._queue.get()
+                if first is None:
+                    break
+                # Gather more batches for up to flush_interval, then write them
+                # in one transaction.
+                batches = [first]
+                deadline = time.monotonic() + self.flush_interval
+                while len(batches) < self.flush_batches:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = self._queue.get(timeout=remaining)
+                    except queue.Empty:
+                        break
+                    if item is None:
+                        stop = True
+                        break
+                    batches.append(item)
+                self._write(conn, batches)
+                QUEUE_DEPTH.set(self._queue.qsize())
+        finally:
+            conn.close()
+
+    def _write(self, conn: sqlite3.Connection, batches: list[list[Event]]) -> None:
+        try:
+            self._insert(conn, [event for batch in batches for event in batch])
+        except sqlite3.Error:
+            # Retry one batch per transaction so a bad batch is dropped on its
+            # own instead of taking the writer thread (and the rest) with it.
+            for batch in batches:
+                try:
+                    self._insert(conn, batch)
+                except sqlite3.Error:
+                    log.exception("dropping telemetry batch of %d events", len(batch))
+                    BATCHES_REJECTED.labels("write_failed").inc()
+        with self._flushed:
+            self._written += len(batches)
+            self._flushed.notify_all()
+
+    @staticmethod
+    def _insert(conn: sqlite3.Connection, events: list[Event]) -> None:
+        with conn:
+            conn.executemany("INSERT INTO events VALUES (?, ?, ?, ?)", events)
+            conn.executemany(UPSERT_ROLLUP, _rollup_rows(events))
+
+    # ---------- queries ----------
+    def summary(self, session: str | None = None) -> dict:
+        """Aggregates per event kind, read from the rollup table only."""
+        self._ensure_writer()
+        query = (
+            "SELECT kind, SUM(n), SUM(total), MIN(min), MAX(max), COUNT(*) "
+            "FROM rollup {where} GROUP BY kind"
+        )
+        args: tuple = ()
+        where = ""
+        if session is not None:
+            where = "WHERE session = ?"
+            args = (session,)
+        conn = self._connect()
+        try:
+            rows = conn.execute(query.format(where=where), args).fetchall()
+        finally:
+            conn.close()
+        kinds = {
+            kind: {
+                "count": n,
+                "mean": total / n if n else 0.0,
+                "min": lo,
+                "max": hi,
+                "sessions": sessions,
+            }
+            for kind, n, total, lo, hi, sessions in rows
+        }
+        return {"session": session, "kinds": kinds}
+
+
+def register_telemetry(app, sink: TelemetrySink) -> None:
+    """Add ``POST /telemetry`` and ``GET /telemetry/summary`` to ``app``."""
+    from flask import jsonify, request
+
+    def ingest():
+        if (request.content_length or 0) > MAX_BODY_BYTES:
+            BATCHES_REJECTED.labels("too_large").inc()
+            return jsonify(error="batch too large"), 413
+        # Chunked bodies carry no Content-Length; cap what is actually read.
+        body = request.stream.read(MAX_BODY_BYTES + 1)
+        if len(body) > MAX_BODY_BYTES:
+            BATCHES_REJECTED.labels("too_large").inc()
+            return jsonify(error="batch too large"), 413
+        try:
+            events = decode_batch(body, request.content_encoding)
+        except TelemetryError as exc:
+            BATCHES_REJECTED.labels("invalid").inc()
+            return jsonify(error=str(exc)), 400
+        if not sink.submit(events):
+            resp = jsonify(error="telemetry buffer full")
+            resp.headers["Retry-After"] = "5"
+            return resp, 429
+        return jsonify(accepted=len(events)), 202
+
+    def summary():
+        return jsonify(sink.summary(request.args.get("session")))
+
+    app.add_url_rule("/telemetry", "telemetry_ingest", ingest, methods=["POST"])
+    app.add_url_rule("/telemetry/summary", "telemetry_summary", summary)
@@ -0,0 +1,7 @@
+from __future__ import annotations
+
+import os
+
+# Oyun testleri pencere açmadan çalışsın.
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import pygame
+
+from cosmic_corridor.autopilot import Autopilot
+from cosmic_corridor.controls import FIRE, LEFT, KeyState
+from cosmic_corridor.game import FPS, CosmicCorridorGame
+
+
+def test_keystate_matches_pygame_keys():
+    keys = KeyState(LEFT | FIRE)
+    assert keys[pygame.K_LEFT] and keys[pygame.K_a] and keys[pygame.K_SPACE]
+    assert not keys[pygame.K_RIGHT]
+    assert not keys[pygame.K_RETURN]
+
+
+def _survival(seed: int, autopilot: bool) -> float:
+    game = CosmicCorridorGame(headless=True, seed=seed)
+    game.input_source = Autopilot(game) if autopilot else KeyState
+    game.run_headless(FPS * 60, render=False)
+    return game.time_survived
+
+
+def test_autopilot_outlives_idle_player():
+    idle = _survival(1, autopilot=False)
+    bot = _survival(1, autopilot=True)
+    assert idle < 30
+    assert bot > 59
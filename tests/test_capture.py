@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import json
+
+import pygame
+
+from cosmic_corridor.capture import FrameCapture
+from cosmic_corridor.game import CosmicCorridorGame
+
+
+def test_png_sequence_with_decimation_and_roi(tmp_path):
+    game = CosmicCorridorGame(headless=True, seed=1)
+    with FrameCapture(
+        tmp_path, every=3, roi=pygame.Rect(0, 0, 64, 48), block=True
+    ) as frames:
+        game.capture = frames
+        game.run_headless(9)
+
+    files = sorted(tmp_path.glob("frame_*.png"))
+    assert [f.name for f in files] == [f"frame_{i:06d}.png" for i in range(3)]
+    assert pygame.image.load(str(files[0])).get_size() == (64, 48)
+
+
+def test_raw_stream_is_reproducible(tmp_path):
+    for name in ("a", "b"):
+        game = CosmicCorridorGame(headless=True, seed=7)
+        with FrameCapture(tmp_path / name, fmt="raw", block=True) as frames:
+            game.capture = frames
+            game.run_headless(30)
+
+    meta = json.loads((tmp_path / "a" / "capture.json").read_text())
+    raw = (tmp_path / "a" / "capture.rgb").read_bytes()
+    assert meta["frames"] == 30
+    assert len(raw) == meta["width"] * meta["height"] * 3 * 30
+    assert raw == (tmp_path / "b" / "capture.rgb").read_bytes()
+
+
+def test_full_ring_drops_instead_of_blocking(tmp_path):
+    surface = pygame.Surface((8, 8))
+    frames = FrameCapture(tmp_path, capacity=1)
+    with frames._cond:  # hold the writer off so the ring stays full
+        frames._ring.append((0, b""))
+        assert frames.capture(surface) is False
+    frames._ring.clear()
+    frames.close()
+    assert frames.frames_dropped == 1
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import asyncio
+import base64
+import json
+import os
+import struct
+
+import numpy as np
+import pygame
+
+from cosmic_corridor.cloudplay import (
+    FRAME_HEADER,
+    RESTART,
+    CloudServer,
+    CloudSession,
+    TileDecoder,
+    TileEncoder,
+    websocket_accept,
+)
+from cosmic_corridor.controls import FIRE
+from cosmic_corridor.metrics import GAME_ROOMS
+
+
+def _frame(decoder: TileDecoder) -> bytes:
+    return decoder.frame.tobytes()
+
+
+def test_only_changed_tiles_are_sent():
+    surface = pygame.Surface((50, 30))  # edge tiles are partial
+    surface.fill((10, 20, 30))
+    encoder = TileEncoder(surface.get_size(), tile=16)
+    decoder = TileDecoder()
+
+    first = encoder.encode(surface)
+    assert FRAME_HEADER.unpack_from(first)[-1] == 4 * 2  # keyframe: every tile
+    decoder.apply(first)
+    assert encoder.encode(surface) is None
+
+    surface.set_at((49, 29), (255, 0, 0))  # bottom-right, partial tile
+    delta = encoder.encode(surface)
+    assert FRAME_HEADER.unpack_from(delta)[-1] == 1
+    decoder.apply(delta)
+    assert _frame(decoder) == pygame.image.tobytes(surface, "RGB")
+
+
+def test_websocket_accept_matches_rfc_example():
+    assert (
+        websocket_accept("dGhlIHNhbXBsZSBub25jZQ==") == "s3pPLMBiTxaQ9kYGzzhZRbK+xOo="
+    )
+
+
+def test_bandwidth_cap_skips_frames_losslessly():
+    session = CloudSession(fps=30, render_scale=0.25, max_bytes_per_s=3000, seed=0)
+    decoder = TileDecoder()
+    for _ in range(90):
+        message = session.tick()
+        if message is not None:
+            decoder.apply(message)
+    assert session.skipped["bandwidth"] > 0
+    # Three seconds at the cap, one second of burst, one frame of overshoot.
+    assert session.bytes_sent < 3000 * 5
+    # Whatever was skipped, the client catches up with the next frame sent.
+    session.max_bytes_per_s = session._tokens = 1e9
+    decoder.apply(session.tick())
+    assert _frame(decoder) == pygame.image.tobytes(session.game.screen, "RGB")
+
+
+def _client_frame(payload: bytes) -> bytes:
+    mask = os.urandom(4)
+    masked = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+    return struct.pack("!BB", 0x82, 0x80 | len(payload)) + mask + masked
+
+
+async def _read_server_frame(reader: asyncio.StreamReader) -> tuple[int, bytes]:
+    head = await reader.readexactly(2)
+    length = head[1] & 0x7F
+    if length == 126:
+        (length,) = struct.unpack("!H", await reader.readexactly(2))
+    elif length == 127:
+        (length,) = struct.unpack("!Q", await reader.readexactly(8))
+    return head[0] & 0x0F, await reader.readexactly(length)
+
+
+def test_websocket_session_end_to_end():
+    async def scenario():
+        cloud = CloudServer(max_sessions=1, fps=30, render_scale=0.25, seed=0)
+        server = await cloud.start("127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        rooms = GAME_ROOMS._default.get()
+
+        key = base64.b64encode(os.urandom(16)).decode()
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(
+            f"GET /play HTTP/1.1\r\nHost: x\r\nUpgrade: websocket\r\n"
+            f"Connection: Upgrade\r\nSec-WebSocket-Key: {key}\r\n"
+            "Sec-WebSocket-Version: 13\r\n\r\n".encode()
+        )
+        head = await reader.readuntil(b"\r\n\r\n")
+        assert head.startswith(b"HTTP/1.1 101")
+        assert websocket_accept(key).encode() in head
+
+        opcode, hello = await _read_server_frame(reader)
+        assert opcode == 0x1
+        assert json.loads(hello)["width"] == 200
+        opcode, keyframe = await _read_server_frame(reader)
+        assert opcode == 0x2
+        decoder = TileDecoder()
+        decoder.apply(keyframe)
+        assert decoder.frame.shape == (150, 200, 3)
+
+        # A second player is turned away while the only slot is taken.
+        other_reader, other_writer = await asyncio.open_connection("127.0.0.1", port)
+        other_writer.write(
+            b"GET /play HTTP/1.1\r\nUpgrade: websocket\r\n"
+            b"Sec-WebSocket-Key: abc\r\n\r\n"
+        )
+        assert (await other_reader.readline()).startswith(b"HTTP/1.1 503")
+        other_writer.close()
+
+        session = next(iter(cloud.sessions))
+        writer.write(_client_frame(bytes([FIRE])))
+        await writer.drain()
+        while not session.game.bullets:
+            await _read_server_frame(reader)
+        writer.write(b"\x88\x80" + os.urandom(4))  # masked, empty close frame
+        await writer.drain()
+        while cloud.sessions:
+            await asyncio.sleep(0.01)
+        assert GAME_ROOMS._default.get() == rooms
+        writer.close()
+        server.close()
+        await server.wait_closed()
+
+    asyncio.run(asyncio.wait_for(scenario(), 20))
+
+
+def test_tile_deltas_are_small_in_play():
+    session = CloudSession(fps=30, render_scale=0.5, seed=0)
+    sizes = [len(m) for m in (session.tick() for _ in range(60)) if m is not None]
+    keyframe, deltas = sizes[0], sizes[1:]
+    assert np.mean(deltas) < keyframe / 3
+
+
+def test_cpu_cap_lowers_the_frame_rate():
+    session = CloudSession(fps=30, render_scale=0.25, cpu_share=1e-6, max_stride=3)
+    for _ in range(30 * 4):
+        session.tick()
+    assert session.stride == 3
+    assert session.skipped["cpu"] > 0
+    assert session.ticks == 120  # the simulation itself never slows down
+
+
+def test_restart_pressed_mid_game_does_not_skip_game_over():
+    session = CloudSession(fps=30, render_scale=0.25, seed=0)
+    session.press(RESTART)
+    session.press(0)
+    session.tick()
+    session.game.game_over = True
+    session.tick()
+    assert session.game.game_over  # the game-over screen is still shown
+    session.press(RESTART)
+    session.tick()
+    assert not session.game.game_over
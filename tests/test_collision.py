@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import pygame
+
+from cosmic_corridor.collision import rounded_mask, sweep_masks, sweep_rects
+from cosmic_corridor.controls import LEFT, KeyState
+from cosmic_corridor.game import MAX_LIVES, Bullet, CosmicCorridorGame, Enemy
+
+
+def test_sweep_detects_tunneling():
+    # 4x12 bullet jumps 60 px up past a 36x26 enemy moving down.
+    bullet = pygame.Rect(100, 100, 4, 12)
+    enemy = pygame.Rect(90, 190, 36, 26)
+    assert not bullet.colliderect(enemy)
+
+    toi = sweep_rects(bullet, (0.0, -120.0), enemy, (0.0, 30.0))
+    assert toi is not None
+    assert 0.0 < toi < 1.0
+
+
+def test_sweep_misses_parallel_paths():
+    a = pygame.Rect(0, 0, 10, 10)
+    b = pygame.Rect(20, 0, 10, 10)
+    assert sweep_rects(a, (0.0, 100.0), b, (0.0, 100.0)) is None
+
+
+def test_sweep_touching_edges_do_not_collide():
+    a = pygame.Rect(0, 0, 10, 10)
+    b = pygame.Rect(10, 0, 10, 10)
+    assert sweep_rects(a, (0.0, 0.0), b, (0.0, 0.0)) is None
+    # Starts touching, then moves into b.
+    assert sweep_rects(a.move(5, 0), (5.0, 0.0), b, (0.0, 0.0)) == 0.0
+
+
+def test_masks_ignore_rounded_corner_grazes():
+    player = pygame.Rect(100, 100, 40, 22)
+    mask = rounded_mask(40, 22, 8)
+    assert rounded_mask(40, 22, 8) is mask  # built once per shape
+    # A 36x26 enemy falls past the player's top-right corner, overlapping the
+    # boxes by 2x2 pixels at the end of the step.
+    enemy = pygame.Rect(138, 78, 36, 26)
+    enemy_mask = rounded_mask(36, 26, 6)
+    still = (0.0, 0.0)
+    assert sweep_rects(player, still, enemy, (0.0, 15.0)) is not None
+    assert sweep_masks(player, still, mask, enemy, (0.0, 15.0), enemy_mask) is None
+
+    # Deep overlaps still hit, at the first step where pixels touch.
+    enemy = pygame.Rect(110, 90, 36, 26)
+    toi = sweep_masks(player, still, mask, enemy, (0.0, 30.0), enemy_mask)
+    assert toi is not None and 0.0 < toi < 1.0
+
+
+def test_dodging_past_an_enemy_corner_costs_no_life():
+    game = CosmicCorridorGame(headless=True, seed=0)
+    game.enemy_interval = game.powerup_interval = 1e9
+    game.enemy_timer = game.powerup_timer_spawn = -1e9
+    player = game.player
+    # The enemy's bottom-left corner clips the player's top-right corner while
+    # the player slides left and the enemy falls past it.
+    game.enemies.append(Enemy(player.x + 33, player.y - 24, 36, 26, vy=200.0))
+    left = KeyState(LEFT)
+    for _ in range(30):
+        game.step(1 / 60, [left])
+    assert game.lives == MAX_LIVES
+    assert game.enemies
+
+
+def _shootout(hz: int) -> tuple[int, int]:
+    game = CosmicCorridorGame()
+    game.enemy_interval = game.powerup_interval = 1e9
+    game.enemy_timer = game.powerup_timer_spawn = -1e9
+    game.bullets.append(Bullet(200.0, 400.0))
+    game.enemies.append(Enemy(200.0, 100.0, 36, 26, vy=900.0))
+    for _ in range(hz):
+        game._update_game(1.0 / hz)
+    return game.score, len(game.enemies)
+
+
+def test_coarse_ticks_match_fine_ticks():
+    assert _shootout(120) == _shootout(20) == (10, 0)
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import pygame
+import pytest
+
+from cosmic_corridor.controls import FIRE, LEFT, InputBuffer
+
+
+def _key(kind: int, key: int) -> pygame.event.Event:
+    return pygame.event.Event(kind, key=key)
+
+
+def test_tap_between_ticks_is_not_lost():
+    buf = InputBuffer()
+    buf.handle(_key(pygame.KEYDOWN, pygame.K_SPACE))
+    buf.handle(_key(pygame.KEYUP, pygame.K_SPACE))
+    assert buf.next_tick().mask == FIRE
+    assert buf.next_tick().mask == 0
+
+
+def test_held_keys_last_until_released():
+    buf = InputBuffer()
+    buf.handle(_key(pygame.KEYDOWN, pygame.K_a))
+    buf.handle(_key(pygame.KEYDOWN, pygame.K_RETURN))  # not a gameplay key
+    assert buf.next_tick().mask == LEFT
+    assert buf.next_tick()[pygame.K_LEFT]
+    buf.handle(_key(pygame.KEYUP, pygame.K_a))
+    assert buf.next_tick().mask == 0
+
+    buf.handle(_key(pygame.KEYDOWN, pygame.K_a))
+    buf.handle(pygame.event.Event(pygame.WINDOWFOCUSLOST))
+    buf.next_tick()
+    assert buf.next_tick().mask == 0
+
+
+def test_input_to_photon_latency():
+    now = 0.0
+    buf = InputBuffer(clock=lambda: now)
+    buf.presented()  # no input consumed yet
+    assert buf.latency_ms() is None
+
+    now = 1.000
+    buf.handle(_key(pygame.KEYDOWN, pygame.K_SPACE))
+    now = 1.004
+    buf.handle(_key(pygame.KEYDOWN, pygame.K_LEFT))  # same tick: oldest counts
+    buf.next_tick()
+    now = 1.012
+    buf.presented()
+    buf.presented()
+    assert buf.latency_ms() == pytest.approx((12.0, 12.0))
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import pytest
+from flask import Flask
+
+from cosmic_corridor.metrics import Registry, instrument_app
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = Registry()
+    hist = registry.histogram("op_seconds", "Op time.", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 3.0):
+        hist.observe(value)
+
+    text = registry.render()
+    assert 'op_seconds_bucket{le="0.1"} 1' in text
+    assert 'op_seconds_bucket{le="1"} 3' in text
+    assert 'op_seconds_bucket{le="+Inf"} 4' in text
+    assert "op_seconds_count 4" in text
+
+
+def test_registry_reuses_metrics_by_name():
+    registry = Registry()
+    counter = registry.counter("hits", "Hits.", ("route",))
+    assert registry.counter("hits", "Hits.", ("route",)) is counter
+    counter.labels('/a"b').inc(2)
+    assert 'hits_total{route="/a\\"b"} 2' in registry.render()
+
+
+def test_instrumented_app_reports_routes():
+    registry = Registry()
+    app = Flask(__name__)
+
+    @app.get("/ping/<name>")
+    def ping(name: str) -> str:
+        return name
+
+    instrument_app(app, registry)
+    client = app.test_client()
+    client.get("/ping/a")
+    client.get("/ping/b")
+
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.mimetype == "text/plain"
+    body = resp.get_data(as_text=True)
+    assert (
+        'http_request_duration_seconds_count{method="GET",route="/ping/<name>",'
+        'status="200"} 2' in body
+    )
+    assert "http_requests_in_flight 1" in body  # the scrape itself
+
+
+def test_labelled_metrics_need_labels():
+    registry = Registry()
+    hits = registry.counter("hits", "Hits.", ("route",))
+    level = registry.gauge("level", "Level.", ("tank",))
+    sizes = registry.histogram("sizes", "Sizes.", ("route",))
+    for call in (hits.inc, level.dec, level.set, sizes.observe):
+        with pytest.raises(ValueError, match=r"use \.labels"):
+            call(1.0)
+    hits.labels("/").inc()
+    assert 'hits_total{route="/"} 1' in registry.render()
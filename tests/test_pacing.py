@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import pytest
+
+from cosmic_corridor.game import FPS, CosmicCorridorGame
+from cosmic_corridor.pacing import FramePacer
+
+
+class FakeTime:
+    """Clock that only moves when slept on or read (each read costs ``step``)."""
+
+    def __init__(self, step: float = 0.0001) -> None:
+        self.now = 0.0
+        self.step = step
+        self.sleeps: list[float] = []
+
+    def clock(self) -> float:
+        self.now += self.step
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_sleeps_then_spins_to_the_deadline():
+    t = FakeTime()
+    pacer = FramePacer(100, spin=0.002, clock=t.clock, sleep=t.sleep)
+    pacer.tick()
+    start = t.now
+    dt = pacer.tick()
+    assert dt == pytest.approx(0.01, abs=2e-4)
+    assert t.now >= start + 0.01 - 2e-4
+    # One coarse sleep that stops ``spin`` early; the rest is spun.
+    assert len(t.sleeps) == 1 and t.sleeps[0] < 0.01 - 0.0019
+    assert pacer.missed == 0
+
+
+def test_overruns_count_as_missed_and_resync():
+    t = FakeTime()
+    pacer = FramePacer(100, clock=t.clock, sleep=t.sleep)
+    pacer.tick()
+    t.now += 0.015  # half a frame late: keep the schedule
+    pacer.tick()
+    assert pacer.missed == 1
+    assert pacer._deadline == pytest.approx(0.02, abs=2e-4)
+
+    t.now += 0.05  # several frames late: start over from now
+    pacer.tick()
+    assert pacer.missed == 2
+    assert pacer._deadline == pytest.approx(t.now + 0.01, abs=2e-4)
+
+
+def test_uncapped_never_waits():
+    t = FakeTime()
+    pacer = FramePacer(0, clock=t.clock, sleep=t.sleep)
+    assert pacer.uncapped
+    for _ in range(10):
+        pacer.tick()
+    assert t.sleeps == []
+    assert pacer.stats()["frames"] == 9  # the first tick only starts the clock
+
+
+def test_idle_runs_while_waiting():
+    t = FakeTime()
+    calls = []
+    pacer = FramePacer(
+        100, clock=t.clock, sleep=t.sleep, idle=lambda: calls.append(t.now)
+    )
+    pacer.tick()
+    pacer.tick()
+    assert len(calls) >= 7  # ~1 ms naps across an 8 ms sleep window
+    assert max(t.sleeps) <= 0.001
+    assert pacer.fps == pytest.approx(100, rel=0.02)
+
+
+@pytest.mark.parametrize("fps, budget", [(30, 1 / 30), (144, 1 / 144), (0, 1 / FPS)])
+def test_quality_budget_follows_the_frame_rate(fps, budget):
+    game = CosmicCorridorGame(headless=True, seed=0, fps=fps)
+    assert game.quality.budget == pytest.approx(budget)
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import pygame
+
+from cosmic_corridor.game import Bullet, CosmicCorridorGame, Enemy
+from cosmic_corridor.particles import PALETTE, SPARK, ParticleSystem
+
+
+def test_ring_reuses_slots_and_counts_live():
+    ps = ParticleSystem(capacity=100, seed=0)
+    assert ps.emit(0, 0, 80, SPARK, life=0.1) == 80
+    ps.update(0.2)
+    assert len(ps) == 0
+    assert ps.emit(0, 0, 50, SPARK) == 50
+    assert ps._head == 30 and ps._used == 100
+    assert len(ps) == 50
+
+
+def test_budget_caps_live_particles():
+    ps = ParticleSystem(capacity=1000, seed=0)
+    ps.budget = 100
+    assert ps.emit(0, 0, 80, SPARK) == 80
+    assert ps.emit(0, 0, 80, SPARK) == 20
+    assert ps.emit(0, 0, 80, SPARK) == 0
+
+
+def test_draw_lightens_pixels_in_bounds():
+    ps = ParticleSystem(capacity=16, seed=0)
+    ps.emit(10, 10, 1, SPARK, speed=0.0)
+    ps.emit(-50, 10, 1, SPARK, speed=0.0)  # off-screen, skipped
+    target = pygame.Surface((20, 20))
+    ps.draw(target)
+    assert target.get_at((10, 10))[:3] == tuple(int(c) for c in PALETTE[SPARK])
+    assert target.get_at((5, 5))[:3] == (0, 0, 0)
+
+
+def test_kills_spawn_particles():
+    game = CosmicCorridorGame(headless=True, seed=0)
+    game.enemy_interval = game.powerup_interval = 1e9
+    game.enemy_timer = game.powerup_timer_spawn = -1e9
+    game.enemies.append(Enemy(200.0, 300.0, 40, 30, 0.0))
+    game.bullets.append(Bullet(200.0, 320.0))
+    game.run_headless(1)
+    assert not game.enemies
+    assert not game.events
+    assert len(game.particles) > 0
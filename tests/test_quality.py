@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from cosmic_corridor.quality import QUALITY_TIERS, QualityGovernor
+
+BUDGET = 1.0 / 60
+
+
+def feed(governor: QualityGovernor, frame_time: float, windows: int) -> None:
+    for _ in range(governor.window * windows):
+        governor.record(frame_time)
+
+
+def test_steps_down_when_over_budget():
+    governor = QualityGovernor(budget=BUDGET, window=10)
+    feed(governor, BUDGET * 1.5, windows=1)
+    assert governor.level == 1
+
+    feed(governor, BUDGET * 1.5, windows=10)
+    assert governor.tier is QUALITY_TIERS[-1]
+
+
+def test_steps_up_only_after_sustained_headroom():
+    governor = QualityGovernor(budget=BUDGET, window=10, upgrade_windows=3)
+    feed(governor, BUDGET * 1.5, windows=2)
+    assert governor.level == 2
+
+    feed(governor, BUDGET * 0.2, windows=2)
+    assert governor.level == 2
+    feed(governor, BUDGET * 0.2, windows=1)
+    assert governor.level == 1
+
+
+def test_middle_band_holds_tier():
+    governor = QualityGovernor(budget=BUDGET, window=10)
+    feed(governor, BUDGET * 1.5, windows=1)
+    feed(governor, BUDGET * 0.75, windows=20)
+    assert governor.level == 1
+
+
+def test_failed_upgrade_backs_off():
+    governor = QualityGovernor(budget=BUDGET, window=10, upgrade_windows=2)
+    feed(governor, BUDGET * 1.5, windows=1)
+    feed(governor, BUDGET * 0.2, windows=2)
+    assert governor.level == 0
+
+    # The higher tier is too expensive again: drop, then require longer calm.
+    feed(governor, BUDGET * 1.5, windows=1)
+    assert governor.level == 1
+    feed(governor, BUDGET * 0.2, windows=3)
+    assert governor.level == 1
+    feed(governor, BUDGET * 0.2, windows=1)
+    assert governor.level == 0
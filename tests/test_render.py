@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import pytest
+
+from cosmic_corridor.game import ENEMY_COLOR, CosmicCorridorGame, Enemy
+
+
+def _enemy_frame(scale: float) -> CosmicCorridorGame:
+    game = CosmicCorridorGame(headless=True, seed=0, render_scale=scale)
+    game.tutorial_time = 0.0
+    game.enemies.append(Enemy(200.0, 300.0, 40, 30, 0.0))
+    game._render()
+    return game
+
+
+def test_lower_render_scale_maps_logical_coordinates():
+    game = _enemy_frame(0.5)
+    assert game.screen.get_size() == (400, 300)
+    # Enemy body at logical (200, 300) lands at pixel (100, 150); the cockpit
+    # sits above the centre, so sample just below it.
+    assert game.screen.get_at((100, 155))[:3] == ENEMY_COLOR
+    assert game.screen.get_at((200, 150))[:3] != ENEMY_COLOR
+
+
+def test_higher_render_scale():
+    game = _enemy_frame(2.0)
+    assert game.screen.get_size() == (1600, 1200)
+    assert game.screen.get_at((400, 620))[:3] == ENEMY_COLOR
+
+
+def test_unknown_present_mode():
+    with pytest.raises(ValueError):
+        CosmicCorridorGame(headless=True, present="stretch")
+
+
+def test_each_coop_player_gets_a_power_up_bar():
+    game = CosmicCorridorGame(headless=True, seed=0, players=2)
+    game.tutorial_time = 0.0
+    game.players[1].powerup_timer = 6.0
+    game._render()
+    # Player 2's slot is right of centre, player 1's (empty) left of it.
+    assert game.screen.get_at((460, 12))[:3] == (120, 250, 180)
+    assert game.screen.get_at((340, 12))[:3] != (120, 250, 180)
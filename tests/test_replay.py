@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import io
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from cosmic_corridor.controls import KeyState
+from cosmic_corridor.game import CosmicCorridorGame
+from cosmic_corridor.replay import (
+    Replay,
+    ReplayArchive,
+    ReplayError,
+    ReplayRecorder,
+    play,
+)
+
+
+def test_recorded_games_replay_exactly(tmp_path):
+    archive = ReplayArchive(tmp_path / "replays")
+    game = CosmicCorridorGame(headless=True, seed=3)
+    mashing = random.Random(0)
+    game.input_source = lambda: KeyState(mashing.randrange(8))
+    game.auto_restart = True
+    game.recorder = ReplayRecorder(archive, label="test")
+    while len(game.history) < 2:
+        game.run_headless(600, render=False)
+
+    assert len(archive) == 2
+    first, second = (archive.get(i) for i in game.recorder.saved)
+    assert first.seed == 3 and second.seed != 3  # reset draws a fresh seed
+    for replay, (score, survived) in zip((first, second), game.history, strict=True):
+        assert replay.died and replay.label == "test"
+        ended = play(replay)
+        assert ended.game_over
+        assert (ended.score, ended.time_survived) == (score, survived)
+    archive.close()
+
+
+def _replay(score: int, duration: float, created: float, died: bool = True):
+    replay = Replay(seed=score, score=score, duration=duration, died=died)
+    replay.created = created
+    for _ in range(int(duration * 60)):
+        replay.append(1 / 60, [0])
+    return replay
+
+
+def test_index_answers_queries_without_segments(tmp_path):
+    archive = ReplayArchive(tmp_path, segment_bytes=256)
+    now = time.time()
+    for score, duration, age_days in ((500, 90, 1), (900, 120, 10), (80, 12, 2)):
+        archive.add(_replay(score, duration, now - age_days * 86400))
+    archive.add(_replay(1000, 20, now, died=False))  # quit, not killed
+    assert len(list(tmp_path.glob("segment-*.ccr"))) > 1  # rolled over
+
+    week = archive.query(since=now - 7 * 86400, order="score", limit=2)
+    assert [r.score for r in week] == [1000, 500]
+    short_deaths = archive.query(max_duration=30, died=True)
+    assert [r.score for r in short_deaths] == [80]
+    with pytest.raises(ValueError):
+        archive.query(order="seed; DROP TABLE replays")
+    archive.close()
+
+
+def test_export_import_round_trip(tmp_path):
+    source = ReplayArchive(tmp_path / "a")
+    for score in (10, 20, 30):
+        source.add(_replay(score, 5, time.time()))
+    stream = io.BytesIO()
+    assert source.export_stream(stream) == 3
+
+    target = ReplayArchive(tmp_path / "b")
+    stream.seek(0)
+    assert target.import_stream(stream) == 3
+    assert sorted(r.score for r in target.query()) == [10, 20, 30]
+    copy = target.get(target.query(order="score", limit=1)[0].id)
+    assert copy.ticks == 300 and copy.score == 30
+
+    with pytest.raises(ReplayError):
+        target.import_stream(io.BytesIO(b"not a replay stream"))
+    source.close()
+    target.close()
+
+
+def test_archive_is_shared_between_threads(tmp_path):
+    archive = ReplayArchive(tmp_path, segment_bytes=512)
+    with ThreadPoolExecutor(4) as pool:
+        ids = list(
+            pool.map(archive.add, (_replay(s, 2, time.time()) for s in range(8)))
+        )
+        assert len(list(pool.map(archive.get, ids))) == 8
+    assert len(archive) == 8
+    archive.close()
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import json
+
+from cosmic_corridor.game import FPS, CosmicCorridorGame
+from cosmic_corridor.soak import SoakMonitor, growth_per_hour
+
+
+def test_growth_per_hour_is_slope():
+    assert growth_per_hour([0.0, 1800.0, 3600.0], [10.0, 12.0, 14.0]) == 4.0
+    assert growth_per_hour([5.0], [1.0]) == 0.0
+
+
+def _soak(tmp_path, leak: bool) -> tuple[bool, dict[str, float]]:
+    game = CosmicCorridorGame(headless=True, seed=2)
+    monitor = SoakMonitor(
+        game, tmp_path, sample_every=1.0, snapshot_every=5.0, warmup=2.0
+    )
+    leaked: list[bytes] = []
+    if leak:
+        game.frame_hooks.append(lambda g: leaked.append(bytes(10_000)))
+    game.frame_hooks.append(monitor)
+    game.run_headless(FPS * 10, render=False)
+    return monitor.close()
+
+
+def test_soak_report_passes_steady_run(tmp_path):
+    passed, _rates = _soak(tmp_path, leak=False)
+    assert passed
+    samples = (tmp_path / "samples.jsonl").read_text().splitlines()
+    assert len(samples) == 12  # start, ten samples, final
+    first = json.loads(samples[1])
+    assert set(first["live"]) == {"Bullet", "Enemy", "PowerUp"}
+    assert "growth since start" in (tmp_path / "tracemalloc.txt").read_text()
+    assert json.loads((tmp_path / "summary.json").read_text())["passed"] is True
+
+
+def test_soak_fails_on_sustained_growth(tmp_path):
+    passed, rates = _soak(tmp_path, leak=True)
+    assert not passed
+    assert rates["traced"] > 8.0
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import io
+import json
+
+from flask import Flask
+
+from cosmic_corridor.spectate import (
+    MAX_PUBLISH_BYTES,
+    Broadcaster,
+    diff_state,
+    register_spectate,
+)
+
+
+def _events(chunk: bytes) -> list[tuple[str, dict]]:
+    out = []
+    for block in chunk.decode().split("\n\n"):
+        fields = dict(
+            line.split(": ", 1) for line in block.splitlines() if ": " in line
+        )
+        if "event" in fields:
+            out.append((fields["event"], json.loads(fields["data"])))
+    return out
+
+
+def test_diff_state_marks_changed_and_removed_keys():
+    assert diff_state({"a": 1, "b": 2, "c": 3}, {"a": 1, "b": 5}) == {"b": 5, "c": None}
+
+
+def test_frames_encoded_once_and_shared():
+    hub = Broadcaster(keyframe_every=10)
+    first, second = hub.subscribe(), hub.subscribe()
+    hub.read(first, 0)
+    hub.read(second, 0)  # nothing published yet: both still waiting to resync
+    hub.publish({"score": 0, "lives": 3})
+    assert hub.read(first, 0) == hub.read(second, 0)
+
+    hub.publish({"score": 10, "lives": 3})
+    assert first.queue[0] is second.queue[0]
+    assert _events(hub.read(first, 0)) == [("delta", {"score": 10})]
+
+    hub.publish({"score": 10, "lives": 3})
+    assert hub.seq == 2 and not first.queue
+
+
+def test_slow_spectator_drops_and_resyncs_from_keyframe():
+    hub = Broadcaster(capacity=4, keyframe_every=100)
+    slow = hub.subscribe()
+    hub.publish({"score": 0})
+    hub.read(slow, 0)
+    for score in range(1, 10):
+        hub.publish({"score": score})
+    assert slow.resync and slow.dropped == 5
+    assert len(slow.queue) == 0
+
+    events = _events(hub.read(slow, 0))
+    assert events[0] == ("key", {"score": 0})
+    assert events[-1] == ("delta", {"score": 9})
+
+    hub.publish({"score": 10})
+    assert _events(hub.read(slow, 0)) == [("delta", {"score": 10})]
+
+
+def test_late_joiner_gets_keyframe_and_deltas():
+    hub = Broadcaster(keyframe_every=3)
+    for score in range(5):
+        hub.publish({"score": score, "lives": 3})
+    late = hub.subscribe()
+    assert _events(hub.read(late, 0)) == [
+        ("key", {"score": 3, "lives": 3}),
+        ("delta", {"score": 4}),
+    ]
+
+
+def test_publish_and_stream_routes():
+    hub = Broadcaster()
+    app = Flask(__name__)
+    register_spectate(app, hub, token="s3cret")
+    client = app.test_client()
+
+    frame = {"score": 5, "players": [[400, 530, False]]}
+    assert client.post("/spectate/publish", json=frame).status_code == 401
+    resp = client.post(
+        "/spectate/publish", json=[frame], headers={"Authorization": "Bearer s3cret"}
+    )
+    assert resp.status_code == 202
+
+    stream = client.get("/spectate/stream")
+    assert stream.mimetype == "text/event-stream"
+    chunks = iter(stream.response)
+    assert next(chunks).startswith(b"retry:")
+    assert _events(next(chunks)) == [("key", frame)]
+    stream.close()
+    assert len(hub) == 0
+
+
+def test_publish_needs_a_token_and_caps_chunked_bodies():
+    open_app = Flask(__name__)
+    register_spectate(open_app, Broadcaster(), token=None)
+    resp = open_app.test_client().post("/spectate/publish", json={"score": 1})
+    assert resp.status_code == 403
+
+    app = Flask(__name__)
+    register_spectate(app, Broadcaster(), token="s3cret")
+    oversized = io.BytesIO(b"[" + b"{}," * (MAX_PUBLISH_BYTES // 3) + b"{}]")
+    resp = app.test_client().post(
+        "/spectate/publish",
+        input_stream=oversized,
+        headers={"Authorization": "Bearer s3cret", "Transfer-Encoding": "chunked"},
+        environ_overrides={"wsgi.input_terminated": True},  # as the server sets it
+    )
+    assert resp.status_code == 413
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import pygame
+
+from cosmic_corridor.sprites import COLORKEY, SpriteCache, blit_batch
+
+
+def _box(w: int, h: int) -> pygame.Surface:
+    surf = pygame.Surface((w, h))
+    surf.fill((200, 50, 50))
+    return surf
+
+
+def test_sprite_cache_builds_once():
+    cache = SpriteCache()
+    first = cache.get(("box", 4, 4), _box, 4, 4)
+    assert cache.get(("box", 4, 4), _box, 4, 4) is first
+    assert cache.get(("box", 8, 4), _box, 8, 4) is not first
+    assert len(cache) == 2
+    assert first.get_colorkey()[:3] == COLORKEY
+
+
+def test_blit_batch_draws_every_item():
+    target = pygame.Surface((20, 10))
+    sprite = _box(2, 2)
+    blit_batch(target, [(sprite, (0, 0)), (sprite, (10, 5))])
+    assert target.get_at((0, 0))[:3] == (200, 50, 50)
+    assert target.get_at((11, 6))[:3] == (200, 50, 50)
+    assert target.get_at((5, 5))[:3] == (0, 0, 0)
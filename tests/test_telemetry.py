@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import gzip
+import io
+import json
+import math
+import threading
+
+from flask import Flask
+
+from cosmic_corridor.telemetry import (
+    MAX_BODY_BYTES,
+    TelemetrySink,
+    decode_batch,
+    register_telemetry,
+)
+
+
+def _body(session: str, events: list) -> bytes:
+    return gzip.compress(json.dumps({"session": session, "events": events}).encode())
+
+
+def test_ingest_flush_and_summary(tmp_path):
+    sink = TelemetrySink(tmp_path / "t.sqlite3", flush_interval=0.01)
+    app = Flask(__name__)
+    register_telemetry(app, sink)
+    client = app.test_client()
+
+    for session, frame_ms in (("a", 16.0), ("a", 18.0), ("b", 40.0)):
+        resp = client.post(
+            "/telemetry",
+            data=_body(session, [[0.1, "frame_ms", frame_ms], [0.2, "score", 30]]),
+            headers={"Content-Encoding": "gzip"},
+        )
+        assert resp.status_code == 202
+    assert sink.flush()
+
+    summary = client.get("/telemetry/summary").get_json()["kinds"]
+    assert summary["frame_ms"]["count"] == 3
+    assert summary["frame_ms"]["max"] == 40.0
+    assert summary["frame_ms"]["sessions"] == 2
+    per_session = client.get("/telemetry/summary?session=a").get_json()["kinds"]
+    assert per_session["frame_ms"]["mean"] == 17.0
+    sink.close()
+
+
+def test_full_buffer_rejects(tmp_path):
+    sink = TelemetrySink(tmp_path / "t.sqlite3", capacity=1)
+    sink._writer = threading.Thread()  # no writer draining the queue
+    assert sink.submit([("s", 0.0, "score", 1.0)]) is True
+    assert sink.submit([("s", 0.0, "score", 1.0)]) is False
+
+    app = Flask(__name__)
+    register_telemetry(app, sink)
+    resp = app.test_client().post(
+        "/telemetry", data=_body("s", []), headers={"Content-Encoding": "gzip"}
+    )
+    assert resp.status_code == 429
+    assert resp.headers["Retry-After"]
+
+
+def test_rejects_malformed_batches(tmp_path):
+    app = Flask(__name__)
+    register_telemetry(app, TelemetrySink(tmp_path / "t.sqlite3"))
+    client = app.test_client()
+    assert client.post("/telemetry", data=b"not json").status_code == 400
+    bad_kind = json.dumps({"session": "s", "events": [[0, "bogus", 1]]})
+    assert client.post("/telemetry", data=bad_kind).status_code == 400
+    assert decode_batch(b'{"session": "s", "events": []}', None) == []
+
+
+def test_non_finite_values_cannot_stop_the_writer(tmp_path):
+    sink = TelemetrySink(tmp_path / "t.sqlite3", flush_interval=0.01)
+    app = Flask(__name__)
+    register_telemetry(app, sink)
+    client = app.test_client()
+    for bad in ('[[0, "score", NaN]]', '[[Infinity, "score", 1]]'):
+        body = '{"session": "s", "events": %s}' % bad
+        assert client.post("/telemetry", data=body).status_code == 400
+
+    # Even if one gets past validation, only that batch is lost.
+    assert sink.submit([("s", 0.0, "score", math.nan)])
+    resp = client.post(
+        "/telemetry",
+        data=_body("s", [[1, "score", 7]]),
+        headers={"Content-Encoding": "gzip"},
+    )
+    assert resp.status_code == 202
+    assert sink.flush() and sink._writer.is_alive()
+    assert sink.summary("s")["kinds"]["score"]["count"] == 1
+    sink.close()
+
+
+def test_chunked_bodies_over_the_cap_are_refused(tmp_path):
+    app = Flask(__name__)
+    register_telemetry(app, TelemetrySink(tmp_path / "t.sqlite3"))
+    resp = app.test_client().post(
+        "/telemetry",
+        input_stream=io.BytesIO(b" " * (MAX_BODY_BYTES + 1)),
+        headers={"Transfer-Encoding": "chunked"},
+        environ_overrides={"wsgi.input_terminated": True},  # as the server sets it
+    )
+    assert resp.status_code == 413
@@ -1,6 +1,14 @@
 from __future__ import annotations
 
-from cosmic_corridor.web import app
+import gzip
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import cosmic_corridor
+from cosmic_corridor.metrics import REGISTRY
+from cosmic_corridor.web import WARM_PATHS, app, create_app, warm_up
 
 
 def test_health_endpoint_ok() -> None:
@@ -8,3 +16,55 @@ def test_health_endpoint_ok() -> None:
     resp = client.get("/health")
     assert resp.status_code == 200
     assert resp.get_json() == {"status": "ok"}
+
+
+def test_metrics_endpoint_ok() -> None:
+    client = app.test_client()
+    client.get("/health")
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    body = resp.get_data(as_text=True)
+    assert 'route="/health"' in body
+    assert "process_resident_memory_bytes" in body
+
+
+def test_pages_are_gzipped_once_and_revalidated(tmp_path) -> None:
+    client = create_app(telemetry_db=tmp_path / "t.sqlite3").test_client()
+    resp = client.get("/", headers={"Accept-Encoding": "gzip, br"})
+    assert resp.headers["Content-Encoding"] == "gzip"
+    html = gzip.decompress(resp.data)
+    assert b"<canvas" in html
+
+    plain = client.get("/", headers={"Accept-Encoding": "identity"})
+    assert "Content-Encoding" not in plain.headers
+    assert plain.data == html and plain.headers["ETag"] != resp.headers["ETag"]
+
+    again = client.get(
+        "/", headers={"If-None-Match": resp.headers["ETag"], "Accept-Encoding": "gzip"}
+    )
+    assert again.status_code == 304 and again.data == b""
+    # A cached gzip body is no match for a client that cannot decode it.
+    other = client.get("/", headers={"If-None-Match": resp.headers["ETag"]})
+    assert other.status_code == 200 and other.data == html
+    assert b"uv sync" in client.get("/about").data
+
+
+def test_warm_up_reaches_every_route(tmp_path) -> None:
+    app = create_app(telemetry_db=tmp_path / "t.sqlite3")
+    warm_up(app)
+    body = REGISTRY.render()
+    for route in WARM_PATHS:
+        assert f'route="{route}",status="200"' in body
+
+
+def test_importing_web_defers_flask() -> None:
+    code = "import sys, cosmic_corridor.web; print('flask' in sys.modules)"
+    src = str(Path(cosmic_corridor.__file__).parents[1])
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        env=dict(os.environ, PYTHONPATH=src),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert out.stdout.strip() == "False"